@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Benchmark the quiz hot paths of Vocabulary Plus across deck sizes.
+
+Synthetic decks of each size are generated with a fixed random seed, then
+`get_question`, `RandomStrategy.next_question`, `check_answer` (exact and typo-tolerant), `get_dict_key`, `get_summary` and
+`get_display_filename` are timed call by call. Latency percentiles and peak
+memory are reported, and the results can be saved as JSON and compared
+against a saved baseline:
+
+    python benchmark.py --output baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.25
+
+Plain, gzip and xz copies of each deck are compared too: their size, how
+long compressing takes and how long `read_json` takes to load them.
+
+The time `main.py` takes from launch to its first prompt is measured too.
+The run exits with code 1 if any benchmark's median latency regressed by
+more than the threshold, or if start-up is over its budget.
+"""
+from typing import Callable, Dict, List
+from colorama import init, Fore, Style
+import statistics
+import tracemalloc
+import shutil
+import subprocess
+import platform
+import argparse
+import tempfile
+import random
+import string
+import json
+import time
+import sys
+import os
+
+import vocabularyplus
+import deck_tools
+
+# Each benchmark runs for about this many seconds...
+DEFAULT_BUDGET = 0.5
+# ...with at least this many and at most this many timed calls
+MIN_SAMPLES = 5
+MAX_SAMPLES = 20000
+DEFAULT_SIZES = "10,1000,100000,1000000"
+# Compressing big decks with xz takes a long time, so fewer sizes are compared
+DEFAULT_COMPRESSION_SIZES = "1000,100000"
+# Start-up must reach the first prompt within this many milliseconds (median)
+DEFAULT_COLD_START_BUDGET = 100.0
+# Text that shows Vocabulary Plus is waiting for the user
+FIRST_PROMPTS = (b"of the above vocab lists", b"there are no vocabulary files")
+
+def random_word(rng: random.Random) -> str:
+    """ Return a random lowercase word of 3 to 12 letters. """
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12)))
+
+def make_deck(directory: str, size: int, rng: random.Random, indent: int | None = None) -> str:
+    """
+    Write a synthetic vocabulary file with `size` entries.
+
+    :param directory: The directory to write the file in
+    :param size: The number of words
+    :param rng: The random number generator to use
+    :param indent: The JSON indent. `4` gives the layout `create_vocab_file.save_json` writes
+    :return: The path of the vocabulary file
+    """
+    words = {f"{random_word(rng)}{i}": random_word(rng) for i in range(size)}
+    path = os.path.join(directory, f"deck-{size}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f, ensure_ascii=False, indent=indent)
+    return path
+
+def measure(function: Callable[[], object], budget: float) -> Dict[str, float]:
+    """
+    Time single calls of `function` until the time budget is spent, then measure its peak memory.
+
+    :param function: The function to call, with no arguments
+    :param budget: Roughly how many seconds to spend timing calls
+    :return: Latency percentiles in nanoseconds, calls per second and the peak memory in bytes
+    """
+    samples: List[int] = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < MAX_SAMPLES and (len(samples) < MIN_SAMPLES or time.perf_counter() < deadline):
+        start = time.perf_counter_ns()
+        function()
+        samples.append(time.perf_counter_ns() - start)
+
+    # Memory is measured separately, as tracing slows every allocation down.
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    def percentile(fraction: float) -> int:
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    mean = statistics.fmean(samples)
+    return {
+        "samples": len(samples),
+        "p50_ns": percentile(0.50),
+        "p90_ns": percentile(0.90),
+        "p99_ns": percentile(0.99),
+        "max_ns": samples[-1],
+        "mean_ns": round(mean, 1),
+        "calls_per_second": round(1e9 / mean, 1) if mean else 0.0,
+        "peak_bytes": peak,
+    }
+
+def run_benchmarks(sizes: List[int], seed: int, budget: float) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark for every deck size.
+
+    :param sizes: The deck sizes to generate
+    :param seed: The random seed, so runs can be compared
+    :param budget: Roughly how many seconds to spend on each benchmark
+    :return: The results, keyed by `function[size]`
+    """
+    results: Dict[str, Dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="vocabularyplus-bench-") as directory:
+        for size in sizes:
+            rng = random.Random(seed)
+            path = make_deck(directory, size, rng)
+            print(f"{Fore.LIGHTBLUE_EX}Deck of {size} words{Style.RESET_ALL}")
+
+            def load() -> object:
+                vocabularyplus.deck_cache.invalidate(path)
+                return vocabularyplus.deck_cache.get(path)
+
+            deck = load()
+
+            # Questions and answers are prepared up front, so only the function itself is timed.
+            question_rng = random.Random(seed)
+            questions = [vocabularyplus.get_question(deck, rng=question_rng) for _ in range(1000)]
+            answers = [deck.answers(word, word_type)[0] for _, word, word_type in questions]
+            user_answers = [answer if question_rng.random() < 0.7 else "" for answer in answers]
+            history = [user_answers[i % len(user_answers)] for i in range(size)]
+            expected = [answers[i % len(answers)] for i in range(size)]
+            counter = iter(range(sys.maxsize))
+            strategy = vocabularyplus.RandomStrategy(path, random.Random(seed))
+
+            def check() -> object:
+                i = next(counter) % len(questions)
+                _, word, word_type = questions[i]
+                return vocabularyplus.check_answer(word, user_answers[i], deck, word_type)
+
+            def check_typo() -> object:
+                # A misspelt answer, so the normalised and edit distance comparisons both run.
+                i = next(counter) % len(questions)
+                _, word, word_type = questions[i]
+                return vocabularyplus.check_answer(word, answers[i][:-1].upper(), deck, word_type, "typo")
+
+            benchmarks = {
+                "load_deck": load,
+                "get_question": lambda: vocabularyplus.get_question(deck, rng=question_rng),
+                "next_question": strategy.next_question,
+                "check_answer": check,
+                "check_answer_typo": check_typo,
+                "get_dict_key": lambda: vocabularyplus.get_dict_key(deck.values[-1], deck.words),
+                "get_summary": lambda: vocabularyplus.get_summary(history, expected),
+                "get_display_filename": lambda: vocabularyplus.get_display_filename(path, directory),
+            }
+
+            for name, function in benchmarks.items():
+                result = measure(function, budget)
+                results[f"{name}[{size}]"] = result
+                print(f"  {name:<22} p50 {result['p50_ns'] / 1000:>12.1f} µs"
+                      f"   p99 {result['p99_ns'] / 1000:>12.1f} µs"
+                      f"   peak {result['peak_bytes'] / 1024:>10.1f} KiB")
+
+            vocabularyplus.deck_cache.invalidate()
+
+    return results
+
+def run_compression_benchmarks(sizes: List[int], seed: int, budget: float) -> Dict[str, Dict[str, float]]:
+    """
+    Compare loading plain and compressed vocabulary files of every size.
+
+    Each deck is written like `create_vocab_file.save_json` writes it, then
+    stored in every format of `vocabularyplus.COMPRESS_FORMATS` with `deck_tools.compress_deck`.
+
+    :param sizes: The deck sizes to generate
+    :param seed: The random seed, so runs can be compared
+    :param budget: Roughly how many seconds to spend loading each file
+    :return: The results, keyed by `read_json[size,format]`, with the file size and compression time added
+    """
+    results: Dict[str, Dict[str, float]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="vocabularyplus-bench-") as directory:
+        for size in sizes:
+            path = make_deck(directory, size, random.Random(seed), indent=4)
+            print(f"{Fore.LIGHTBLUE_EX}Compressed deck of {size} words{Style.RESET_ALL}")
+
+            plain_bytes = os.path.getsize(path)
+            for file_format in ("json", "gz", "xz"):
+                copy = os.path.join(directory, f"deck-{size}-{file_format}.json")
+                shutil.copyfile(path, copy)
+                start = time.perf_counter()
+                _, stored, _, file_bytes, error = deck_tools.compress_deck(copy, file_format)
+                compress_seconds = time.perf_counter() - start
+                if error is not None:
+                    raise RuntimeError(f"could not compress {copy}: {error}")
+
+                result = measure(lambda: vocabularyplus.read_json(stored), budget)
+                result["file_bytes"] = file_bytes
+                result["compress_seconds"] = round(compress_seconds, 4)
+                results[f"read_json[{size},{file_format}]"] = result
+                print(f"  {file_format:<5} {file_bytes / 1024:>12.1f} KiB ({file_bytes / plain_bytes:>6.1%})"
+                      f"   compress {compress_seconds:>8.3f} s"
+                      f"   load p50 {result['p50_ns'] / 1e6:>10.2f} ms")
+                os.remove(stored)
+            os.remove(path)
+
+    return results
+
+def measure_cold_start(runs: int) -> Dict[str, float]:
+    """
+    Time how long `main.py` takes, from launch, to show its first prompt.
+
+    Each run starts a fresh interpreter, exactly like the `vocabularyplus`
+    launcher does, and is stopped as soon as the prompt appears. The program
+    is copied to a temporary directory first, so it starts with an empty
+    `JSON` directory of its own and the real one is left alone. One untimed
+    launch writes the bytecode cache, as the first launch after installing does.
+
+    :param runs: The number of launches to time
+    :return: Latency percentiles in nanoseconds
+    """
+    samples: List[int] = []
+    app_dir = os.path.dirname(os.path.abspath(vocabularyplus.__file__))
+    with tempfile.TemporaryDirectory(prefix="vocabularyplus-start-") as directory:
+        for name in os.listdir(app_dir):
+            if name.endswith(".py"):
+                shutil.copyfile(os.path.join(app_dir, name), os.path.join(directory, name))
+        main_path = os.path.join(directory, "main.py")
+
+        for run in range(runs + 1):
+            start = time.perf_counter_ns()
+            process = subprocess.Popen([sys.executable, main_path], stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            output = b""
+            try:
+                while not any(prompt in output for prompt in FIRST_PROMPTS):
+                    chunk = process.stdout.read1(4096)  # type: ignore
+                    if not chunk:
+                        raise RuntimeError("main.py exited before showing a prompt")
+                    output += chunk
+                if run:
+                    samples.append(time.perf_counter_ns() - start)
+            finally:
+                process.kill()
+                process.wait()
+
+    samples.sort()
+    return {
+        "samples": len(samples),
+        "p50_ns": samples[len(samples) // 2],
+        "p90_ns": samples[min(len(samples) - 1, int(0.9 * len(samples)))],
+        "max_ns": samples[-1],
+    }
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """
+    Compare median latencies with a baseline.
+
+    :param results: The results of this run
+    :param baseline: The saved results to compare against
+    :param threshold: The allowed slowdown, as a fraction (0.25 allows 25% slower)
+    :return: A description of each regression
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline or not baseline[key].get("p50_ns"):
+            continue
+        ratio = result["p50_ns"] / baseline[key]["p50_ns"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: p50 {baseline[key]['p50_ns'] / 1000:.1f} µs -> {result['p50_ns'] / 1000:.1f} µs ({ratio:.2f}x)")
+    return regressions
+
+def main_benchmark(argv: list | None = None) -> int:
+    """
+    Run the benchmark suite from the command line.
+
+    :param argv: The command-line arguments. Defaults to `sys.argv[1:]`
+    :return: The exit code: 1 if a regression was found, otherwise 0
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Vocabulary Plus quiz hot paths.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated deck sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed (default: 1234)")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help=f"seconds to spend on each benchmark (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--output", metavar="FILE", help="write the results to this JSON file")
+    parser.add_argument("--baseline", metavar="FILE", help="compare the results with this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--compression-sizes", default=DEFAULT_COMPRESSION_SIZES,
+                        help=f"comma-separated deck sizes to compare plain and compressed files with; empty skips this (default: {DEFAULT_COMPRESSION_SIZES})")
+    parser.add_argument("--cold-start-runs", type=int, default=10, help="launches of main.py to time; 0 skips this (default: 10)")
+    parser.add_argument("--cold-start-budget", type=float, default=DEFAULT_COLD_START_BUDGET,
+                        help=f"maximum median milliseconds from launch to the first prompt (default: {DEFAULT_COLD_START_BUDGET:g})")
+    args = parser.parse_args(argv)
+
+    init(autoreset=False)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run_benchmarks(sizes, args.seed, args.budget)
+    compression_sizes = [int(size) for size in args.compression_sizes.split(",") if size.strip()]
+    if compression_sizes:
+        results.update(run_compression_benchmarks(compression_sizes, args.seed, args.budget))
+
+    over_budget = False
+    if args.cold_start_runs > 0:
+        cold_start = measure_cold_start(args.cold_start_runs)
+        results["cold_start"] = cold_start
+        over_budget = cold_start["p50_ns"] / 1e6 > args.cold_start_budget
+        colour = Fore.RED if over_budget else Fore.GREEN
+        print(f"{colour}Cold start to first prompt: p50 {cold_start['p50_ns'] / 1e6:.1f} ms"
+              f" (budget {args.cold_start_budget:g} ms){Style.RESET_ALL}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "sizes": sizes,
+            "compression_sizes": compression_sizes,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print(f"{Fore.GREEN}Saved results to {args.output}{Style.RESET_ALL}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{Fore.RED}Regressions (more than {args.threshold:.0%} slower than {args.baseline}):{Style.RESET_ALL}")
+            for regression in regressions:
+                print(f"{Fore.RED}  {regression}{Style.RESET_ALL}")
+            return 1
+        print(f"{Fore.GREEN}No regressions against {args.baseline}.{Style.RESET_ALL}")
+
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
-from colorama import init, Cursor, ansi, Fore, Style
+from typing import Iterator, Tuple, TextIO
+from colorama import init, Fore, Style
+from json.encoder import encode_basestring  # type: ignore
+import argparse
 import platform
 import json
 import time
+import csv
 import sys
+import io
 import os
 
+# Terminal output is shared with the quiz (importing `vocabularyplus` has no side effects)
+from vocabularyplus import RENDERERS, ANSWER_SEPARATOR, get_renderer, set_renderer, open_deck, format_answers
+
 # Get the JSON_DIR constant
 try:
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,18 +22,18 @@ except NameError:
     base_dir = os.getcwd()
 
 JSON_DIR = os.path.join(base_dir, "JSON")
-os.makedirs(JSON_DIR, exist_ok=True)
-
-# Initialise colorama (it will translate ANSI codes on Windows automatically)
-init(autoreset=False)
 
-# Print CTRL+C instructions
-print(f"{Fore.RED}Press CTRL+C to quit.{Style.RESET_ALL}\n")
-time.sleep(0.5)
+# Words are recorded here as they are entered, so an interrupted session can be resumed
+JOURNAL_PATH = os.path.join(JSON_DIR, ".create-journal.jsonl")
 
 def on_keyboard_interrupt():
     """ Print a friendly goodbye message then exit with code 0. """
-    print(f"\n{Fore.LIGHTGREEN_EX}Thank you for using Vocabulary Plus. Goodbye!{Style.RESET_ALL}")
+    renderer = get_renderer()
+    renderer.write()
+    if _journal is not None and _journal.count:
+        renderer.write(f"Your {_journal.count} words so far are kept. Run 'vocabularyplus create --resume' to carry on.", "warning")
+    renderer.write("Thank you for using Vocabulary Plus. Goodbye!", "goodbye")
+    renderer.flush()
     sys.exit(0)
 
 def clear_lines(lines: int) -> None:
@@ -34,22 +42,8 @@ def clear_lines(lines: int) -> None:
     :param lines: The number of lines to remove.
     """
 
-    supports_ansi = sys.stdout.isatty() and os.getenv("TERM") not in (None, "dumb")
-
-    if lines <= 0 or not supports_ansi:
-        return
-
-    # Move cursor up `lines` rows
-    sys.stdout.write(Cursor.UP(lines))
-
-    # Erase each line and move down one row
-    for _ in range(lines):
-        sys.stdout.write(ansi.clear_line())   # equivalent to "\033[K"
-        sys.stdout.write("\n")
-
-    # Return cursor to the starting line
-    sys.stdout.write(Cursor.UP(lines))
-    sys.stdout.flush()
+    # Buffered, so the lines are cleared in the same write as the next prompt.
+    get_renderer().clear(lines)
 
 def dynamic_input(text: str) -> str:
     """ 
@@ -59,7 +53,7 @@ def dynamic_input(text: str) -> str:
     Parameters
     ----------
     text : str
-        The text to print before asking the user for input
+        The text to print before asking the user for input, as a prompt (see `vocabularyplus.AnsiRenderer.STYLES`)
 
     Returns
     -------
@@ -67,11 +61,8 @@ def dynamic_input(text: str) -> str:
         The user's input
     """
     try:
-        # move to new line before input
-        sys.stdout.write(f"\r{text}")
-        sys.stdout.flush()
-        user_input = input() # now input works normally
-        return user_input
+        # Write anything buffered and the prompt at once, then read the input
+        return get_renderer().prompt(text)
     except KeyboardInterrupt:
         on_keyboard_interrupt()
         sys.exit(0)
@@ -84,6 +75,8 @@ def load_json(filename) -> dict:
     """
     Return the contents of the JSON file `filename` as a dictionary
 
+    Compressed files (`.json.gz` and `.json.xz`) are decompressed as they are read.
+
     Parameters
     ----------
     filename : str
@@ -96,7 +89,7 @@ def load_json(filename) -> dict:
         If there is no dictionary in the file, returns an empty dict.
     """
     if os.path.exists(filename):
-        with open(filename, 'r', encoding='utf-8') as f:
+        with open_deck(filename) as f:
             try:
                 return dict(json.load(f))
             except json.JSONDecodeError:
@@ -107,6 +100,9 @@ def save_json(filename: str, data: dict) -> None:
     """
     Write the dictionary `data` to the JSON file `filename`
 
+    The file is written to a temporary file next to it, flushed to disk and
+    then moved into place, so it is never left half-written.
+
     Parameters
     ----------
     filename : str
@@ -114,8 +110,492 @@ def save_json(filename: str, data: dict) -> None:
     data : str
         The dictionary to be written into the JSON file
     """
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
+        raise
+
+class DeckWriter:
+    """
+    Write a vocabulary file one word at a time.
+
+    The output has the same layout as `save_json`, but entries are written
+    as they arrive instead of being collected in a dict first. Everything
+    goes to a temporary file next to the target, which only replaces the
+    target when `close` is called, so an interrupted import never leaves a
+    half-written vocabulary file behind.
+
+    Use it as a context manager: the file is closed on success and
+    discarded if an exception is raised.
+    """
+
+    def __init__(self, filename: str, languages: dict) -> None:
+        """
+        :param filename: The filename of the JSON file to be written
+        :type filename: str
+        :param languages: The `languages` section, with `learning` and `spoken` keys
+        :type languages: dict
+        """
+        self.filename = filename
+        self.count = 0
+        self._tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        self._file = open(self._tmp_filename, 'w', encoding='utf-8')
+        # Same layout as `json.dump(data, f, indent=4, ensure_ascii=False)`
+        languages_json = json.dumps(languages, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        self._file.write(f'{{\n    "languages": {languages_json},\n    "words": {{')
+
+    def write(self, learning_word: str, spoken_word: "str | list") -> None:
+        """
+        Append one word and its meaning.
+
+        :param learning_word: The word in the language being learned
+        :type learning_word: str
+        :param spoken_word: The word in the language the user speaks, or a list of accepted words
+        :type spoken_word: str | list
+        """
+        separator = ",\n" if self.count else "\n"
+        # `encode_basestring` is what `json.dumps(text, ensure_ascii=False)` uses for strings, without the overhead
+        if isinstance(spoken_word, str):
+            value = encode_basestring(spoken_word)
+        else:
+            # Indented like `json.dump(..., indent=4)` indents a list nested two levels deep
+            value = json.dumps(list(spoken_word), indent=4, ensure_ascii=False).replace("\n", "\n        ")
+        self._file.write(f"{separator}        {encode_basestring(learning_word)}: {value}")
+        self.count += 1
+
+    def close(self) -> None:
+        """ Finish the JSON document, flush it to disk and move it into place. """
+        self._file.write("\n    }\n}" if self.count else "}\n}")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_filename, self.filename)
+
+    def abort(self) -> None:
+        """ Discard everything written so far. """
+        self._file.close()
+        try:
+            os.remove(self._tmp_filename)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "DeckWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class JournalError(Exception):
+    """Custom exception indicating a journal that exists but cannot be resumed."""
+    pass
+
+class AuthoringJournal:
+    """
+    Record the words of a vocab file as they are entered, one line each.
+
+    The first line holds the languages and the number of words asked for,
+    and each following line one `[word, meaning]` pair. Every pair is
+    appended and flushed to disk straight away, which costs the same however
+    many words came before it. If the session is interrupted, `load` reads
+    the words back (ignoring a last line cut short by a crash) so
+    `vocabularyplus create --resume` can continue where it stopped. The
+    journal is deleted once the vocab file is saved.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH) -> None:
+        """
+        :param path: The journal file
+        :type path: str
+        """
+        self.path = path
+        self.count = 0
+        self._file: TextIO | None = None
+
+    def start(self, learning: str, spoken: str, num_words: int) -> None:
+        """
+        Begin a new journal, replacing any previous one.
+
+        :param learning: The language being learned
+        :param spoken: The language the user speaks
+        :param num_words: The number of words the user is going to enter
+        """
+        self.close()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write(json.dumps({"learning": learning, "spoken": spoken, "words": num_words}, ensure_ascii=False) + "\n")
+        self._sync()
+        self.count = 0
+
+    def load(self) -> Tuple[dict, list] | None:
+        """
+        Read the journal and open it to add more words.
+
+        Returns
+        -------
+        Tuple[dict, list] | None
+            The header (`learning`, `spoken` and `words`) and the
+            `[word, meaning]` pairs entered so far, or None if there is no
+            journal (or nothing was written to it).
+
+        Raises
+        ------
+        JournalError
+            If the journal is damaged: its first line is not a valid
+            header, or a line before the last one is not a valid pair.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            raise JournalError(f"it cannot be read ({e})") from e
+        if not text.strip():
+            # Interrupted before the header was written, so there is nothing to resume.
+            return None
+
+        lines = text.split("\n")
+        try:
+            header = json.loads(lines[0])
+            learning, spoken, num_words = header["learning"], header["spoken"], header["words"]
+        except (json.JSONDecodeError, TypeError, KeyError) as e:
+            raise JournalError("its first line is not a valid header") from e
+        if not isinstance(learning, str) or not learning or not isinstance(spoken, str) or not spoken \
+                or type(num_words) is not int or num_words <= 0:
+            raise JournalError("its header has no languages or number of words")
+
+        pairs = []
+        for number, line in enumerate(lines[1:], start=2):
+            try:
+                learning_word, spoken_word = json.loads(line)
+                if not isinstance(learning_word, str) or not isinstance(spoken_word, str):
+                    raise TypeError
+            except (json.JSONDecodeError, ValueError, TypeError) as e:
+                # Only the last line can be incomplete; nothing after it was written.
+                if any(rest.strip() for rest in lines[number:]):
+                    raise JournalError(f"line {number} is not a word and its meaning") from e
+                break
+            pairs.append([learning_word, spoken_word])
+
+        # Write the journal again without a broken last line, to a temporary file
+        # first so that a crash while doing so cannot lose the words.
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(header, ensure_ascii=False) + "\n")
+                f.writelines(f"[{encode_basestring(learning_word)}, {encode_basestring(spoken_word)}]\n"
+                             for learning_word, spoken_word in pairs)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.count = len(pairs)
+        return header, pairs
+
+    def append(self, learning_word: str, spoken_word: str) -> None:
+        """
+        Record one word and its meaning.
+
+        :param learning_word: The word in the language being learned
+        :type learning_word: str
+        :param spoken_word: The word in the language the user speaks
+        :type spoken_word: str
+        """
+        self._file.write(f"[{encode_basestring(learning_word)}, {encode_basestring(spoken_word)}]\n")  # type: ignore
+        self._sync()
+        self.count += 1
+
+    def _sync(self) -> None:
+        """ Push everything written so far to disk. """
+        self._file.flush()  # type: ignore
+        os.fsync(self._file.fileno())  # type: ignore
+
+    def close(self) -> None:
+        """ Close the journal, keeping it on disk. """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """ Close and delete the journal, once its words are safely saved. """
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+# The journal of the session in progress, if any (see `on_keyboard_interrupt`)
+_journal: AuthoringJournal | None = None
+
+class ImportFormatError(Exception):
+    """Custom exception indicating a row that cannot be imported."""
+    pass
+
+def split_answers(text: str) -> "str | list":
+    """
+    Split a typed or imported meaning into its accepted answers.
+
+    Several answers are separated by `ANSWER_SEPARATOR` (such as `dog / hound`),
+    the way the quiz lists them. Blank and repeated answers are left out.
+
+    Parameters
+    ----------
+    text : str
+        The meaning, as typed or imported
+
+    Returns
+    -------
+    str | list
+        The stripped meaning if there is one answer, otherwise a list of them
+        (see `vocabularyplus.format_answers`).
+    """
+    answers = [answer.strip() for answer in text.split(ANSWER_SEPARATOR)]
+    return format_answers(list(dict.fromkeys(answer for answer in answers if answer)) or [text.strip()])
+
+def get_import_format(filename: str) -> str:
+    """
+    Guess the format of an import file from its extension.
+
+    Parameters
+    ----------
+    filename : str
+        The file to import, or `-` for stdin
+
+    Returns
+    -------
+    str
+        `"tsv"` for `.tsv`/`.tab` files, `"jsonl"` for `.jsonl`/`.ndjson`
+        files, otherwise `"csv"`.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in (".tsv", ".tab"):
+        return "tsv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "csv"
+
+def iter_rows(stream: TextIO, file_format: str, skip_header: bool = False) -> Iterator[Tuple[str, "str | list"]]:
+    """
+    Yield `(learning_word, spoken_word)` pairs from an import stream, one row at a time.
+
+    A meaning can hold several accepted answers: a list in JSON lines, or
+    answers separated by `ANSWER_SEPARATOR` (see `split_answers`).
+
+    Parameters
+    ----------
+    stream : TextIO
+        The text stream to read from.
+    file_format : str
+        `"csv"` or `"tsv"` (the first two columns are used), or `"jsonl"`
+        (one `{"learning": ..., "spoken": ...}` object or
+        `[learning, spoken]` array per line, where `spoken` can be a list).
+    skip_header : bool
+        Whether the first row is a header to be ignored.
+
+    Yields
+    ------
+    Tuple[str, str | list]
+        The stripped learning-language word and its meaning, or a list of meanings.
+
+    Raises
+    ------
+    ImportFormatError
+        If a row does not contain two non-empty words.
+    """
+    if file_format == "jsonl":
+        def parse(line: str):
+            item = json.loads(line)
+            if isinstance(item, dict):
+                return item["learning"], item["spoken"]
+            learning_word, spoken_word = item
+            return learning_word, spoken_word
+
+        rows = ((line_number, line) for line_number, line in enumerate(stream, start=1) if line.strip())
+    else:
+        reader = csv.reader(stream, delimiter="\t" if file_format == "tsv" else ",")
+
+        def parse(row: list):
+            return row[0], row[1]
+
+        rows = ((reader.line_num, row) for row in reader if any(field.strip() for field in row))
+
+    for line_number, row in rows:
+        if skip_header:
+            skip_header = False
+            continue
+        try:
+            learning_word, spoken_word = parse(row)
+        except Exception as exc:
+            raise ImportFormatError(f"line {line_number}: expected a word and its meaning") from exc
+        answers = spoken_word if isinstance(spoken_word, list) else [spoken_word]
+        if not isinstance(learning_word, str) or not learning_word.strip() or not answers or \
+                not all(isinstance(answer, str) and answer.strip() for answer in answers):
+            raise ImportFormatError(f"line {line_number}: words must be non-empty text")
+        if isinstance(spoken_word, list):
+            yield learning_word.strip(), format_answers(list(dict.fromkeys(answer.strip() for answer in spoken_word)))
+        else:
+            yield learning_word.strip(), split_answers(spoken_word)
+
+def get_vocab_path(filename: str) -> str | None:
+    """
+    Return the absolute path in `JSON_DIR` for a vocab file name chosen by the user.
+
+    Parameters
+    ----------
+    filename : str
+        The desired name, with or without the `.json` extension
+
+    Returns
+    -------
+    str | None
+        The absolute path, or None if the name cannot be used on this system.
+    """
+    # Check if the filename would work on Windows
+    if platform.system() == "Windows":
+        reserved = {"con","prn","aux","nul",
+                *(f"com{i}" for i in range(1,10)),
+                *(f"lpt{i}" for i in range(1,10))}
+
+        if filename.lower() in reserved:
+            return None
+
+    # Check if the filename ends in `.json`
+    if filename.lower().endswith(".json"):
+        has_file_extension = True
+    else:
+        has_file_extension = False
+
+    # Set the absolute path of the file
+    if has_file_extension == True:
+        return os.path.join(JSON_DIR, filename)
+    else:
+        return os.path.join(JSON_DIR, f"{filename}.json")
+
+def import_words(source: str, learning: str, spoken: str, name: str | None = None,
+                 file_format: str | None = None, skip_header: bool = False, force: bool = False) -> int:
+    """
+    Create a vocab file from a CSV, TSV or JSON-lines file without asking any questions.
+
+    Rows are streamed straight into the new vocab file, so memory use does
+    not grow with the size of the import (apart from the set of words seen,
+    which is used to skip duplicates). The number of words imported and the
+    throughput are reported through the renderer chosen with `--output`.
+
+    Parameters
+    ----------
+    source : str
+        The file to import, or `-` to read from stdin.
+    learning : str
+        The language being learned.
+    spoken : str
+        The language the user speaks.
+    name : str | None
+        The name of the vocab file. Defaults to the name of `source`.
+    file_format : str | None
+        `"csv"`, `"tsv"` or `"jsonl"`. Defaults to a guess from the extension of `source`.
+    skip_header : bool
+        Whether the first row is a header to be ignored.
+    force : bool
+        Whether to replace the vocab file if it already exists.
+
+    Returns
+    -------
+    int
+        The exit code: 0 on success, otherwise 1.
+    """
+    renderer = get_renderer()
+    if name is None:
+        if source == "-":
+            renderer.write("Please choose a name for the vocab file with --name when importing from stdin.", "warning")
+            renderer.flush()
+            return 1
+        name = os.path.splitext(os.path.basename(source))[0]
+
+    abs_path = get_vocab_path(name)
+    if abs_path is None:
+        renderer.write("That filename cannot be used on Windows.", "warning")
+        renderer.flush()
+        return 1
+    if not force and os.path.exists(abs_path):
+        renderer.write(f"{abs_path} already exists. Use --force to replace it, or --name to choose another name.", "warning")
+        renderer.flush()
+        return 1
+
+    if file_format is None:
+        file_format = get_import_format(source)
+
+    seen = set()
+    duplicates = 0
+    start = time.perf_counter()
+    try:
+        if source == "-":
+            stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+        else:
+            stream = open(source, encoding="utf-8-sig", newline="")
+        with stream, DeckWriter(abs_path, {"learning": learning, "spoken": spoken}) as writer:
+            for learning_word, spoken_word in iter_rows(stream, file_format, skip_header):
+                # The first row of a word wins, as rows are written straight away; several
+                # meanings go in one row (see `iter_rows`).
+                if learning_word in seen:
+                    duplicates += 1
+                    continue
+                seen.add(learning_word)
+                writer.write(learning_word, spoken_word)
+    except (ImportFormatError, OSError, UnicodeDecodeError, csv.Error) as e:
+        renderer.write(f"Could not import {'stdin' if source == '-' else source}: {e}", "error")
+        renderer.flush()
+        return 1
+
+    elapsed = time.perf_counter() - start
+    rate = writer.count / elapsed if elapsed > 0 else float(writer.count)
+    renderer.write(f"Imported {writer.count} words ({duplicates} duplicates skipped) in {elapsed:.2f}s ({rate:,.0f} words/s)", "heading")
+    renderer.write(f"Saved as {abs_path}", "success")
+    renderer.flush()
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """ Return the command-line argument parser for `vocabularyplus create`. """
+    parser = argparse.ArgumentParser(
+        prog="vocabularyplus create",
+        description="Create a new vocabulary file, interactively or by importing one.",
+    )
+    parser.add_argument("--from", dest="source", metavar="FILE",
+                        help="import words from a CSV, TSV or JSON-lines file instead of asking for them ('-' reads stdin). "
+                             f"Separate several meanings of a word with '{ANSWER_SEPARATOR}'")
+    parser.add_argument("--format", dest="file_format", choices=("csv", "tsv", "jsonl"),
+                        help="the format of the import file (default: guessed from its extension, otherwise csv)")
+    parser.add_argument("--learning", help="the language you are learning (required with --from)")
+    parser.add_argument("--spoken", help="the language you speak (required with --from)")
+    parser.add_argument("--name", help="the name of the vocab file (default: the name of the import file)")
+    parser.add_argument("--header", action="store_true", help="skip the first row of the import file")
+    parser.add_argument("--force", action="store_true", help="replace the vocab file if it already exists (with --from)")
+    parser.add_argument("--resume", action="store_true",
+                        help="carry on with a vocab file whose creation was interrupted, from where it stopped")
+    parser.add_argument(
+        "--output",
+        choices=sorted(RENDERERS),
+        default="ansi",
+        help="how to show the questions: 'ansi' (coloured, the default), 'plain' text, or 'jsonl' for other programs",
+    )
+    return parser
 
 def check_input(question) -> str:
     """
@@ -131,18 +611,58 @@ def check_input(question) -> str:
     str
         The input from the user
     """
-    answer = input(question).strip()
+    renderer = get_renderer()
+    answer = renderer.prompt(question).strip()
     # If the input is nothing, tell the user and ask again
     while answer == "":
-        print(f"{Fore.YELLOW}Please enter something.{Style.RESET_ALL}")
-        answer = input(question).strip()
+        renderer.write("Please enter something.", "warning")
+        answer = renderer.prompt(question).strip()
     return answer
 
-def main() -> None:
+def main(argv: list | None = None) -> None:
     """
     The main function which asks the user about the vocabulary file they are trying to create. \n
-    Gets data such as the languages of the vocab, the number of words and the words and meanings themselves.
+    Gets data such as the languages of the vocab, the number of words and the words and meanings themselves. \n
+    Each word is saved to a journal as it is entered (see `AuthoringJournal`), and `--resume` carries on from it. \n
+    With `--from FILE`, the words are imported from a file instead (see `import_words`).
     """
+    args = build_parser().parse_args(argv)
+
+    # Initialise colorama (it will translate ANSI codes on Windows automatically)
+    init(autoreset=False)
+    os.makedirs(JSON_DIR, exist_ok=True)
+
+    # All terminal output goes through the renderer chosen with `--output`.
+    renderer = set_renderer(args.output)
+
+    if args.source is not None:
+        if not args.learning or not args.spoken:
+            renderer.write("Please give the languages with --learning and --spoken when importing.", "warning")
+            renderer.flush()
+            sys.exit(2)
+        sys.exit(import_words(args.source, args.learning, args.spoken, args.name, args.file_format, args.header, args.force))
+
+    # Print CTRL+C instructions
+    renderer.write("Press CTRL+C to quit.", "error")
+    renderer.write()
+
+    # Record each word as it is entered, so nothing is lost if the session is interrupted.
+    global _journal
+    journal = _journal = AuthoringJournal()
+    try:
+        resumed = journal.load() if args.resume else None
+    except JournalError as e:
+        # Keep the journal as it is, in case the words can still be recovered from it.
+        renderer.write(f"Your unfinished vocab file cannot be resumed, as its journal is damaged: {e}.", "error")
+        renderer.write(f"It is kept at {journal.path}. Run 'vocabularyplus create' to start a new one.", "warning")
+        renderer.flush()
+        _journal = None
+        return
+    if args.resume and resumed is None:
+        renderer.write("There is no unfinished vocab file to resume, so let's start a new one.", "warning")
+    elif not args.resume and os.path.exists(journal.path):
+        renderer.write("You have an unfinished vocab file. Run 'vocabularyplus create --resume' to finish it,", "warning")
+        renderer.write("or carry on to start a new one instead.", "warning")
 
     # The empty `data` dict
     data = {
@@ -150,15 +670,6 @@ def main() -> None:
         "words": {}
     }
 
-    # Get the languages of the vocabulary
-    learning = check_input(f"{Fore.LIGHTCYAN_EX}What language are you learning? {Style.RESET_ALL}")
-    spoken = check_input(f"{Fore.LIGHTCYAN_EX}What language do you speak? {Style.RESET_ALL}")
-    # Save the language data in `data["languages"]`
-    data["languages"] = {
-        "learning": learning,
-        "spoken": spoken
-    }
-
     def ask_num_words() -> str | bool:
         """ Get the number of words in the vocabulary file """
         valid = True
@@ -169,7 +680,7 @@ def main() -> None:
             nonlocal valid
             valid = True
             # Get the number of words from the user
-            user_input = check_input(f"{Fore.LIGHTCYAN_EX}How many words are in the vocab list? {Style.RESET_ALL}")
+            user_input = check_input("How many words are in the vocab list? ")
 
             # If it is not a digit, set `valid` to False
             if not user_input.isdigit():
@@ -186,25 +697,37 @@ def main() -> None:
 
         # If `num_words` is not valid, ask again
         while valid == False:
-            print(f"{Fore.YELLOW}Please enter a positive integer.{Style.RESET_ALL}")
+            renderer.write("Please enter a positive integer.", "warning")
             num_words = check()
 
         return num_words # Return the valid number of words
-        
-    num_words = ask_num_words()
-    words = []
-
-    # Get the first word and its meaning then add it to `words`
-    lang1_word = dynamic_input(f"{Fore.LIGHTCYAN_EX}What is the first {learning} word in the vocab list? {Style.RESET_ALL}")
-    translated = dynamic_input(f"{Fore.LIGHTCYAN_EX}What is {lang1_word} in {spoken}? {Style.RESET_ALL}")
-    words.append([lang1_word, translated])
-    time.sleep(0.5)
-    clear_lines(2)
-
-    # Get the other word/meaning pairs
-    for i in range(int(num_words) - 1):
-        lang1_word = dynamic_input(f"{Fore.LIGHTCYAN_EX}What is the next {learning} word in the vocab list? {Style.RESET_ALL}")
-        translated = dynamic_input(f"{Fore.LIGHTCYAN_EX}What is {lang1_word} in {spoken}? {Style.RESET_ALL}")
+
+    if resumed is not None:
+        # Carry on with the languages and words from the journal
+        header, words = resumed
+        learning, spoken, num_words = header["learning"], header["spoken"], header["words"]
+        renderer.write(f"Resuming your {learning} - {spoken} vocab file: {len(words)} of {num_words} words entered.", "heading")
+    else:
+        # Get the languages of the vocabulary
+        learning = check_input("What language are you learning? ")
+        spoken = check_input("What language do you speak? ")
+        num_words = int(ask_num_words())
+        words = []
+        journal.start(learning, spoken, num_words)
+
+    # Save the language data in `data["languages"]`
+    data["languages"] = {
+        "learning": learning,
+        "spoken": spoken
+    }
+
+    # Get the word/meaning pairs, adding each one to the journal straight away
+    renderer.write(f"If a word has several meanings, type them all with '{ANSWER_SEPARATOR}' between them (such as 'dog{ANSWER_SEPARATOR}hound').")
+    while len(words) < num_words:
+        position = "next" if words else "first"
+        lang1_word = dynamic_input(f"What is the {position} {learning} word in the vocab list? ")
+        translated = dynamic_input(f"What is {lang1_word} in {spoken}? ")
+        journal.append(lang1_word, translated)
         words.append([lang1_word, translated])
         time.sleep(0.5)
         clear_lines(2)
@@ -213,35 +736,32 @@ def main() -> None:
     for i in range(len(words)):
         item1 = words[i][0] # The word in the foreign language
         item2 = words[i][1] # The word in the other language
-        data["words"][item1] = item2 # `item1: item2`
-
-    filename = check_input(f"{Fore.LIGHTCYAN_EX}What would you like the vocab file to be called? {Style.RESET_ALL}") # The name the user desires for the JSON file
-
-    # Check if the filename would work on Windows
-    if platform.system() == "Windows":
-        reserved = {"con","prn","aux","nul",
-                *(f"com{i}" for i in range(1,10)),
-                *(f"lpt{i}" for i in range(1,10))}
-
-        if filename.lower() in reserved:
-            print(f"{Fore.YELLOW}That filename cannot be used on Windows.{Style.RESET_ALL}")
+        data["words"][item1] = split_answers(item2) # `item1: item2`, or `item1: [item2, ...]` for several answers
+
+    while True:
+        filename = check_input("What would you like the vocab file to be called? ") # The name the user desires for the JSON file
+
+        # Set the absolute path of the file, checking the filename would work on Windows
+        abs_path = get_vocab_path(filename)
+        if abs_path is None:
+            renderer.write("That filename cannot be used on Windows.", "warning")
+            renderer.write("Your words are kept. Run 'vocabularyplus create --resume' to choose another name.", "warning")
+            renderer.flush()
+            journal.close()
             return
 
-    # Check if the filename ends in `.json`
-    if filename.lower().endswith(".json"):
-        has_file_extension = True
-    else:
-        has_file_extension = False
-
-    # Set the absolute path of the file
-    if has_file_extension == True:
-        abs_path = os.path.join(JSON_DIR, filename)
-    else:
-        abs_path = os.path.join(JSON_DIR, f"{filename}.json")
+        # Only replace an existing vocab file if the user says so
+        if not os.path.exists(abs_path):
+            break
+        if check_input(f"{os.path.basename(abs_path)} already exists. Replace it? (y/n) ").lower() in ("y", "yes"):
+            break
 
-    # Save the data into the JSON file
+    # Save the data into the JSON file, then the journal is no longer needed
     save_json(abs_path, data)
-    print(f"{Fore.GREEN}Saved as {abs_path}{Style.RESET_ALL}")
+    journal.discard()
+    _journal = None
+    renderer.write(f"Saved as {abs_path}", "success")
+    renderer.flush()
 
 # Run the main loop
 if __name__ == "__main__":
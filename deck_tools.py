@@ -0,0 +1,797 @@
+"""
+The commands that work on vocabulary files: `compile`, `check`, `compress`,
+`merge` and `split`.
+
+This module is only imported when one of them runs (see `vocabularyplus.main`).
+"""
+from typing import Tuple, Dict
+import re
+import json
+import time
+import os
+
+from vocabularyplus import (
+    JSON_DIR, COMPRESS_FORMATS, DEFAULT_COMPRESS_FORMAT, CONFLICT_POLICIES, VocabFileError,
+    is_listed_deck, split_deck_suffix, open_deck, parse_answers, normalise_answer, compile_deck,
+    get_renderer, get_display_filename, resolve_deck_path, select_decks,
+)
+
+# ------------------------- Compile and check -------------------------
+
+def compile_decks(filenames: list) -> int:
+    """
+    Compile vocabulary files to the compiled deck format (see `compile_deck`).
+
+    :param filenames: The files to compile (see `list_deck_paths`); an empty list compiles every file in `JSON_DIR`
+    :type filenames: list
+    :return: The exit code: 0 if every file was compiled, otherwise 1
+    :rtype: int
+    """
+    renderer = get_renderer()
+    exit_code = 0
+    for json_path in list_deck_paths(filenames):
+        start = time.perf_counter()
+        try:
+            compiled_path = compile_deck(json_path)
+        except (OSError, VocabFileError) as e:
+            renderer.write(f"Could not compile {get_display_filename(json_path)}: {e}", "error")
+            renderer.flush()
+            exit_code = 1
+            continue
+        elapsed = time.perf_counter() - start
+        renderer.write(f"Compiled {get_display_filename(json_path)} to {compiled_path} in {elapsed:.2f}s", "success")
+        renderer.flush()
+
+    return exit_code
+
+# Problems `check_deck` reports for each file before leaving out the rest
+CHECK_MAX_ISSUES = 10
+# With this many files or fewer, `check_decks` does not start a process pool
+CHECK_SERIAL_LIMIT = 8
+
+def _find_duplicates(pairs: list) -> dict:
+    """
+    An `object_pairs_hook` for `json.loads` that remembers repeated keys.
+
+    `json` keeps only the last value of a repeated key, so the repeats are
+    stored under the (otherwise impossible) key `None`, to be reported.
+    """
+    result: dict = {}
+    repeated: list = []
+    for key, value in pairs:
+        if key in result:
+            repeated.append(key)
+        result[key] = value
+    if repeated:
+        result[None] = repeated  # type: ignore
+    return result
+
+def _quote_words(words: list, limit: int = 5) -> str:
+    """ Return the first `limit` words, quoted and separated by commas, followed by how many were left out. """
+    quoted = ", ".join(map(repr, words[:limit]))
+    return quoted + (f" and {len(words) - limit} more" if len(words) > limit else "")
+
+def list_deck_paths(filenames: list) -> list:
+    """
+    Return the paths of the vocabulary files given on the command line, or of every one in `JSON_DIR`.
+
+    The directory is listed directly; the catalog would parse every changed file first.
+
+    :param filenames: The files (see `resolve_deck_path`); an empty list means every file in `JSON_DIR`
+    :type filenames: list
+    :return: The paths, sorted by name when the directory was listed. Files that do not exist are \
+        kept (in `JSON_DIR`, if relative) so that they can be reported
+    :rtype: list
+    """
+    if filenames:
+        paths = []
+        for name in filenames:
+            try:
+                paths.append(resolve_deck_path(name))
+            except FileNotFoundError:
+                paths.append(name if os.path.isabs(name) else os.path.join(JSON_DIR, name))
+        return paths
+    try:
+        with os.scandir(JSON_DIR) as it:
+            return sorted((entry.path for entry in it
+                           if is_listed_deck(entry.name) and entry.is_file()),
+                          key=str.casefold)
+    except OSError:
+        return []
+
+def check_deck(path: str) -> Tuple[str, list]:
+    """
+    Check a vocabulary file for problems, without stopping at the first one.
+
+    Errors are problems that stop the file from working as intended:
+    invalid UTF-8 or JSON, a missing or wrong `languages` or `words` entry,
+    words or translations that are not text (or, for translations, a list
+    of text) or are empty, and learning words that appear more than once
+    (only the last one is kept).
+
+    Warnings are problems that make questions ambiguous or confusing:
+    spoken words shared by several learning words, translations listed
+    twice for a word, words that only differ by case, spacing or accents,
+    words with spaces at either end, missing words, the same language
+    twice, unknown entries and a byte order mark.
+
+    This runs in worker processes (see `check_decks`), so it only takes and returns plain values.
+
+    :param path: The path of the vocabulary file
+    :type path: str
+    :return: The path and a list of `(severity, message)` tuples, where `severity` is `"error"` or `"warning"`
+    :rtype: Tuple[str, list]
+    """
+    issues: list = []
+    def error(message: str) -> None:
+        issues.append(("error", message))
+    def warning(message: str) -> None:
+        issues.append(("warning", message))
+
+    # Encoding and syntax
+    try:
+        with open_deck(path, binary=True) as f:
+            raw = f.read()
+    except OSError as e:
+        return path, [("error", f"cannot be read: {e.strerror or e}")]
+    except Exception as e:
+        # A damaged compressed file: cut short (`EOFError`) or corrupt (`lzma.LZMAError`)
+        return path, [("error", f"cannot be decompressed: {e or type(e).__name__}")]
+
+    if raw.startswith(b"\xef\xbb\xbf"):
+        warning("starts with a byte order mark, which some programs (including Vocabulary Plus) cannot read")
+        raw = raw[3:]
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return path, issues + [("error", f"is not valid UTF-8 (byte {e.start})")]
+    try:
+        data = json.loads(text, object_pairs_hook=_find_duplicates)
+    except ValueError as e:
+        return path, issues + [("error", f"is not valid JSON: {e}")]
+
+    # Schema
+    if not isinstance(data, dict):
+        return path, issues + [("error", "must be a JSON object with 'languages' and 'words'")]
+    for key in data.pop(None, []):
+        error(f"has {key!r} more than once")
+    for key in data:
+        if key not in ("languages", "words"):
+            warning(f"has an unknown entry {key!r}")
+
+    languages = data.get("languages")
+    if not isinstance(languages, dict):
+        error("has no 'languages' object")
+    else:
+        for key in languages.pop(None, []):
+            error(f"has the language {key!r} more than once")
+        for key in ("learning", "spoken"):
+            if not isinstance(languages.get(key), str):
+                error(f"has no {key} language (languages.{key} must be text)")
+            elif not languages[key].strip():
+                error(f"has an empty {key} language")
+        learning, spoken = languages.get("learning"), languages.get("spoken")
+        if isinstance(learning, str) and isinstance(spoken, str) and learning.strip() and learning.casefold().strip() == spoken.casefold().strip():
+            warning(f"has the same learning and spoken language ({learning})")
+
+    words = data.get("words")
+    if not isinstance(words, dict):
+        error("has no 'words' object")
+        return path, issues
+
+    for key in words.pop(None, []):
+        error(f"has the learning word {key!r} more than once; only the last translation is used")
+    if not words:
+        warning("has no words")
+
+    # Words and translations
+    reverse: Dict[str, list] = {}
+    normalised_keys: Dict[str, list] = {}
+    for learning_word, value in words.items():
+        # A translation, or a list of accepted translations (see `parse_answers`)
+        if isinstance(value, str):
+            answers = [value]
+        elif isinstance(value, list) and all(isinstance(answer, str) for answer in value):
+            answers = value
+            if not answers:
+                error(f"has an empty list of translations for {learning_word!r}")
+                continue
+            if len(set(answers)) < len(answers):
+                warning(f"lists a translation of {learning_word!r} more than once")
+        else:
+            error(f"the translation of {learning_word!r} is not text or a list of text")
+            continue
+        for side, word in (("learning word", learning_word), *(("translation", answer) for answer in answers)):
+            if not word.strip():
+                error(f"has an empty {side}" + (f" (for {learning_word!r})" if side == "translation" else ""))
+            elif word != word.strip():
+                warning(f"the {side} {word!r} has spaces at the start or end")
+        for spoken_word in dict.fromkeys(answers):
+            reverse.setdefault(spoken_word, []).append(learning_word)
+        normalised_keys.setdefault(normalise_answer(learning_word, "accents"), []).append(learning_word)
+
+    # Spoken words with several learning words: every one is accepted, but `get_dict_key` only finds the first.
+    for spoken_word, learning_words in reverse.items():
+        if len(learning_words) > 1:
+            warning(f"{spoken_word!r} is the translation of {len(learning_words)} words: {_quote_words(learning_words)}")
+
+    # Words that only differ by case, spacing or accents look the same to learners (and to `--match`).
+    normalised_values: Dict[str, list] = {}
+    for spoken_word in reverse:
+        normalised_values.setdefault(normalise_answer(spoken_word, "accents"), []).append(spoken_word)
+    for side, groups in (("learning words", normalised_keys), ("translations", normalised_values)):
+        for group in groups.values():
+            if len(group) > 1:
+                warning(f"the {side} {_quote_words(group)} only differ by case, spacing or accents")
+
+    return path, issues
+
+def check_decks(filenames: list, jobs: int | None = None, strict: bool = False) -> int:
+    """
+    Check vocabulary files for problems (see `check_deck`) and print a report.
+
+    Files are checked in parallel by a process pool, so a library of
+    thousands of files is checked in seconds. A few files are checked in
+    this process, as starting the pool would take longer than checking them.
+
+    :param filenames: The files to check (see `list_deck_paths`); an empty list checks every file in `JSON_DIR`
+    :type filenames: list
+    :param jobs: The number of worker processes. Defaults to the number of CPUs
+    :type jobs: int | None
+    :param strict: Whether warnings also make the check fail
+    :type strict: bool
+    :return: The exit code: 0 if no file has errors (or warnings, if `strict`), otherwise 1
+    :rtype: int
+    """
+    paths = list_deck_paths(filenames)
+
+    start = time.perf_counter()
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    executor = None
+    if len(paths) <= CHECK_SERIAL_LIMIT or jobs == 1:
+        results = map(check_deck, paths)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(paths)))
+        # Large chunks keep the cost of sending work to the workers low.
+        results = executor.map(check_deck, paths, chunksize=max(1, len(paths) // (jobs * 4)))
+
+    renderer = get_renderer()
+    counts = {"ok": 0, "warning": 0, "error": 0}
+    try:
+        for path, issues in results:
+            severities = {severity for severity, _ in issues}
+            status = "error" if "error" in severities else ("warning" if severities else "ok")
+            counts[status] += 1
+            if not issues:
+                continue
+
+            renderer.write(get_display_filename(path) + f" ({path})", "error" if status == "error" else "warning")
+            for severity, message in issues[:CHECK_MAX_ISSUES]:
+                renderer.write(f"  {severity}: {message}", "dim" if severity == "warning" else None)
+            if len(issues) > CHECK_MAX_ISSUES:
+                renderer.write(f"  ... and {len(issues) - CHECK_MAX_ISSUES} more", "dim")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    failed = counts["error"] + (counts["warning"] if strict else 0)
+    renderer.write(
+        f"Checked {len(paths)} file{'' if len(paths) == 1 else 's'} in {elapsed:.2f}s: "
+        f"{counts['ok']} OK, {counts['warning']} with warnings, {counts['error']} with errors.",
+        "error" if failed else "success",
+    )
+    renderer.flush()
+    return 1 if failed else 0
+
+# ----------------------------- Compression -----------------------------
+
+# With this many files or fewer, `compress_decks` does not start a process pool
+COMPRESS_SERIAL_LIMIT = 2
+
+def compress_deck(path: str, file_format: str = DEFAULT_COMPRESS_FORMAT, level: int | None = None) -> Tuple[str, str, int, int, str | None]:
+    """
+    Store a vocabulary file in another format (see `COMPRESS_FORMATS`), replacing the original.
+
+    The file is decompressed and compressed a block at a time, without
+    being parsed, so its contents stay exactly the same. The new file is
+    written to a temporary file, flushed to disk and moved into place
+    before the original is removed, and it keeps the original's
+    modification time, so compiled decks made from it stay valid.
+
+    This runs in worker processes (see `compress_decks`), so it only takes and returns plain values.
+
+    :param path: The path of the vocabulary file
+    :type path: str
+    :param file_format: A key of `COMPRESS_FORMATS`
+    :type file_format: str
+    :param level: The compression level (gz: 1 to 9, xz: 0 to 9). Defaults to 6, which is much faster than 9 for gz and nearly as small
+    :type level: int | None
+    :return: The path, the new path, the sizes in bytes before and after, and an error message (or None)
+    :rtype: Tuple[str, str, int, int, str | None]
+    """
+    output = split_deck_suffix(path)[0] + COMPRESS_FORMATS[file_format]
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    try:
+        stat = os.stat(path)
+        with open_deck(path, binary=True) as source, open(tmp_path, "wb") as raw:
+            if file_format == "gz":
+                import gzip
+                # No name or time in the header, so the same words always give the same file.
+                target = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0,
+                                       compresslevel=6 if level is None else level)
+            elif file_format == "xz":
+                import lzma
+                target = lzma.LZMAFile(raw, "wb", preset=level)
+            else:
+                target = None
+
+            # Closing the compressor writes its trailer, but leaves `raw` open to be synced.
+            while True:
+                block = source.read(1 << 20)
+                if not block:
+                    break
+                (target or raw).write(block)
+            if target is not None:
+                target.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, output)
+        if os.path.abspath(output) != os.path.abspath(path):
+            os.remove(path)
+        return path, output, stat.st_size, os.path.getsize(output), None
+    except Exception as e:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        message = e.strerror if isinstance(e, OSError) and e.strerror else (str(e) or type(e).__name__)
+        return path, output, 0, 0, message
+
+def compress_decks(filenames: list, file_format: str | None = None, level: int | None = None,
+                   jobs: int | None = None, force: bool = False) -> int:
+    """
+    Compress, recompress or decompress vocabulary files (see `compress_deck`) and print a report.
+
+    Files are converted in parallel by a process pool. Files that are
+    already in the chosen format are skipped unless `force` is given, which
+    recompresses them (for example at another `level`). Without a format,
+    plain files are compressed with `DEFAULT_COMPRESS_FORMAT` and files that
+    are already compressed are left alone.
+
+    :param filenames: The files to convert (see `list_deck_paths`); an empty list converts every file in `JSON_DIR`
+    :type filenames: list
+    :param file_format: A key of `COMPRESS_FORMATS`, or None
+    :type file_format: str | None
+    :param level: The compression level (see `compress_deck`)
+    :type level: int | None
+    :param jobs: The number of worker processes. Defaults to the number of CPUs
+    :type jobs: int | None
+    :param force: Whether to convert every file, even those already in the chosen format
+    :type force: bool
+    :return: The exit code: 0 if every file was converted, otherwise 1
+    :rtype: int
+    """
+    paths = list_deck_paths(filenames)
+    if file_format is None:
+        file_format = DEFAULT_COMPRESS_FORMAT
+        paths = [path for path in paths if force or split_deck_suffix(path)[1].lower() == ".json"]
+    suffix = COMPRESS_FORMATS[file_format]
+    paths = [path for path in paths if force or split_deck_suffix(path)[1].lower() != suffix]
+
+    start = time.perf_counter()
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    arguments = ([file_format] * len(paths), [level] * len(paths))
+    executor = None
+    if len(paths) <= COMPRESS_SERIAL_LIMIT or jobs == 1:
+        results = map(compress_deck, paths, *arguments)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(paths)))
+        # One file at a time, as files can differ a lot in size.
+        results = executor.map(compress_deck, paths, *arguments)
+
+    renderer = get_renderer()
+    converted = before = after = 0
+    try:
+        for path, output, size, new_size, error in results:
+            if error is not None:
+                renderer.write(f"Could not convert {get_display_filename(path)}: {error}", "error")
+            else:
+                converted += 1
+                before += size
+                after += new_size
+                renderer.write(f"{os.path.basename(path)} -> {os.path.basename(output)} ({size:,} -> {new_size:,} bytes)", "heading")
+            renderer.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    failed = len(paths) - converted
+    renderer.write(f"Converted {converted} file{'' if converted == 1 else 's'} to {suffix}"
+                   f" in {elapsed:.2f}s: {before:,} -> {after:,} bytes" + (f" ({failed} failed)" if failed else ""),
+                   "warning" if failed else "success")
+    renderer.flush()
+    return 1 if failed else 0
+
+# --------------------------- Merge and split ---------------------------
+
+
+# JSON whitespace, as skipped by the `json` module
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class DeckReader:
+    """
+    Read the words of a vocabulary file one at a time, without loading the whole file.
+
+    The file is read in chunks of `CHUNK_SIZE` characters, and each key and
+    value is parsed with `json.JSONDecoder.raw_decode`, so memory use does
+    not depend on the size of the file. `languages` is read when the reader
+    is created; iterating over the reader yields `(learning word, spoken word)`
+    pairs in file order, including any repeated learning words. The spoken
+    word is a list for words with several answers (see `parse_answers`).
+
+    Use it as a context manager, so the file is closed.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: The path of the vocabulary file
+        :type path: str
+        :raises OSError: If the file cannot be read
+        :raises VocabFileError: If the file is not a valid vocabulary file
+        """
+        self.path = path
+        self.languages: Dict[str, str] = {}
+        self._decoder = json.JSONDecoder()
+        # The C scanner behind `raw_decode`, called directly as it runs once per key and value
+        self._scan = self._decoder.scan_once
+        self._file = None
+        self._open()
+
+        # Read up to the start of `words`, picking up `languages` on the way.
+        if not self._find_words():
+            raise self._error("has no 'languages' or 'words' object")
+
+    def _open(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = open_deck(self.path, encoding="utf-8-sig")
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def _error(self, message: str) -> VocabFileError:
+        return VocabFileError(f"{get_display_filename(self.path)} {message}")
+
+    def _fill(self) -> bool:
+        """ Read the next chunk, keeping what has not been parsed yet. Returns False at the end of the file. """
+        if self._eof:
+            return False
+        chunk = self._file.read(self.CHUNK_SIZE)  # type: ignore
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+        return True
+
+    def _peek(self) -> str:
+        """ Skip whitespace and return the next character, or "" at the end of the file. """
+        while True:
+            self._position = _JSON_WHITESPACE.match(self._buffer, self._position).end()  # type: ignore
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        """ Read one of `characters`, skipping whitespace, and return it. """
+        character = self._peek()
+        if not character or character not in characters:
+            raise self._error(f"is not valid JSON: expected {' or '.join(map(repr, characters))} at {character!r}")
+        self._position += 1
+        return character
+
+    def _value(self):
+        """ Read one JSON value. """
+        self._peek()
+        while True:
+            try:
+                value, end = self._scan(self._buffer, self._position)
+                # A value that reaches the end of the buffer (such as a number) may continue in the next chunk.
+                if end < len(self._buffer) or self._eof:
+                    self._position = end
+                    return value
+            except (StopIteration, ValueError):
+                if self._eof:
+                    try:
+                        # Only for the error message
+                        self._decoder.raw_decode(self._buffer, self._position)
+                    except ValueError as e:
+                        raise self._error(f"is not valid JSON: {getattr(e, 'msg', e)}") from None
+                    raise self._error("is not valid JSON") from None
+            self._fill()
+
+    def _members(self):
+        """ Yield the keys of the object that starts here. The caller reads each value. """
+        self._expect("{")
+        if self._peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise self._error("is not valid JSON: object keys must be strings")
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+    def _find_words(self) -> bool:
+        """ Move to the start of the `words` object. Returns False if `languages` or `words` is missing. """
+        found_words = False
+        for key in self._members():
+            if key == "languages":
+                languages = self._value()
+                if not isinstance(languages, dict) or not all(isinstance(languages.get(side), str) for side in ("learning", "spoken")):
+                    raise self._error("has no learning or spoken language")
+                self.languages = {"learning": languages["learning"], "spoken": languages["spoken"]}
+            elif key == "words":
+                found_words = True
+                if self.languages:
+                    return True
+                # `words` comes first: skip it, then start again once `languages` is known.
+                for _ in self._pairs():
+                    pass
+            else:
+                self._value()
+
+        if not (found_words and self.languages):
+            return False
+        self._open()
+        return self._find_words()
+
+    def _pairs(self):
+        """ Yield the pairs of the `words` object that starts here. """
+        self._expect("{")
+        if self._peek() == "}":
+            self._position += 1
+            return
+
+        scan, whitespace = self._scan, _JSON_WHITESPACE.match
+        while True:
+            # Fast path: the whole pair and the comma or brace after it are in the buffer.
+            buffer = self._buffer
+            try:
+                learning_word, position = scan(buffer, whitespace(buffer, self._position).end())
+                position = whitespace(buffer, position).end()
+                if buffer[position] != ":":
+                    raise ValueError
+                spoken_word, position = scan(buffer, whitespace(buffer, position + 1).end())
+                position = whitespace(buffer, position).end()
+                end = buffer[position]
+                if end not in ",}":
+                    raise ValueError
+                self._position = position + 1
+            except (StopIteration, ValueError, IndexError):
+                # The pair continues in the next chunk (or is invalid): read it step by step.
+                learning_word = self._value()
+                self._expect(":")
+                spoken_word = self._value()
+                end = self._expect(",}")
+
+            if not isinstance(learning_word, str):
+                raise self._error("is not valid JSON: object keys must be strings")
+            if not isinstance(spoken_word, str) and not (
+                    isinstance(spoken_word, list) and spoken_word and all(isinstance(answer, str) for answer in spoken_word)):
+                raise self._error(f"has a translation of {learning_word!r} that is not text or a list of text")
+            yield learning_word, spoken_word
+            if end == "}":
+                return
+
+    def __iter__(self):
+        return self._pairs()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "DeckReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+def iter_merged_entries(json_paths: list, on_conflict: str = "first", counts: Dict[str, int] | None = None):
+    """
+    Yield the words of several vocabulary files, in order, with each learning word only once.
+
+    Files are streamed with `DeckReader`. Only the 64-bit hashes of each
+    learning word and its translation are kept in memory, not the words.
+
+    :param json_paths: The vocabulary files
+    :type json_paths: list
+    :param on_conflict: What to do when a learning word has different translations: \
+        keep the `"first"`, keep the `"last"` (which reads the files twice), or raise an `"error"`
+    :type on_conflict: str
+    :param counts: If given, the number of skipped `"duplicates"` (same translation) and `"conflicts"` (different translation) are added here
+    :type counts: Dict[str, int] | None
+    :return: An iterator of `(learning word, spoken word)` pairs
+    :raises VocabFileError: On a conflict, if `on_conflict` is `"error"`, or if a file is not a valid vocabulary file
+    """
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"parameter 'on_conflict' must be one of {', '.join(CONFLICT_POLICIES)}")
+    if counts is None:
+        counts = {}
+    counts.setdefault("duplicates", 0)
+    counts.setdefault("conflicts", 0)
+
+    # For "last", a first pass finds where each learning word appears for the last time.
+    last: Dict[int, Tuple[int, int]] | None = None
+    if on_conflict == "last":
+        last = {}
+        number = 0
+        for path in json_paths:
+            with DeckReader(path) as reader:
+                for learning_word, spoken_word in reader:
+                    last[hash(learning_word)] = (number, hash(parse_answers(spoken_word)))
+                    number += 1
+
+    kept: Dict[int, int] = {}
+    number = 0
+    for path in json_paths:
+        with DeckReader(path) as reader:
+            for learning_word, spoken_word in reader:
+                # `parse_answers` makes "dog" and ["dog"] the same translation.
+                key, value = hash(learning_word), hash(parse_answers(spoken_word))
+                if last is not None:
+                    last_number, kept_value = last[key]
+                    keep = last_number == number
+                else:
+                    kept_value = kept.get(key)
+                    keep = kept_value is None
+                    if keep:
+                        kept[key] = value
+                number += 1
+
+                if keep:
+                    yield learning_word, spoken_word
+                elif kept_value == value:
+                    counts["duplicates"] += 1
+                elif on_conflict == "error":
+                    raise VocabFileError(f"{learning_word!r} has more than one translation (one is {spoken_word!r}, in {get_display_filename(path)})")
+                else:
+                    counts["conflicts"] += 1
+
+def _read_languages(json_paths: list) -> Dict[str, str]:
+    """ Return the languages shared by vocabulary files, or raise `VocabFileError` if they differ. """
+    languages: Dict[str, str] = {}
+    for path in json_paths:
+        with DeckReader(path) as reader:
+            if not languages:
+                languages = reader.languages
+            elif (reader.languages["learning"].casefold(), reader.languages["spoken"].casefold()) != \
+                    (languages["learning"].casefold(), languages["spoken"].casefold()):
+                raise VocabFileError(
+                    f"{get_display_filename(path)} is {reader.languages['learning']} - {reader.languages['spoken']},"
+                    f" not {languages['learning']} - {languages['spoken']}"
+                )
+    return languages
+
+def merge_decks(inputs: list, output: str, on_conflict: str = "first", force: bool = False) -> int:
+    """
+    Merge vocabulary files into a new one, keeping each learning word once.
+
+    The inputs are streamed (see `iter_merged_entries`) and the output is
+    written atomically with `create_vocab_file.DeckWriter`, so an interrupted
+    merge never leaves a half-written file.
+
+    :param inputs: The vocabulary files or patterns to merge (see `select_decks`), which must have the same languages
+    :type inputs: list
+    :param output: The name of the new vocabulary file in `JSON_DIR`
+    :type output: str
+    :param on_conflict: What to do when a learning word has different translations (see `iter_merged_entries`)
+    :type on_conflict: str
+    :param force: Whether to replace `output` if it already exists. Defaults to False
+    :type force: bool
+    :return: The exit code: 0 on success, otherwise 1
+    :rtype: int
+    """
+    from create_vocab_file import DeckWriter, get_vocab_path
+
+    renderer = get_renderer()
+    start = time.perf_counter()
+    counts: Dict[str, int] = {}
+    try:
+        json_paths = select_decks(inputs)
+        languages = _read_languages(json_paths)
+        output_path = get_vocab_path(output)
+        if output_path is None:
+            raise VocabFileError(f"{output!r} cannot be used as a file name on Windows")
+        if not force and os.path.exists(output_path):
+            raise VocabFileError(f"{output_path} already exists (use --force to replace it)")
+        with DeckWriter(output_path, languages) as writer:
+            for learning_word, spoken_word in iter_merged_entries(json_paths, on_conflict, counts):
+                writer.write(learning_word, spoken_word)
+    except (OSError, VocabFileError) as e:
+        renderer.write(f"Could not merge: {e}", "error")
+        renderer.flush()
+        return 1
+
+    elapsed = time.perf_counter() - start
+    renderer.write(f"Merged {len(json_paths)} file{'' if len(json_paths) == 1 else 's'} into {output_path}: {writer.count} words"
+                   f" ({counts['duplicates']} duplicates and {counts['conflicts']} conflicts skipped) in {elapsed:.2f}s", "success")
+    renderer.flush()
+    return 0
+
+def split_deck(input_name: str, size: int, prefix: str | None = None, on_conflict: str = "first") -> int:
+    """
+    Split a vocabulary file into files of `size` words each, named `<prefix>-001.json`, `<prefix>-002.json`, ...
+
+    The input is streamed (see `iter_merged_entries`, which also removes
+    repeated learning words), and each part is written atomically.
+
+    :param input_name: The vocabulary file to split (see `resolve_deck_path`)
+    :type input_name: str
+    :param size: The number of words in each part
+    :type size: int
+    :param prefix: The name of the parts, without the number. Defaults to the name of the input
+    :type prefix: str | None
+    :param on_conflict: What to do when a learning word has different translations (see `iter_merged_entries`)
+    :type on_conflict: str
+    :return: The exit code: 0 on success, otherwise 1
+    :rtype: int
+    """
+    from create_vocab_file import DeckWriter, get_vocab_path
+
+    renderer = get_renderer()
+    start = time.perf_counter()
+    counts: Dict[str, int] = {}
+    written: list = []
+    writer = None
+    try:
+        if size < 1:
+            raise VocabFileError("each part needs at least 1 word")
+        json_path = resolve_deck_path(input_name)
+        languages = _read_languages([json_path])
+        prefix = prefix or split_deck_suffix(os.path.basename(json_path))[0]
+
+        for learning_word, spoken_word in iter_merged_entries([json_path], on_conflict, counts):
+            if writer is None or writer.count >= size:
+                if writer is not None:
+                    writer.close()
+                    written.append(writer.filename)
+                output_path = get_vocab_path(f"{prefix}-{len(written) + 1:03d}")
+                if output_path is None:
+                    raise VocabFileError(f"{prefix!r} cannot be used as a file name on Windows")
+                writer = DeckWriter(output_path, languages)
+            writer.write(learning_word, spoken_word)
+
+        if writer is not None:
+            writer.close()
+            written.append(writer.filename)
+            writer = None
+    except (OSError, VocabFileError) as e:
+        if writer is not None:
+            writer.abort()
+        renderer.write(f"Could not split {input_name}: {e}", "error")
+        if written:
+            renderer.write(f"{len(written)} part{'' if len(written) == 1 else 's'} had already been written.", "warning")
+        renderer.flush()
+        return 1
+
+    elapsed = time.perf_counter() - start
+    renderer.write(f"Split {get_display_filename(json_path)} into {len(written)} file{'' if len(written) == 1 else 's'}"
+                   f" ({counts['duplicates']} duplicates and {counts['conflicts']} conflicts skipped) in {elapsed:.2f}s", "success")
+    for path in written:
+        renderer.write(f"  {path}")
+    renderer.flush()
+    return 0
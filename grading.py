@@ -0,0 +1,252 @@
+"""
+The `grade` command, which marks files of learners' answers in parallel.
+
+This module is only imported when the command runs (see `vocabularyplus.main`).
+"""
+from typing import Tuple, Dict
+import json
+import time
+import sys
+import os
+
+from vocabularyplus import (
+    VocabFileError, Deck, CompiledDeck, SessionStats, deck_cache, check_answer, resolve_deck_path,
+)
+
+# ------------------------------- Grading -------------------------------
+
+# `grade` splits an answer sheet into about this many byte ranges per worker...
+GRADE_CHUNKS_PER_JOB = 4
+# ...each at least this many bytes long
+GRADE_MIN_CHUNK_BYTES = 1 << 20
+# At most this many problem rows are described in the report
+GRADE_MAX_PROBLEMS = 10
+# Each worker remembers the verdicts of up to this many different (word, direction, answer) rows
+GRADE_CACHE_SIZE = 1 << 16
+
+# The deck and `--match` level of this grading process, see `_start_grader`
+_grader: "Tuple[Deck | CompiledDeck, str] | None" = None
+
+def _start_grader(json_path: str, match: str) -> None:
+    """ Load the deck to grade against, once per worker process. A forked worker finds it already cached. """
+    global _grader
+    _grader = (deck_cache.get(json_path), match)
+
+def grade_range(sheet_path: str, start: int, end: int, delimiter: str = ",") -> Tuple[Dict[str, list], int, list]:
+    """
+    Grade the rows of an answer sheet that start between two byte offsets.
+
+    Each row is `learner, word, direction, answer`, where `direction` is
+    `keys` if `word` is in the language being learned or `values` if it is
+    in the spoken language, as in `check_answer`. A row without an answer
+    was not answered. A header row (with `direction` in the third column)
+    at the start of the sheet is skipped. Rows must not span several lines.
+
+    This runs in worker processes (see `grade_sheet`), so it only takes and
+    returns plain values. `_start_grader` must have been called first.
+
+    :param sheet_path: The path of the answer sheet
+    :type sheet_path: str
+    :param start: The offset of the first byte of the range
+    :type start: int
+    :param end: The offset just after the range. The row that crosses it is graded in full
+    :type end: int
+    :param delimiter: The column separator, `","` (CSV) or `"\t"` (TSV)
+    :type delimiter: str
+    :return: `[correct, incorrect, not_answered]` for each learner, the number of rows \
+        that could not be graded, and descriptions of the first few of them
+    :rtype: Tuple[Dict[str, list], int, list]
+    """
+    import csv
+
+    deck, match = _grader  # type: ignore
+    with open(sheet_path, "rb") as f:
+        # Rows belong to the range they start in, so skip the end of a row that started before it.
+        if start:
+            f.seek(start - 1)
+            start += len(f.readline()) - 1
+        if start >= end:
+            return {}, 0, []
+        data = f.read(end - start)
+        if not data.endswith(b"\n"):
+            data += f.readline()
+
+    lines = data.decode("utf-8-sig" if start == 0 else "utf-8", errors="replace").split("\n")
+    if start == 0:
+        header = next(csv.reader(lines[:1], delimiter=delimiter), [])
+        if len(header) >= 3 and header[2].strip().lower() == "direction":
+            del lines[0]
+
+    scores: Dict[str, list] = {}
+    skipped = 0
+    problems: list = []
+    # Learners sitting the same test give the same answers to the same questions again and again.
+    verdicts: Dict[Tuple[str, str, str], bool] = {}
+    get_verdict = verdicts.get
+    get_score = scores.get
+    for row in csv.reader(lines, delimiter=delimiter):
+        if len(row) == 4:
+            learner, word, direction, answer = row
+        elif len(row) == 3:
+            learner, word, direction = row
+            answer = ""
+        elif not row:
+            continue
+        else:
+            skipped += 1
+            if len(problems) < GRADE_MAX_PROBLEMS:
+                problems.append(f"{delimiter.join(row)!r}: expected a learner, word, direction and answer")
+            continue
+
+        key = (word, direction, answer)
+        is_correct = get_verdict(key)
+        if is_correct is None:
+            if direction in ("keys", "values"):
+                try:
+                    is_correct = check_answer(word, answer, deck, direction, match)[0]
+                    problem = None
+                except VocabFileError:
+                    problem = f"{word!r} is not in the vocabulary file"
+            else:
+                problem = "the direction must be 'keys' or 'values'"
+            if problem is not None:
+                skipped += 1
+                if len(problems) < GRADE_MAX_PROBLEMS:
+                    problems.append(f"{delimiter.join(row)!r}: {problem}")
+                continue
+            if len(verdicts) >= GRADE_CACHE_SIZE:
+                verdicts.clear()
+            verdicts[key] = is_correct
+
+        # The same breakdown as `SessionStats.record`
+        score = get_score(learner)
+        if score is None:
+            score = scores[learner] = [0, 0, 0]
+        if is_correct:
+            score[0] += 1
+        elif answer == "":
+            score[2] += 1
+        else:
+            score[1] += 1
+
+    return scores, skipped, problems
+
+def grade_sheet(json_path: str, sheet_path: str, match: str = "exact", jobs: int | None = None,
+                delimiter: str = ",") -> Tuple[Dict[str, SessionStats], int, list]:
+    """
+    Grade a large answer sheet against one vocabulary file (see `grade_range`).
+
+    The deck is loaded once. The sheet is split into byte ranges at row
+    boundaries, which worker processes read and grade in parallel; only the
+    scores of each learner are sent back, so memory does not grow with the
+    size of the sheet. Small sheets are graded in this process.
+
+    :param json_path: The path of the vocabulary file
+    :type json_path: str
+    :param sheet_path: The path of the answer sheet
+    :type sheet_path: str
+    :param match: How forgiving answer checking is (one of `MATCH_LEVELS`)
+    :type match: str
+    :param jobs: The number of worker processes. Defaults to the number of CPUs
+    :type jobs: int | None
+    :param delimiter: The column separator, `","` (CSV) or `"\t"` (TSV)
+    :type delimiter: str
+    :return: The statistics of each learner, in the order they first appear, the number of rows \
+        that could not be graded, and descriptions of the first few of them
+    :rtype: Tuple[Dict[str, SessionStats], int, list]
+    :raises OSError: If the sheet cannot be read
+    :raises VocabFileError: If the vocabulary file is not valid
+    """
+    # Loaded before the pool starts, so forked workers share it.
+    _start_grader(json_path, match)
+    size = os.path.getsize(sheet_path)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    chunks = max(1, min(jobs * GRADE_CHUNKS_PER_JOB, size // GRADE_MIN_CHUNK_BYTES))
+    bounds = [size * i // chunks for i in range(chunks + 1)]
+    arguments = ([sheet_path] * chunks, bounds[:-1], bounds[1:], [delimiter] * chunks)
+
+    executor = None
+    if chunks == 1 or jobs == 1:
+        results = map(grade_range, *arguments)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=min(jobs, chunks), initializer=_start_grader, initargs=(json_path, match))
+        results = executor.map(grade_range, *arguments)
+
+    learners: Dict[str, SessionStats] = {}
+    skipped = 0
+    problems: list = []
+    try:
+        for scores, chunk_skipped, chunk_problems in results:
+            for learner, (correct, incorrect, not_answered) in scores.items():
+                stats = learners.get(learner)
+                if stats is None:
+                    stats = learners[learner] = SessionStats(history_limit=0)
+                stats.correct += correct
+                stats.incorrect += incorrect
+                stats.not_answered += not_answered
+            skipped += chunk_skipped
+            problems += chunk_problems[:GRADE_MAX_PROBLEMS - len(problems)]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return learners, skipped, problems
+
+def run_grading(deck_name: str, sheet_path: str, match: str = "exact", jobs: int | None = None,
+                file_format: str | None = None) -> int:
+    """
+    Grade an answer sheet (see `grade_sheet`) from the command line.
+
+    One JSON object is written to stdout per learner, with the same
+    breakdown as the quiz summary, and a summary with the number of rows
+    per second is written to stderr, as in `run_headless`.
+
+    :param deck_name: The vocabulary file (see `resolve_deck_path`)
+    :type deck_name: str
+    :param sheet_path: The answer sheet
+    :type sheet_path: str
+    :param match: How forgiving answer checking is (one of `MATCH_LEVELS`)
+    :type match: str
+    :param jobs: The number of worker processes. Defaults to the number of CPUs
+    :type jobs: int | None
+    :param file_format: `"csv"` or `"tsv"`. Defaults to `"tsv"` for `.tsv` and `.tab` files, otherwise `"csv"`
+    :type file_format: str | None
+    :return: The exit code: 0 if every row was graded, otherwise 1
+    :rtype: int
+    """
+    if file_format is None:
+        file_format = "tsv" if sheet_path.lower().endswith((".tsv", ".tab")) else "csv"
+
+    start = time.perf_counter()
+    try:
+        learners, skipped, problems = grade_sheet(resolve_deck_path(deck_name), sheet_path, match, jobs,
+                                                  "\t" if file_format == "tsv" else ",")
+    except (OSError, VocabFileError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    write = sys.stdout.write
+    rows = skipped
+    for learner, stats in learners.items():
+        rows += stats.total
+        write(json.dumps({
+            "learner": learner,
+            "questions": stats.total,
+            "correct": stats.correct,
+            "incorrect": stats.incorrect,
+            "not_answered": stats.not_answered,
+        }, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+    for problem in problems:
+        print(f"Could not grade {problem}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "rows": rows,
+        "learners": len(learners),
+        "skipped": skipped,
+        "seconds": round(elapsed, 6),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+    }), file=sys.stderr)
+    return 1 if skipped else 0
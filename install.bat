@@ -60,6 +60,8 @@ set "BASE_URL=https://raw.githubusercontent.com/46Dimensions/VocabularyPlus/main
 set "REQ_URL=%BASE_URL%/requirements.txt"
 set "1.3.1_URL=%BASE_URL%/main.py"
 set "CREATE_URL=%BASE_URL%/create_vocab_file.py"
+:: The modules main.py imports, downloaded from %BASE_URL%
+set "MODULES=vocabularyplus.py deck_tools.py grading.py lookup.py quiz_server.py profiling.py"
 set "ICON_URL=%BASE_URL%/app_icon.png"
 set "VP_VM_INSTALLER_URL=https://raw.githubusercontent.com/46Dimensions/vp-vm/main/install-vm.bat"
 
@@ -74,6 +76,9 @@ echo %yellow%Downloading files...%reset%
 curl -fsSL "%REQ_URL%" -o requirements.txt || (echo %red%Failed to download requirements.txt%reset% & exit /b 1)
 curl -fsSL "%MAIN_URL%" -o main.py || (echo %red%Failed to download main.py%reset% & exit /b 1)
 curl -fsSL "%CREATE_URL%" -o create_vocab_file.py || (echo %red%Failed to download create_vocab_file.py%reset% & exit /b 1)
+for %%M in (%MODULES%) do (
+    curl -fsSL "%BASE_URL%/%%M" -o %%M || (echo %red%Failed to download %%M%reset% & exit /b 1)
+)
 curl -fsSL "%ICON_URL%" -o app_icon.png || (echo %red%Failed to download icon%reset% & exit /b 1)
 
 :: Virtual environment
@@ -110,8 +115,29 @@ echo if "%%1"=="--help" (
     echo echo "Usage: vocabularyplus [create] [options]"
     echo echo "Commands:"
     echo echo "  create        Create a new vocabulary file"
+    echo echo "  create --from FILE   Import a vocabulary file from CSV, TSV or JSON lines"
+    echo echo "  create --resume Carry on creating a vocabulary file that was interrupted"
+    echo echo "  check [FILE...] Check vocabulary files for problems (--strict fails on warnings)"
+    echo echo "  compress [FILE...] Compress vocabulary files (--format gz, xz or json)"
+    echo echo "  merge FILE... -o NAME Join vocabulary files, keeping each word once"
+    echo echo "  split FILE --size N Split a vocabulary file into lessons of N words"
+    echo echo "  grade DECK ANSWERS Grade a CSV/TSV file of learners' answers"
+    echo echo "  lookup WORD [--prefix] Find a word in every vocabulary file, in either language"
+    echo echo "  serve           Run quizzes for many learners over the network"
+    echo echo "  client [DECK...] Take a quiz from a Vocabulary Plus server"
+    echo echo "  compile       Compile vocabulary files for fast loading of large decks"
     echo echo "  uninstall     Uninstall Vocabulary Plus"
     echo echo "Options:"
+    echo echo "  --strategy srs  Ask words when they are due for review (spaced repetition)"
+    echo echo "  --no-review-log Do not record answers in the review log"
+    echo echo "  --output FORMAT Coloured output (ansi, the default), plain text or JSON lines (jsonl)"
+    echo echo "  --prefetch N    Prepare N questions ahead while you answer (default 2, 0 = off)"
+    echo echo "  --profile [FILE] Time each stage of every question and save the results on exit"
+    echo echo "  --match LEVEL   Forgive mistakes: exact, casefold, accents or typo"
+    echo echo "  --deck DECK     Quiz on a vocab file or pattern (repeatable)"
+    echo echo "  --languages PAIR Quiz on every vocab file for a pair, e.g. French-English"
+    echo echo "  --weight DECK=N Ask about a vocab file more or less often"
+    echo echo "  --headless      Read answers from stdin and print JSON results (needs --deck FILE)"
     echo echo "  -v, --version   Show version information"
     echo echo "  --help          Show this help message"
     echo echo "Alias:"
@@ -171,11 +197,13 @@ echo )
 echo :: Remove files
 echo del /q main.py 2^>nul
 echo del /q create_vocab_file.py 2^>nul
+echo del /q %MODULES% 2^>nul
 echo del /q app_icon.png 2^>nul
 echo del /q requirements.txt 2^>nul
 
 echo :: Remove directories
 echo rmdir /s /q JSON 2^>nul
+echo rmdir /s /q __pycache__ 2^>nul
 echo rmdir /s /q venv 2^>nul
 
 echo echo %green%VocabularyPlus files and directories removed.%reset%
@@ -27,6 +27,8 @@ BASE_URL="https://raw.githubusercontent.com/46Dimensions/VocabularyPlus/main"
 REQ_URL="$BASE_URL/requirements.txt"
 MAIN_URL="$BASE_URL/main.py"
 CREATE_URL="$BASE_URL/create_vocab_file.py"
+# The modules main.py imports, downloaded from $BASE_URL
+MODULES="vocabularyplus.py deck_tools.py grading.py lookup.py quiz_server.py profiling.py"
 ICON_URL="$BASE_URL/app_icon.png"
 VP_VM_INSTALLER_URL="https://raw.githubusercontent.com/46Dimensions/vp-vm/main/install-vm.sh"
 
@@ -66,6 +68,9 @@ echo "${yellow}Downloading files...${reset}"
 curl -fsSL "$REQ_URL" -o requirements.txt || { echo "${red}Failed to download requirements.txt${reset}"; exit 1; }
 curl -fsSL "$MAIN_URL" -o main.py || { echo "${red}Failed to download main.py${reset}"; exit 1; }
 curl -fsSL "$CREATE_URL" -o create_vocab_file.py || { echo "${red}Failed to download create_vocab_file.py${reset}"; exit 1; }
+for MODULE in $MODULES; do
+    curl -fsSL "$BASE_URL/$MODULE" -o "$MODULE" || { echo "${red}Failed to download $MODULE${reset}"; exit 1; }
+done
 curl -fsSL "$ICON_URL" -o app_icon.png || { echo "${red}Failed to download icon${reset}"; exit 1; }
 
 echo "${yellow}Creating virtual environment...${reset}"
@@ -108,8 +113,29 @@ if [ "\$1" = "--help" ]; then
     echo "Usage: vocabularyplus [create] [options]"
     echo "Commands:"
     echo "  create                     Create a new vocabulary file"
+    echo "  create --from FILE         Import a vocabulary file from CSV, TSV or JSON lines (see 'create --help')"
+    echo "  create --resume            Carry on creating a vocabulary file that was interrupted"
+    echo "  check [FILE...] [--strict] Check vocabulary files for problems"
+    echo "  compress [FILE...]         Compress vocabulary files (--format gz|xz|json)"
+    echo "  merge FILE... -o NAME      Join vocabulary files, keeping each word once"
+    echo "  split FILE --size N        Split a vocabulary file into lessons of N words"
+    echo "  grade DECK ANSWERS         Grade a CSV/TSV file of learners' answers"
+    echo "  lookup WORD [--prefix]     Find a word in every vocabulary file, in either language"
+    echo "  serve                      Run quizzes for many learners over the network"
+    echo "  client [DECK...]           Take a quiz from a Vocabulary Plus server"
+    echo "  compile [FILE...]          Compile vocabulary files for fast loading of large decks"
     echo "  uninstall [-s|--silent]    Uninstall Vocabulary Plus. Silent mode (-s|--silent) produces no output."
     echo "Options:"
+    echo "  --strategy srs             Ask words when they are due for review (spaced repetition)"
+    echo "  --no-review-log            Do not record answers in the review log"
+    echo "  --output ansi|plain|jsonl  Coloured output (default), plain text or JSON lines"
+    echo "  --prefetch N               Prepare N questions ahead while you answer (default 2, 0 = off)"
+    echo "  --profile [FILE]           Time each stage of every question and save the results on exit"
+    echo "  --match LEVEL              Forgive mistakes: exact, casefold, accents or typo"
+    echo "  --deck DECK                Quiz on a vocab file or pattern (repeatable)"
+    echo "  --languages PAIR           Quiz on every vocab file for a pair, e.g. French-English"
+    echo "  --weight DECK=N            Ask about a vocab file more or less often"
+    echo "  --headless --deck FILE     Read answers from stdin (or --answers FILE) and print JSON results"
     echo "  -v, --version              Show version information"
     echo "  --help                     Show this help message"
     echo "Alias:"
@@ -168,9 +194,10 @@ deactivate 2>/dev/null || true
 
 echo "${yellow}Removing VocabularyPlus installation...${reset}"
 # Remove files
-rm -f main.py create_vocab_file.py app_icon.png requirements.txt
+rm -f main.py create_vocab_file.py $MODULES app_icon.png requirements.txt
 # Remove directories
 rm -rf JSON 2>/dev/null || true
+rm -rf __pycache__ 2>/dev/null || true
 rm -rf venv 2>/dev/null || true
 echo "${green}VocabularyPlus files & directories removed.${reset}"
 
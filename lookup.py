@@ -0,0 +1,373 @@
+"""
+The `lookup` command and the word index it keeps in `JSON_DIR`.
+
+This module is only imported when the command runs (see `vocabularyplus.main`).
+"""
+from typing import Tuple
+from colorama import Style
+from array import array
+import struct
+import heapq
+import mmap
+import json
+import time
+import sys
+import os
+
+from vocabularyplus import (
+    JSON_DIR, LOOKUP_INDEX_FILENAME, LOOKUP_DEFAULT_LIMIT, ANSWER_SEPARATOR, Deck, is_listed_deck,
+    split_deck_suffix, read_json, normalise_answer, get_renderer,
+)
+
+# -------------------------------- Lookup -------------------------------
+
+LOOKUP_MAGIC = b"VPLX"
+LOOKUP_VERSION = 2
+# magic, format version, reserved
+_LOOKUP_PREAMBLE = struct.Struct("<4sHH")
+# offsets table position, record count, header length, magic
+_LOOKUP_TRAILER = struct.Struct("<QQI4s")
+
+def _lookup_records(slot: int, deck: Deck) -> list:
+    """
+    Return the sorted index records of a deck: one per learning word, and one per answer for the other direction.
+
+    A record is `key NUL slot NUL direction NUL word NUL translation` in UTF-8,
+    where `key` is the word normalised like `--match accents` answers. NUL
+    sorts before every other character, so sorting the records sorts them by
+    key, and every record whose key starts with some text is next to the others.
+
+    :param slot: The number of the deck in the index header
+    :type slot: int
+    :param deck: The deck
+    :type deck: Deck
+    :return: The records
+    :rtype: list
+    """
+    def record(direction: str, word: str, translation: str) -> bytes:
+        # NUL separates the fields, so it cannot be part of them.
+        word = word.replace("\0", "")
+        translation = translation.replace("\0", "")
+        return "\0".join((normalise_answer(word, "accents"), tag, direction, word, translation)).encode("utf-8")
+
+    tag = str(slot)
+    records = []
+    for learning_word, answers in deck.entries():
+        records.append(record("keys", learning_word, ANSWER_SEPARATOR.join(answers)))
+        for answer in answers:
+            records.append(record("values", answer, learning_word))
+    records.sort()
+    return records
+
+class LookupIndex:
+    """
+    A sorted index of every word in every deck of a directory, for `lookup`.
+
+    The index is one file (`LOOKUP_INDEX_FILENAME`) read through `mmap`, laid
+    out as follows (all integers little-endian):
+
+    * A preamble: `LOOKUP_MAGIC`, the format version and a reserved field.
+    * The records (see `_lookup_records`) of every deck merged in sorted
+      order, back to back.
+    * Padding to an 8-byte boundary.
+    * `count + 1` unsigned 64-bit offsets of the records, from the first one.
+    * A UTF-8 JSON header with the decks: a list of `[filename, size,
+      mtime_ns, learning, spoken]`, where a record's slot is its position.
+      A deck that was removed leaves `null` behind until the slot is reused.
+    * A trailer: the position of the offsets, the number of records, the
+      length of the header and `LOOKUP_MAGIC` again.
+
+    The trailer comes last so the file can be written in one pass while the
+    records are merged. `update` only reads the decks that changed since the
+    index was written, and searching is a binary search over the offsets, so
+    a lookup costs a directory listing and O(log n) page reads however many
+    decks there are.
+
+    Attributes
+    ----------
+    path : str
+        The path of the index file.
+    decks : list
+        The header's deck table.
+    """
+
+    def __init__(self, directory: str = JSON_DIR) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, LOOKUP_INDEX_FILENAME)
+        self.decks: list = []
+        self._mm: mmap.mmap | None = None
+        self._count = 0
+        self._offsets_start = 0
+        self._open()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """ Unmap the index file. """
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self.decks = []
+        self._count = 0
+
+    def _open(self) -> None:
+        """ Map the index file, if there is a valid one. Otherwise, the index is empty until `update` writes it. """
+        self.close()
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # There is no index yet (mmap refuses empty files).
+            return
+
+        try:
+            magic, version, _ = _LOOKUP_PREAMBLE.unpack_from(mm, 0)
+            offsets_start, count, header_len, end_magic = _LOOKUP_TRAILER.unpack_from(mm, len(mm) - _LOOKUP_TRAILER.size)
+            if magic != LOOKUP_MAGIC or end_magic != LOOKUP_MAGIC or version != LOOKUP_VERSION:
+                raise ValueError("not a lookup index")
+            header_start = offsets_start + 8 * (count + 1)
+            if header_start + header_len + _LOOKUP_TRAILER.size != len(mm):
+                raise ValueError("truncated lookup index")
+            decks = json.loads(mm[header_start:header_start + header_len].decode("utf-8"))["decks"]
+        except Exception:
+            # A damaged or older index is rebuilt from scratch by `update`.
+            mm.close()
+            return
+
+        self._mm = mm
+        self._count = count
+        self._offsets_start = offsets_start
+        self.decks = decks
+
+    def _record(self, number: int) -> bytes:
+        """ Return the raw bytes of record `number`. """
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets_start + 8 * number)
+        return self._mm[_LOOKUP_PREAMBLE.size + start:_LOOKUP_PREAMBLE.size + end]
+
+    def _search(self, key: bytes) -> int:
+        """ Return the number of the first record that is not less than `key`. """
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def update(self) -> Tuple[int, int]:
+        """
+        Bring the index up to date with the decks in the directory.
+
+        Only the size and modification time of each deck are read, unless it
+        changed: then just that deck is parsed again, and its new records are
+        merged with the records of the others, which are already sorted.
+        Decks that cannot be read are remembered with no words, so they are
+        not read again until they change.
+
+        :return: The number of decks that were read and the number that were removed
+        :rtype: Tuple[int, int]
+        """
+        current = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not is_listed_deck(entry.name):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    current[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+
+        # Work out which slots still match their file and which are stale.
+        removed = sum(1 for info in self.decks if info is not None and info[0] not in current)
+        slots = {}
+        stale = set()
+        decks = list(self.decks)
+        for slot, info in enumerate(decks):
+            if info is None:
+                continue
+            name, size, mtime_ns = info[0], info[1], info[2]
+            if current.get(name) == (size, mtime_ns):
+                slots[name] = slot
+            else:
+                stale.add(slot)
+                decks[slot] = None
+
+        changed = sorted(name for name in current if name not in slots)
+        if not changed and not stale:
+            return 0, 0
+
+        # Read the new and changed decks, reusing the slots of removed ones.
+        free = [slot for slot, info in enumerate(decks) if info is None]
+        free.reverse()
+        new_records = []
+        for name in changed:
+            slot = free.pop() if free else len(decks)
+            if slot == len(decks):
+                decks.append(None)
+            size, mtime_ns = current[name]
+            path = os.path.join(self.directory, name)
+            try:
+                deck = Deck(path, read_json(path), mtime_ns, size)
+            except Exception:
+                # Unreadable, malformed JSON (`ValueError`) or a damaged compressed file; `check` explains why.
+                decks[slot] = [name, size, mtime_ns, None, None]
+                continue
+            decks[slot] = [name, size, mtime_ns, deck.learning, deck.spoken]
+            new_records.append(_lookup_records(slot, deck))
+
+        # Drop unused slots at the end so the table does not keep growing.
+        while decks and decks[-1] is None:
+            decks.pop()
+
+        self._write(decks, heapq.merge(self._kept_records(stale), *new_records))
+        self._open()
+        return len(changed), removed
+
+    def _kept_records(self, stale: set):
+        """ Yield the records of the index in order, leaving out those of the decks in the `stale` slots. """
+        if not self._count:
+            return
+        # Read the offsets and records in bulk; slicing the map record by record is much slower.
+        offsets = array("Q")
+        offsets.frombytes(self._mm[self._offsets_start:self._offsets_start + 8 * (self._count + 1)])
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        blob = self._mm[_LOOKUP_PREAMBLE.size:_LOOKUP_PREAMBLE.size + offsets[-1]]
+        records = map(blob.__getitem__, map(slice, offsets, offsets[1:]))
+        if not stale:
+            yield from records
+            return
+        stale_tags = {str(slot).encode() for slot in stale}
+        for record in records:
+            if record.split(b"\0", 2)[1] not in stale_tags:
+                yield record
+
+    def _write(self, decks: list, records) -> None:
+        """ Write a new index file with the given deck table and sorted records, then replace the old one. """
+        # Write to a temporary file first so lookups never see a half-written index.
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_LOOKUP_PREAMBLE.pack(LOOKUP_MAGIC, LOOKUP_VERSION, 0))
+                offsets = array("Q", [0])
+                position = 0
+                for record in records:
+                    f.write(record)
+                    position += len(record)
+                    offsets.append(position)
+                padding = -(_LOOKUP_PREAMBLE.size + position) % 8
+                f.write(b"\0" * padding)
+                offsets_start = _LOOKUP_PREAMBLE.size + position + padding
+                if sys.byteorder != "little":
+                    offsets.byteswap()
+                offsets.tofile(f)
+                header = json.dumps({"decks": decks}, ensure_ascii=False).encode("utf-8")
+                f.write(header)
+                f.write(_LOOKUP_TRAILER.pack(offsets_start, len(offsets) - 1, len(header), LOOKUP_MAGIC))
+                f.flush()
+                os.fsync(f.fileno())
+            # The old file is still mapped; Windows will not replace it until it is closed.
+            self.close()
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def search(self, word: str, prefix: bool = False, limit: int | None = None) -> list:
+        """
+        Find a word in every deck, in both directions.
+
+        The comparison ignores case, extra whitespace and accents, as with
+        `--match accents`.
+
+        :param word: The word to look for
+        :type word: str
+        :param prefix: Also find every word that starts with `word`
+        :type prefix: bool
+        :param limit: Return at most this many matches
+        :type limit: int | None
+        :return: The matches, sorted by word, as `(filename, learning, spoken, direction, word, translation)`
+            tuples, where `direction` is `"keys"` if `word` is in the learning language, otherwise `"values"`
+        :rtype: list
+        """
+        key = normalise_answer(word.replace("\0", ""), "accents").encode("utf-8")
+        if not key:
+            return []
+        # A whole key is followed by NUL; a prefix is followed by anything.
+        wanted = key if prefix else key + b"\0"
+
+        matches = []
+        number = self._search(wanted)
+        while number < self._count and (limit is None or len(matches) < limit):
+            record = self._record(number)
+            if not record.startswith(wanted):
+                break
+            _, slot, direction, found, translation = record.decode("utf-8").split("\0")
+            name, _, _, learning, spoken = self.decks[int(slot)]
+            matches.append((name, learning, spoken, direction, found, translation))
+            number += 1
+        return matches
+
+def run_lookup(word: str, prefix: bool = False, limit: int | None = None) -> int:
+    """
+    Find a word in every vocabulary file (see `LookupIndex.search`) and print the translations.
+
+    The index is brought up to date first, which reads only the files that
+    changed since the last lookup.
+
+    :param word: The word to look for
+    :type word: str
+    :param prefix: Also find every word that starts with `word`
+    :type prefix: bool
+    :param limit: Show at most this many words. Defaults to `LOOKUP_DEFAULT_LIMIT` with `prefix`, otherwise all of them
+    :type limit: int | None
+    :return: The exit code: 0 if the word was found, otherwise 1
+    :rtype: int
+    """
+    if limit is None and prefix:
+        limit = LOOKUP_DEFAULT_LIMIT
+
+    renderer = get_renderer()
+    start = time.perf_counter()
+    index = LookupIndex()
+    try:
+        try:
+            read, removed = index.update()
+        except OSError as e:
+            renderer.write(f"Could not update the lookup index: {e}", "error")
+            renderer.flush()
+            return 1
+        # Ask for one more match than is shown, to know whether some were left out.
+        matches = index.search(word, prefix, None if limit is None else limit + 1)
+    finally:
+        index.close()
+    elapsed = time.perf_counter() - start
+
+    if read or removed:
+        renderer.write(f"Updated the lookup index: {read} file(s) read, {removed} removed", "dim")
+    if not matches:
+        renderer.write(f"'{word}' is not in any vocabulary file. ({elapsed * 1000:.1f}ms)", "error")
+        renderer.flush()
+        return 1
+
+    more = limit is not None and len(matches) > limit
+    matches = matches[:limit]
+    renderer.write(f"{len(matches)}{'+' if more else ''} match(es) for '{word}' ({elapsed * 1000:.1f}ms):", "success")
+    for name, learning, spoken, direction, found, translation in matches:
+        # Show each match from the language of the word that was found. Plain and JSON output drop the colours.
+        languages = f"{learning} → {spoken}" if direction == "keys" else f"{spoken} → {learning}"
+        renderer.write(f"  {Style.BRIGHT}{found}{Style.RESET_ALL} = {translation}  "
+                       f"{Style.DIM}({split_deck_suffix(name)[0]}, {languages}){Style.RESET_ALL}")
+    if more:
+        renderer.write(f"More words start with '{word}'; use --limit to see them.", "dim")
+    renderer.flush()
+    return 0
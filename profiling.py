@@ -0,0 +1,142 @@
+"""
+Per-stage profiling of Vocabulary Plus, switched on with `--profile [FILE]`.
+
+This module is only imported when profiling is on (see
+`vocabularyplus.enable_profiling`).
+"""
+from typing import Tuple, Dict
+import json
+import time
+import sys
+import os
+
+# Files with these extensions are written in the Prometheus text format, others as JSON
+PROFILE_PROMETHEUS_SUFFIXES = (".prom", ".txt")
+
+class _ProfileStage:
+    """ Time one run of a stage, see `Profiler.stage`. """
+
+    __slots__ = ("profiler", "name", "began")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.began = self.profiler.begin()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.end(self.name, self.began)
+
+class Profiler:
+    """
+    Time each stage of start-up and of asking a question.
+
+    Every stage records how often it ran, its total and longest time (from
+    the monotonic `time.perf_counter_ns`) and how many memory blocks it
+    left allocated (the change in `sys.getallocatedblocks`). Stages can be
+    nested, and one that ends with an exception (such as CTRL+C while
+    waiting for input) is still recorded.
+
+    A profiler is only made by `vocabularyplus.enable_profiling`; while
+    profiling is off, `get_profiler` returns one that measures nothing.
+
+    Attributes
+    ----------
+    path : str
+        Where `save` writes the results.
+    stages : dict
+        `[calls, total_ns, max_ns, allocated_blocks]` for each stage name,
+        in the order the stages first ran.
+    """
+
+    enabled = True
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: The file to write the results to
+        :type path: str
+        """
+        self.path = path
+        self.stages: Dict[str, list] = {}
+
+    def begin(self) -> Tuple[int, int]:
+        """ Return the current time and allocated block count, to pass to `end`. """
+        return time.perf_counter_ns(), sys.getallocatedblocks()
+
+    def end(self, name: str, began: Tuple[int, int]) -> None:
+        """
+        Record one run of a stage.
+
+        :param name: The name of the stage
+        :type name: str
+        :param began: What `begin` returned when the stage started
+        :type began: Tuple[int, int]
+        """
+        elapsed = time.perf_counter_ns() - began[0]
+        blocks = sys.getallocatedblocks() - began[1]
+        stage = self.stages.get(name)
+        if stage is None:
+            self.stages[name] = [1, elapsed, elapsed, blocks]
+        else:
+            stage[0] += 1
+            stage[1] += elapsed
+            if elapsed > stage[2]:
+                stage[2] = elapsed
+            stage[3] += blocks
+
+    def stage(self, name: str) -> _ProfileStage:
+        """
+        Return a context manager that records one run of a stage.
+
+        :param name: The name of the stage, such as `"check"`
+        :type name: str
+        """
+        return _ProfileStage(self, name)
+
+    def summary_lines(self) -> list:
+        """ Return the results as a table, one line per stage. """
+        lines = [f"{'Stage':<12} {'Calls':>7} {'Total ms':>10} {'Mean µs':>10} {'Max µs':>10} {'Blocks':>9}"]
+        for name, (calls, total, longest, blocks) in self.stages.items():
+            lines.append(f"{name:<12} {calls:>7} {total / 1e6:>10.2f} {total / calls / 1e3:>10.1f}"
+                         f" {longest / 1e3:>10.1f} {blocks:>9}")
+        return lines
+
+    def to_json(self) -> str:
+        """ Return the results as a JSON document. """
+        stages = {
+            name: {
+                "calls": calls,
+                "total_ns": total,
+                "mean_ns": round(total / calls, 1),
+                "max_ns": longest,
+                "allocated_blocks": blocks,
+            }
+            for name, (calls, total, longest, blocks) in self.stages.items()
+        }
+        return json.dumps({"pid": os.getpid(), "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "stages": stages}, indent=4)
+
+    def to_prometheus(self) -> str:
+        """ Return the results in the Prometheus text exposition format. """
+        metrics = (
+            ("vocabularyplus_stage_calls_total", "counter", "Times each stage ran.", lambda stage: stage[0]),
+            ("vocabularyplus_stage_seconds_total", "counter", "Time spent in each stage.", lambda stage: stage[1] / 1e9),
+            ("vocabularyplus_stage_max_seconds", "gauge", "Longest single run of each stage.", lambda stage: stage[2] / 1e9),
+            ("vocabularyplus_stage_allocated_blocks_total", "counter",
+             "Memory blocks left allocated by each stage.", lambda stage: stage[3]),
+        )
+        lines = []
+        for metric, kind, description, value in metrics:
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, stage in self.stages.items():
+                lines.append(f'{metric}{{stage="{name}"}} {value(stage)}')
+        return "\n".join(lines) + "\n"
+
+    def save(self) -> None:
+        """ Write the results to `path`, as Prometheus text or JSON depending on its extension. """
+        if not self.stages:
+            return
+        prometheus = self.path.lower().endswith(PROFILE_PROMETHEUS_SUFFIXES)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus() if prometheus else self.to_json())
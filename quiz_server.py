@@ -0,0 +1,384 @@
+"""
+The `serve` and `client` commands: an asyncio quiz server, its terminal
+client and a load test.
+
+This module is only imported when one of them runs (see `vocabularyplus.main`).
+"""
+from typing import Tuple
+from colorama import Fore, Style
+import json
+import time
+import os
+
+from vocabularyplus import (
+    JSON_DIR, SERVER_HOST, SERVER_PORT, VocabFileError, RandomStrategy, SessionStats, deck_cache,
+    get_catalog, select_decks, make_strategy, check_answer, parse_selection, format_summary,
+    get_display_filename, get_renderer, on_keyboard_interrupt,
+)
+
+# ------------------------------- Server --------------------------------
+
+SERVER_PROTOCOL = "VOCABPLUS 1"
+# Lines longer than this many bytes end the session
+SERVER_MAX_LINE = 4096
+
+def _one_line(text: str) -> str:
+    """ Join the lines of `text` with spaces, so it fits in one protocol line. """
+    return " ".join(text.splitlines())
+
+class QuizServer:
+    """
+    Serve quiz sessions to many learners at once, over a line-based TCP protocol.
+
+    All sessions share the decks in `deck_cache`, so each vocabulary file is
+    read from disk once however many learners use it. A session only keeps
+    its own strategy (a random number generator and a shuffle bag of 4 bytes
+    per word) and its `SessionStats`. Only files in `JSON_DIR` can be used.
+
+    The protocol is UTF-8 text, one command or reply per line:
+
+    * On connecting, the server sends `HELLO VOCABPLUS 1`.
+    * `DECKS` - one `DECK <json>` line per vocabulary file (with `file`,
+      `learning`, `spoken` and `words`), then `END`.
+    * `USE <deck> [<deck> ...]` - quiz on these files or glob patterns (see
+      `select_decks`). Replies `OK <number of files>`, then `QUESTION <text>`.
+    * `ANSWER <text>` - replies `CORRECT <answer>` or `INCORRECT <answer>`,
+      then the next `QUESTION <text>`. `ANSWER` on its own skips the question.
+    * `STATS` - replies `STATS <json>` with the session's results so far.
+    * `QUIT` - replies `BYE <json>` with the session's results, then closes.
+
+    Anything else is answered with `ERROR <message>`, and the session carries on.
+    """
+
+    def __init__(self, match: str = "exact") -> None:
+        """
+        :param match: How forgiving answer checking is (one of `MATCH_LEVELS`)
+        :type match: str
+        """
+        import asyncio
+
+        self.match = match
+        # Sessions refresh the shared catalog one at a time, since it is written to `JSON_DIR`.
+        self.catalog_lock = asyncio.Lock()
+        self.sessions_served = 0
+        self.active_sessions = 0
+        self.questions = 0
+        self.started = time.perf_counter()
+
+    def report(self) -> str:
+        """ Return the number of sessions served and questions answered, with questions per second. """
+        elapsed = time.perf_counter() - self.started
+        rate = self.questions / elapsed if elapsed > 0 else 0.0
+        return (f"Served {self.sessions_served} session{'' if self.sessions_served == 1 else 's'}"
+                f" ({self.active_sessions} active), {self.questions} question{'' if self.questions == 1 else 's'}"
+                f" ({rate:.1f} questions/s since start)")
+
+    @staticmethod
+    def results(stats: SessionStats) -> str:
+        """ Return a session's results as JSON. """
+        return json.dumps({
+            "questions": stats.total,
+            "correct": stats.correct,
+            "incorrect": stats.incorrect,
+            "not_answered": stats.not_answered,
+        })
+
+    async def handle(self, reader, writer) -> None:
+        """
+        Run one session. Called by `asyncio.start_server` for each connection.
+
+        :param reader: The connection's `asyncio.StreamReader`
+        :param writer: The connection's `asyncio.StreamWriter`
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        self.sessions_served += 1
+        self.active_sessions += 1
+        strategy: RandomStrategy | None = None
+        stats = SessionStats(history_limit=0)
+        question = None
+
+        async def send(*lines: str) -> None:
+            writer.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+            await writer.drain()
+
+        def next_question() -> str:
+            nonlocal question
+            deck, text, word, word_type = strategy.next_question()  # type: ignore
+            question = (deck, word, word_type)
+            return f"QUESTION {_one_line(text)}"
+
+        try:
+            await send(f"HELLO {SERVER_PROTOCOL}")
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, argument = line.decode("utf-8", "replace").rstrip("\r\n").partition(" ")
+                command = command.upper()
+
+                if command == "QUIT":
+                    await send(f"BYE {self.results(stats)}")
+                    break
+
+                elif command == "DECKS":
+                    # Reading changed files can take a while, so it runs in a worker thread like `USE`.
+                    async with self.catalog_lock:
+                        catalog = await loop.run_in_executor(None, lambda: get_catalog().refresh())
+                    lines = []
+                    for name in catalog.filenames():
+                        entry = catalog.entries.get(name, {})
+                        if "error" not in entry:
+                            lines.append("DECK " + json.dumps({"file": name, "learning": entry.get("learning"),
+                                                               "spoken": entry.get("spoken"), "words": entry.get("word_count")},
+                                                              ensure_ascii=False))
+                    await send(*lines, "END")
+
+                elif command == "USE":
+                    try:
+                        json_paths = select_decks(argument.split())
+                        if not json_paths:
+                            raise ValueError("USE needs at least one vocabulary file")
+                        if any(os.path.dirname(path) != os.path.abspath(JSON_DIR) for path in json_paths):
+                            raise ValueError("only files in the JSON directory can be used")
+                        # Load the decks in a worker thread, so a large file does not hold up other sessions.
+                        await loop.run_in_executor(None, lambda: [deck_cache.get(path) for path in json_paths])
+                        strategy = make_strategy(json_paths)
+                        await send(f"OK {len(json_paths)}", await loop.run_in_executor(None, next_question))
+                    except (OSError, ValueError, VocabFileError) as e:
+                        await send(f"ERROR {_one_line(str(e))}")
+
+                elif command == "ANSWER":
+                    if question is None:
+                        await send("ERROR choose vocabulary files with USE first")
+                        continue
+                    deck, word, word_type = question
+                    try:
+                        is_correct, correct_answer = check_answer(word, argument, deck, word_type, self.match)
+                        stats.record(argument, correct_answer, is_correct)
+                        # Recording can save review progress, and the next question can reload a changed deck.
+                        await loop.run_in_executor(None, strategy.record, word, word_type, is_correct, argument)  # type: ignore
+                        self.questions += 1
+                        await send(f"{'CORRECT' if is_correct else 'INCORRECT'} {_one_line(correct_answer or '')}",
+                                   await loop.run_in_executor(None, next_question))
+                    except (OSError, VocabFileError) as e:
+                        question = None
+                        await send(f"ERROR {_one_line(str(e))}")
+
+                elif command == "STATS":
+                    await send(f"STATS {self.results(stats)}")
+
+                else:
+                    await send(f"ERROR unknown command {command!r}")
+        except (ConnectionError, ValueError):
+            # The client went away, or sent a line over `SERVER_MAX_LINE` bytes.
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            renderer = get_renderer()
+            renderer.write(f"Session ended after {stats.total} question{'' if stats.total == 1 else 's'}. {self.report()}", "dim")
+            renderer.flush()
+
+def run_server(host: str = SERVER_HOST, port: int = SERVER_PORT, match: str = "exact") -> int:
+    """
+    Run a `QuizServer` until it is stopped with Ctrl+C.
+
+    :param host: The address to listen on
+    :type host: str
+    :param port: The port to listen on
+    :type port: int
+    :param match: How forgiving answer checking is (one of `MATCH_LEVELS`)
+    :type match: str
+    :return: The exit code: 0 on success, otherwise 1
+    :rtype: int
+    """
+    import asyncio
+
+    renderer = get_renderer()
+    server = QuizServer(match)
+
+    async def serve() -> None:
+        listener = await asyncio.start_server(server.handle, host, port, limit=SERVER_MAX_LINE)
+        async with listener:
+            renderer.write(f"Serving quizzes on {host}:{port}. Press CTRL+C to stop.", "success")
+            renderer.flush()
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        renderer.write(f"Could not start the server: {e}", "error")
+        renderer.flush()
+        return 1
+
+    renderer.write(server.report(), "heading")
+    renderer.flush()
+    return 0
+
+def run_client(decks: list, host: str = SERVER_HOST, port: int = SERVER_PORT) -> int:
+    """
+    Take a quiz from a `QuizServer` in the terminal.
+
+    :param decks: The vocabulary files or patterns to use. If empty, the server's files are listed to choose from
+    :type decks: list
+    :param host: The server's address
+    :type host: str
+    :param port: The server's port
+    :type port: int
+    :return: The exit code: 0 on success, otherwise 1
+    :rtype: int
+    """
+    import socket
+
+    renderer = get_renderer()
+    try:
+        connection = socket.create_connection((host, port))
+    except OSError as e:
+        renderer.write(f"Could not connect to {host}:{port}: {e}", "error")
+        renderer.flush()
+        return 1
+
+    with connection, connection.makefile("rw", encoding="utf-8", newline="\n") as server:
+        def send(line: str) -> None:
+            server.write(f"{line}\n")
+            server.flush()
+
+        def receive() -> Tuple[str, str]:
+            reply, _, argument = server.readline().rstrip("\n").partition(" ")
+            if not reply:
+                raise ConnectionError("the server closed the connection")
+            return reply, argument
+
+        stats = {"questions": 0, "correct": 0, "incorrect": 0, "not_answered": 0}
+        try:
+            receive()  # HELLO
+
+            if not decks:
+                send("DECKS")
+                files = []
+                reply, argument = receive()
+                while reply == "DECK":
+                    files.append(json.loads(argument))
+                    reply, argument = receive()
+                if not files:
+                    renderer.write("The server has no vocabulary files.", "warning")
+                    renderer.flush()
+                    return 1
+
+                renderer.write("Vocabulary Files", "heading")
+                for i, file in enumerate(files):
+                    renderer.write(f"{Fore.YELLOW}{i + 1}.{Style.RESET_ALL} {get_display_filename(file['file'])}"
+                                   f" {Style.DIM}({file['learning']} - {file['spoken']}, {file['words']} word{'' if file['words'] == 1 else 's'}){Style.RESET_ALL}")
+                while True:
+                    try:
+                        numbers = parse_selection(renderer.prompt("Choose one or more of the above vocab lists: "), len(files))
+                        break
+                    except ValueError as e:
+                        renderer.write(str(e), "warning")
+                decks = [files[number - 1]["file"] for number in numbers]
+
+            send("USE " + " ".join(decks))
+            reply, argument = receive()
+            if reply == "ERROR":
+                renderer.write(f"Error: {argument}", "error")
+                renderer.flush()
+                return 1
+            reply, question = receive()
+
+            renderer.write("Press CTRL+C to quit.", "error")
+            renderer.write()
+            renderer.write("Question", "section")
+            while True:
+                send(f"ANSWER {renderer.prompt(f'{question} ', 'question')}")
+                reply, answer = receive()
+                if reply == "CORRECT":
+                    renderer.write("   Correct.", "correct")
+                elif reply == "INCORRECT":
+                    renderer.write(f"   Incorrect. Correct answer: {answer}", "incorrect")
+                else:
+                    renderer.write(f"   Error: {answer}", "error")
+                    renderer.flush()
+                    return 1
+                reply, question = receive()
+        except (KeyboardInterrupt, EOFError):
+            try:
+                send("QUIT")
+                reply, argument = receive()
+                if reply == "BYE":
+                    stats = json.loads(argument)
+            except (OSError, ValueError):
+                pass
+        except (OSError, ValueError) as e:
+            renderer.write(f"Error: {e}", "error")
+            renderer.flush()
+            return 1
+
+    on_keyboard_interrupt(format_summary(stats["questions"], stats["correct"], stats["incorrect"], stats["not_answered"]))
+    return 0
+
+def run_load_test(decks: list, sessions: int, questions: int, host: str = SERVER_HOST, port: int = SERVER_PORT) -> int:
+    """
+    Run many scripted sessions against a `QuizServer` at once, and report questions per second.
+
+    Every session skips each question (sends an empty answer), so this measures the server rather than the learners.
+
+    :param decks: The vocabulary files or patterns to use
+    :type decks: list
+    :param sessions: The number of concurrent sessions
+    :type sessions: int
+    :param questions: The number of questions each session answers
+    :type questions: int
+    :param host: The server's address
+    :type host: str
+    :param port: The server's port
+    :type port: int
+    :return: The exit code: 0 if every session succeeded, otherwise 1
+    :rtype: int
+    """
+    import asyncio
+
+    async def session() -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            await reader.readline()  # HELLO
+            writer.write(f"USE {' '.join(decks)}\n".encode("utf-8"))
+            reply = await reader.readline()
+            if not reply.startswith(b"OK"):
+                raise ValueError(reply.decode("utf-8", "replace").strip())
+            await reader.readline()  # QUESTION
+
+            for _ in range(questions):
+                writer.write(b"ANSWER\n")
+                await reader.readline()  # CORRECT / INCORRECT
+                await reader.readline()  # QUESTION
+            writer.write(b"QUIT\n")
+            await reader.readline()  # BYE
+            return questions
+        finally:
+            writer.close()
+
+    async def run() -> list:
+        return await asyncio.gather(*(session() for _ in range(sessions)), return_exceptions=True)
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    answered = sum(result for result in results if isinstance(result, int))
+    renderer = get_renderer()
+    for failure in failures[:3]:
+        renderer.write(f"Session failed: {failure}", "error")
+    renderer.write(f"{sessions - len(failures)} of {sessions} sessions answered {answered} questions"
+                   f" in {elapsed:.2f}s ({answered / elapsed if elapsed > 0 else 0:.1f} questions/s)",
+                   "error" if failures else "success")
+    renderer.flush()
+    return 1 if failures else 0
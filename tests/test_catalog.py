@@ -0,0 +1,122 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocabularyplus import CATALOG_FILENAME, COMPILED_MAGIC, LOOKUP_INDEX_FILENAME, Catalog, compile_deck, get_compiled_path
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+class CatalogCompiledDeckTest(unittest.TestCase):
+    """ The catalog reads a deck like `DeckCache` does, and notices when its compiled deck changes. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.path = os.path.join(self.directory, "fr.json")
+        write_deck(self.path, {"chat": "cat", "chien": "dog"})
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def write_old_compiled_deck(self) -> str:
+        """ Compile the deck, then mark it as the previous format version, newer than the JSON file. """
+        compiled_path = compile_deck(self.path)
+        with open(compiled_path, "r+b") as f:
+            f.seek(len(COMPILED_MAGIC))
+            f.write((1).to_bytes(2, "little"))
+        json_mtime_ns = os.stat(self.path).st_mtime_ns
+        os.utime(compiled_path, ns=(json_mtime_ns + 10**9, json_mtime_ns + 10**9))
+        return compiled_path
+
+    def test_old_compiled_deck_falls_back_to_json(self) -> None:
+        self.write_old_compiled_deck()
+        entry = Catalog(self.directory).refresh().entries["fr.json"]
+        self.assertNotIn("error", entry)
+        self.assertEqual((entry["learning"], entry["spoken"], entry["word_count"]), ("French", "English", 2))
+
+    def test_compiling_again_refreshes_the_entry(self) -> None:
+        self.write_old_compiled_deck()
+        Catalog(self.directory).refresh()
+
+        compile_deck(self.path)
+        compiled_path = get_compiled_path(self.path)
+        later = os.stat(self.path).st_mtime_ns + 2 * 10**9
+        os.utime(compiled_path, ns=(later, later))
+        with mock.patch.object(Catalog, "describe", wraps=Catalog.describe) as describe:
+            entry = Catalog(self.directory).refresh().entries["fr.json"]
+        self.assertEqual(describe.call_count, 1)
+        stat = os.stat(compiled_path)
+        self.assertEqual(entry["compiled"], [stat.st_size, stat.st_mtime_ns])
+        self.assertEqual(entry["word_count"], 2)
+
+    def test_unchanged_decks_are_not_opened_again(self) -> None:
+        compile_deck(self.path)
+        Catalog(self.directory).refresh()
+        with mock.patch.object(Catalog, "describe", wraps=Catalog.describe) as describe:
+            Catalog(self.directory).refresh()
+        describe.assert_not_called()
+
+
+class CatalogListingTest(unittest.TestCase):
+    """ Which files the catalog lists, and how it keeps up with the directory. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def test_lists_decks_including_hidden_ones(self) -> None:
+        write_deck(self.path("fr.json"), {"chat": "cat"})
+        write_deck(self.path(".draft.json"), {"chien": "dog"})
+        write_deck(self.path("Big.json"), {"maison": "house"})
+        with gzip.open(self.path("de.json.gz"), "wt", encoding="utf-8") as f:
+            json.dump({"languages": {"learning": "German", "spoken": "English"}, "words": {"Hund": "dog"}}, f)
+        for name in (LOOKUP_INDEX_FILENAME, "fr.srs", "notes.txt"):
+            with open(self.path(name), "w", encoding="utf-8") as f:
+                f.write("{}")
+
+        catalog = Catalog(self.directory).refresh()
+        self.assertEqual(catalog.filenames(), [".draft.json", "Big.json", "de.json.gz", "fr.json"])
+        self.assertEqual(catalog.entries[".draft.json"]["display_name"], ".draft")
+        self.assertEqual(catalog.entries["de.json.gz"]["learning"], "German")
+        self.assertTrue(os.path.exists(self.path(CATALOG_FILENAME)))
+
+    def test_broken_deck_is_listed_with_an_error(self) -> None:
+        with open(self.path("broken.json"), "w", encoding="utf-8") as f:
+            f.write("{")
+        entry = Catalog(self.directory).refresh().entries["broken.json"]
+        self.assertIn("error", entry)
+        self.assertNotIn("word_count", entry)
+
+    def test_changed_and_removed_decks(self) -> None:
+        write_deck(self.path("fr.json"), {"chat": "cat"})
+        write_deck(self.path("de.json"), {"Hund": "dog"})
+        Catalog(self.directory).refresh()
+
+        write_deck(self.path("fr.json"), {"chat": "cat", "chien": "dog"})
+        os.remove(self.path("de.json"))
+        catalog = Catalog(self.directory).refresh()
+        self.assertEqual(catalog.filenames(), ["fr.json"])
+        self.assertEqual(catalog.entries["fr.json"]["word_count"], 2)
+
+        # The saved manifest is up to date too.
+        self.assertEqual(Catalog(self.directory)._load_manifest(), catalog.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deck_tools
+import vocabularyplus
+from deck_tools import check_deck, check_decks
+from vocabularyplus import PlainRenderer
+
+
+class CheckTest(unittest.TestCase):
+    """ `check_deck` reports every problem in a file, and `check_decks` sums them up. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.output = io.StringIO()
+        patch = mock.patch.object(vocabularyplus, "_renderer", PlainRenderer(self.output))
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def write(self, name: str, content: "str | bytes | dict") -> str:
+        path = os.path.join(self.directory, name)
+        if isinstance(content, dict):
+            content = json.dumps(content)
+        with open(path, "wb") as f:
+            f.write(content.encode("utf-8") if isinstance(content, str) else content)
+        return path
+
+    def issues(self, content: "str | bytes | dict") -> list:
+        return check_deck(self.write("deck.json", content))[1]
+
+    def test_good_deck(self) -> None:
+        self.assertEqual(self.issues({"languages": {"learning": "French", "spoken": "English"},
+                                      "words": {"chat": ["cat", "tomcat"], "chien": "dog"}}), [])
+
+    def test_unreadable_files(self) -> None:
+        self.assertEqual(self.issues(b'{"words": "\xff"}'), [("error", "is not valid UTF-8 (byte 11)")])
+        (severity, message), = self.issues("{")
+        self.assertEqual(severity, "error")
+        self.assertTrue(message.startswith("is not valid JSON"))
+
+    def test_errors(self) -> None:
+        issues = self.issues('{"languages": {"learning": "French", "spoken": ""},'
+                             ' "words": {"chat": "cat", "chat": "tomcat", "chien": [], "": "nothing", "vache": 3}}')
+        self.assertEqual({severity for severity, _ in issues}, {"error"})
+        messages = " | ".join(message for _, message in issues)
+        for expected in ("has an empty spoken language", "has the learning word 'chat' more than once",
+                         "has an empty list of translations for 'chien'", "has an empty learning word",
+                         "the translation of 'vache' is not text"):
+            self.assertIn(expected, messages)
+
+    def test_warnings(self) -> None:
+        issues = self.issues(b"\xef\xbb\xbf" + json.dumps({
+            "languages": {"learning": "French", "spoken": "french"},
+            "words": {"chat": ["cat", "cat"], "Chat": "cat ", "élan": "momentum", "elan": "dash"},
+            "notes": "",
+        }).encode("utf-8"))
+        self.assertEqual({severity for severity, _ in issues}, {"warning"})
+        messages = " | ".join(message for _, message in issues)
+        for expected in ("starts with a byte order mark", "has an unknown entry 'notes'", "same learning and spoken language",
+                         "lists a translation of 'chat' more than once", "has spaces at the start or end",
+                         "'chat', 'Chat'", "'élan', 'elan'"):
+            self.assertIn(expected, messages)
+
+    def test_check_decks_exit_code(self) -> None:
+        good = self.write("good.json", {"languages": {"learning": "French", "spoken": "English"}, "words": {"chat": "cat"}})
+        warned = self.write("warned.json", {"languages": {"learning": "French", "spoken": "English"}, "words": {}})
+        self.assertEqual(check_decks([good, warned]), 0)
+        self.assertEqual(check_decks([good, warned], strict=True), 1)
+        self.assertIn("1 OK, 1 with warnings, 0 with errors", self.output.getvalue())
+
+    def test_process_pool_gives_the_same_report(self) -> None:
+        paths = [self.write(f"{i}.json", "{" if i % 3 == 0 else {"words": {}}) for i in range(6)]
+        check_decks(paths, jobs=1)
+        serial = self.output.getvalue()
+        self.output.truncate(0)
+        self.output.seek(0)
+
+        with mock.patch.object(deck_tools, "CHECK_SERIAL_LIMIT", 0):
+            self.assertEqual(check_decks(paths, jobs=2), 1)
+        # Only the time taken, on the last line, may differ.
+        self.assertEqual(self.output.getvalue().splitlines()[:-1], serial.splitlines()[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
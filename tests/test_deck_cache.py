@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocabularyplus import COMPILED_MAGIC, Catalog, CompiledDeck, Deck, DeckCache, compile_deck, get_compiled_path, read_json
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+def set_mtime(path: str, mtime_ns: int) -> None:
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class DeckCacheTest(unittest.TestCase):
+    """ `DeckCache` picks between a vocabulary file and its compiled deck, and closes the decks it replaces. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.path = os.path.join(self.directory, "fr.json")
+        write_deck(self.path, {"chat": "cat", "chien": "dog"})
+        self.cache = DeckCache()
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def compile(self, seconds_after_json: int = 1) -> str:
+        """ Compile the deck and date the compiled file after the JSON file. """
+        compiled_path = compile_deck(self.path)
+        set_mtime(compiled_path, os.stat(self.path).st_mtime_ns + seconds_after_json * 10**9)
+        return compiled_path
+
+    def test_compiled_deck_is_used(self) -> None:
+        self.compile()
+        deck = self.cache.get(self.path)
+        self.assertIsInstance(deck, CompiledDeck)
+        self.assertEqual(deck.answers("chat", "keys"), ("cat",))
+        self.assertIs(self.cache.get(self.path), deck)
+
+    def test_compiled_deck_answers_like_the_json_file(self) -> None:
+        write_deck(self.path, {"chat": ["cat", "tomcat"], "chien": "dog", "matou": "tomcat", "élan": "momentum"})
+        self.compile()
+        compiled = self.cache.get(self.path)
+        deck = Deck(self.path, read_json(self.path))
+
+        self.assertEqual(list(compiled.keys), list(deck.keys))
+        self.assertEqual(list(compiled.values), list(deck.values))
+        for word in deck.keys:
+            self.assertEqual(compiled.answers(word, "keys"), deck.answers(word, "keys"))
+        for word in ("cat", "tomcat", "dog", "momentum"):
+            self.assertEqual(sorted(compiled.answers(word, "values")), sorted(deck.answers(word, "values")))
+
+    def test_compiled_deck_of_an_older_format_is_not_used(self) -> None:
+        compiled_path = self.compile()
+        with open(compiled_path, "r+b") as f:
+            f.seek(len(COMPILED_MAGIC))
+            f.write((1).to_bytes(2, "little"))
+
+        deck = self.cache.get(self.path)
+        self.assertIsInstance(deck, Deck)
+        self.assertIs(self.cache.get(self.path), deck)
+
+    def test_compiled_deck_of_another_version_is_not_used(self) -> None:
+        self.compile()
+        # Put back a different file with an older date, as restoring a backup or a checkout can.
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        write_deck(self.path, {"chat": "cat", "maison": "house", "pomme": "apple"})
+        set_mtime(self.path, mtime_ns - 10**9)
+
+        deck = self.cache.get(self.path)
+        self.assertIsInstance(deck, Deck)
+        self.assertEqual(len(deck), 3)
+
+        entry = Catalog(self.directory).refresh().entries["fr.json"]
+        self.assertEqual(entry["word_count"], 3)
+
+    def test_recompiled_deck_closes_the_old_one(self) -> None:
+        self.compile()
+        old = self.cache.get(self.path)
+
+        write_deck(self.path, {"chat": "cat"})
+        self.compile(seconds_after_json=2)
+        new = self.cache.get(self.path)
+
+        self.assertIsInstance(new, CompiledDeck)
+        self.assertEqual(len(new), 1)
+        self.assertTrue(old._mm.closed)
+
+    def test_edited_file_closes_the_compiled_deck(self) -> None:
+        compiled_path = self.compile()
+        old = self.cache.get(self.path)
+
+        write_deck(self.path, {"chat": "cat"})
+        set_mtime(self.path, os.stat(compiled_path).st_mtime_ns + 10**9)
+        new = self.cache.get(self.path)
+
+        self.assertIsInstance(new, Deck)
+        self.assertTrue(old._mm.closed)
+        self.assertTrue(os.path.exists(get_compiled_path(self.path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from create_vocab_file import DeckWriter, save_json
+
+
+class DeckWriterTest(unittest.TestCase):
+    """ `DeckWriter` must write exactly the bytes `save_json` writes for the same data. """
+
+    def assert_same_as_save_json(self, data: dict) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            expected_path = os.path.join(directory, "expected.json")
+            written_path = os.path.join(directory, "written.json")
+            save_json(expected_path, data)
+            with DeckWriter(written_path, data["languages"]) as writer:
+                for learning_word, spoken_word in data["words"].items():
+                    writer.write(learning_word, spoken_word)
+            with open(expected_path, encoding="utf-8") as f:
+                expected = f.read()
+            with open(written_path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_single_meanings(self) -> None:
+        self.assert_same_as_save_json({
+            "languages": {"learning": "French", "spoken": "English"},
+            "words": {"chat": "cat", "élan": "momentum", "\"quote\"": "back\\slash"},
+        })
+
+    def test_accepted_answer_lists(self) -> None:
+        self.assert_same_as_save_json({
+            "languages": {"learning": "French", "spoken": "English"},
+            "words": {"chat": ["cat", "tomcat"], "chien": "dog", "rien": []},
+        })
+
+    def test_no_words(self) -> None:
+        self.assert_same_as_save_json({
+            "languages": {"learning": "French", "spoken": "English"},
+            "words": {},
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
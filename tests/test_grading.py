@@ -0,0 +1,95 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import grading
+from grading import _start_grader, grade_range, grade_sheet, run_grading
+
+SHEET = (
+    "learner,word,direction,answer\n"
+    "ana,chat,keys,cat\n"
+    "ben,chat,keys,dog\n"
+    "ana,dog,values,chien\n"
+    "ben,maison,keys\n"
+    "ana,chat,keys,tomcat\n"
+    "ben,licorne,keys,unicorn\n"
+    "ana,chat,sideways,cat\n"
+    "ben,élan,keys,momentum\n"
+)
+
+
+def scores(learners: dict) -> dict:
+    return {name: (stats.correct, stats.incorrect, stats.not_answered) for name, stats in learners.items()}
+
+
+class GradingTest(unittest.TestCase):
+    """ `grade` marks an answer sheet against one deck, in byte ranges that may be graded in parallel. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.deck = os.path.join(self._directory.name, "fr.json")
+        with open(self.deck, "w", encoding="utf-8") as f:
+            json.dump({"languages": {"learning": "French", "spoken": "English"},
+                       "words": {"chat": ["cat", "tomcat"], "chien": "dog", "maison": "house", "élan": "momentum"}}, f)
+        self.sheet = os.path.join(self._directory.name, "answers.csv")
+        with open(self.sheet, "w", encoding="utf-8") as f:
+            f.write(SHEET)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_grade_sheet(self) -> None:
+        learners, skipped, problems = grade_sheet(self.deck, self.sheet, jobs=1)
+
+        self.assertEqual(list(learners), ["ana", "ben"])
+        ana, ben = learners["ana"], learners["ben"]
+        self.assertEqual((ana.correct, ana.incorrect, ana.not_answered), (3, 0, 0))
+        self.assertEqual((ben.correct, ben.incorrect, ben.not_answered), (1, 1, 1))
+        self.assertEqual(skipped, 2)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("'licorne' is not in the vocabulary file", problems[0])
+        self.assertIn("the direction must be 'keys' or 'values'", problems[1])
+
+    def test_every_row_is_graded_once_whatever_the_ranges(self) -> None:
+        _start_grader(self.deck, "exact")
+        expected = grade_range(self.sheet, 0, len(SHEET.encode("utf-8")))
+        size = len(SHEET.encode("utf-8"))
+        for step in (1, 7, 19, 50):
+            bounds = list(range(0, size, step)) + [size]
+            totals: dict = {}
+            skipped = 0
+            for start, end in zip(bounds, bounds[1:]):
+                chunk_scores, chunk_skipped, _ = grade_range(self.sheet, start, end)
+                for learner, score in chunk_scores.items():
+                    totals[learner] = [a + b for a, b in zip(totals.get(learner, [0, 0, 0]), score)]
+                skipped += chunk_skipped
+            self.assertEqual((totals, skipped), expected[:2], step)
+
+    def test_process_pool_gives_the_same_scores(self) -> None:
+        serial = grade_sheet(self.deck, self.sheet, jobs=1)
+        with mock.patch.object(grading, "GRADE_MIN_CHUNK_BYTES", 16):
+            parallel = grade_sheet(self.deck, self.sheet, jobs=2)
+        self.assertEqual(scores(parallel[0]), scores(serial[0]))
+        self.assertEqual(parallel[1:], serial[1:])
+
+    def test_run_grading_output(self) -> None:
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = run_grading(self.deck, self.sheet, "typo", jobs=1)
+
+        self.assertEqual(code, 1)
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(records[0], {"learner": "ana", "questions": 3, "correct": 3, "incorrect": 0, "not_answered": 0})
+        summary = json.loads(stderr.getvalue().splitlines()[-1])
+        self.assertEqual((summary["rows"], summary["learners"], summary["skipped"]), (8, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
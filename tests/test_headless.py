@@ -0,0 +1,78 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocabularyplus import get_review_state_path, run_headless
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+class HeadlessTest(unittest.TestCase):
+    """ `run_headless` reads answers from a file and writes one JSON object per question. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.deck = os.path.join(self.directory, "fr.json")
+        write_deck(self.deck, {"chat": ["cat", "tomcat"], "chien": "dog", "maison": "house"})
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def write_answers(self, *answers: str) -> str:
+        path = os.path.join(self.directory, "answers.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(f"{answer}\n" for answer in answers))
+        return path
+
+    def run_quiz(self, *args, **kwargs) -> tuple:
+        """ Return the exit code, the question records and the summary (or error) written to stderr. """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = run_headless(*args, **kwargs)
+        return code, [json.loads(line) for line in stdout.getvalue().splitlines()], stderr.getvalue()
+
+    def test_records_and_summary(self) -> None:
+        answers = self.write_answers("cat", "", "x", "dog")
+        code, records, summary = self.run_quiz([self.deck], answers, seed=1, count=3)
+
+        self.assertEqual(code, 0)
+        self.assertEqual([record["number"] for record in records], [1, 2, 3])
+        self.assertEqual([record["answer"] for record in records], ["cat", "", "x"])
+        self.assertEqual({record["deck"] for record in records}, {"fr.json"})
+        self.assertEqual([record["correct"] for record in records[1:]], [False, False])
+        summary = json.loads(summary)
+        self.assertEqual(summary["questions"], 3)
+        self.assertEqual(summary["not_answered"], 1)
+
+    def test_same_seed_asks_the_same_questions(self) -> None:
+        answers = self.write_answers(*["?"] * 10)
+        first = self.run_quiz([self.deck], answers, seed=7)[1]
+        second = self.run_quiz([self.deck], answers, seed=7)[1]
+        self.assertEqual([record["question"] for record in first], [record["question"] for record in second])
+
+    def test_missing_answers_file(self) -> None:
+        code, records, error = self.run_quiz([self.deck], os.path.join(self.directory, "missing.txt"), strategy_name="srs")
+
+        self.assertEqual(code, 1)
+        self.assertEqual(records, [])
+        self.assertTrue(error.startswith("Error: "))
+        self.assertFalse(os.path.exists(get_review_state_path(self.deck)))
+
+    def test_missing_deck(self) -> None:
+        code, _, error = self.run_quiz([os.path.join(self.directory, "missing.json")], self.write_answers("cat"))
+        self.assertEqual(code, 1)
+        self.assertTrue(error.startswith("Error: "))
+
+
+if __name__ == "__main__":
+    unittest.main()
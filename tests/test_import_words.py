@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import create_vocab_file
+import vocabularyplus
+from create_vocab_file import import_words
+from vocabularyplus import PlainRenderer
+
+
+class ImportWordsTest(unittest.TestCase):
+    """ `create --from` imports into a temporary `JSON_DIR` and reports through the renderer. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.output = io.StringIO()
+        for patch in (mock.patch.object(create_vocab_file, "JSON_DIR", self.directory),
+                      mock.patch.object(vocabularyplus, "_renderer", PlainRenderer(self.output))):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def write_source(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return path
+
+    def test_csv_import(self) -> None:
+        source = self.write_source("words.csv", "chat,cat / tomcat\nchien,dog\nchat,kitty\n")
+
+        self.assertEqual(import_words(source, "French", "English", "fr"), 0)
+
+        with open(os.path.join(self.directory, "fr.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["words"], {"chat": ["cat", "tomcat"], "chien": "dog"})
+        self.assertIn("Imported 2 words (1 duplicates skipped)", self.output.getvalue())
+
+    def test_existing_deck_is_only_replaced_with_force(self) -> None:
+        source = self.write_source("words.csv", "chat,cat\n")
+        existing = os.path.join(self.directory, "fr.json")
+        with open(existing, "w", encoding="utf-8") as f:
+            f.write("{}")
+
+        self.assertEqual(import_words(source, "French", "English", "fr"), 1)
+        self.assertIn("already exists", self.output.getvalue())
+        with open(existing, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "{}")
+
+        self.assertEqual(import_words(source, "French", "English", "fr", force=True), 0)
+        with open(existing, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["words"], {"chat": "cat"})
+
+    def test_malformed_csv_is_reported(self) -> None:
+        # A field over the csv module's size limit makes the reader raise `csv.Error`.
+        source = self.write_source("words.csv", "chat,cat\nchien," + "x" * 200_000 + "\n")
+
+        self.assertEqual(import_words(source, "French", "English", "fr"), 1)
+
+        self.assertIn(f"Could not import {source}: field larger than field limit", self.output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "fr.json")))
+
+    def test_missing_source_is_reported(self) -> None:
+        source = os.path.join(self.directory, "missing.csv")
+
+        self.assertEqual(import_words(source, "French", "English", "fr"), 1)
+
+        self.assertIn(f"Could not import {source}", self.output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
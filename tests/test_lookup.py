@@ -0,0 +1,90 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vocabularyplus
+from lookup import LookupIndex, run_lookup
+from vocabularyplus import PlainRenderer
+
+
+def write_deck(path: str, learning: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": learning, "spoken": "English"}, "words": words}, f)
+
+
+class LookupIndexTest(unittest.TestCase):
+    """ `LookupIndex` finds words in every deck of a directory and only rereads the decks that changed. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        write_deck(self.path("fr.json"), "French", {"chat": ["cat", "tomcat"], "chien": "dog", "élan": "momentum"})
+        write_deck(self.path("de.json"), "German", {"Katze": "cat", "Hund": "dog"})
+        self.index = LookupIndex(self.directory)
+        self.addCleanup(self.index.close)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def test_search_both_directions(self) -> None:
+        self.assertEqual(self.index.update(), (2, 0))
+        self.assertEqual(sorted(self.index.search("cat")), [
+            ("de.json", "German", "English", "values", "cat", "Katze"),
+            ("fr.json", "French", "English", "values", "cat", "chat"),
+        ])
+        self.assertEqual(self.index.search("CHAT"), [("fr.json", "French", "English", "keys", "chat", "cat / tomcat")])
+        self.assertEqual([match[4] for match in self.index.search("elan")], ["élan"])
+        self.assertEqual(self.index.search("ca"), [])
+
+    def test_prefix_and_limit(self) -> None:
+        self.index.update()
+        self.assertEqual([match[4] for match in self.index.search("ch", prefix=True)], ["chat", "chien"])
+        self.assertEqual(len(self.index.search("", prefix=True)), 0)
+        self.assertEqual(len(self.index.search("c", prefix=True, limit=2)), 2)
+
+    def test_only_changed_decks_are_read(self) -> None:
+        self.index.update()
+        self.assertEqual(self.index.update(), (0, 0))
+
+        write_deck(self.path("fr.json"), "French", {"maison": "house"})
+        os.remove(self.path("de.json"))
+        with open(self.path("broken.json"), "w", encoding="utf-8") as f:
+            f.write("{")
+        self.assertEqual(self.index.update(), (2, 1))
+
+        self.assertEqual(self.index.search("chat"), [])
+        self.assertEqual(self.index.search("cat"), [])
+        self.assertEqual([match[5] for match in self.index.search("house")], ["maison"])
+        # The broken deck is remembered, so it is not read again until it changes.
+        self.assertEqual(self.index.update(), (0, 0))
+
+        # Another process opening the index sees the same words.
+        other = LookupIndex(self.directory)
+        self.addCleanup(other.close)
+        self.assertEqual(len(other), len(self.index))
+
+    def test_run_lookup(self) -> None:
+        output = io.StringIO()
+        with mock.patch.object(LookupIndex.__init__, "__defaults__", (self.directory,)), \
+                mock.patch.object(vocabularyplus, "_renderer", PlainRenderer(output)):
+            self.assertEqual(run_lookup("dog"), 0)
+            self.assertEqual(run_lookup("licorne"), 1)
+
+        text = output.getvalue()
+        self.assertIn("Updated the lookup index: 2 file(s) read, 0 removed", text)
+        self.assertIn("2 match(es) for 'dog'", text)
+        self.assertIn("dog = Hund  (de, English → German)", text)
+        self.assertIn("'licorne' is not in any vocabulary file.", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
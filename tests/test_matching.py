@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocabularyplus import Deck, allowed_typos, check_answer, normalise_answer, within_edit_distance
+
+
+def edit_distance(a: str, b: str) -> int:
+    """ The full optimal string alignment distance, to check `within_edit_distance` against. """
+    rows = [[i + j if i == 0 or j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[len(a)][len(b)]
+
+
+class MatchingTest(unittest.TestCase):
+    """ Answer normalisation and the typo distance used by `--match`. """
+
+    def test_normalise_answer(self) -> None:
+        self.assertEqual(normalise_answer(" Élan  Vital ", "exact"), " Élan  Vital ")
+        self.assertEqual(normalise_answer(" Élan  Vital ", "casefold"), "élan vital")
+        self.assertEqual(normalise_answer(" Élan  Vital ", "accents"), "elan vital")
+        self.assertEqual(normalise_answer("Straße", "typo"), "strasse")
+
+    def test_allowed_typos(self) -> None:
+        self.assertEqual([allowed_typos("x" * n) for n in (3, 4, 8, 9)], [0, 1, 1, 2])
+
+    def test_within_edit_distance(self) -> None:
+        self.assertTrue(within_edit_distance("house", "hosue", 1))
+        self.assertTrue(within_edit_distance("house", "hose", 1))
+        self.assertFalse(within_edit_distance("house", "horse shoe", 2))
+        self.assertFalse(within_edit_distance("cat", "dog", 0))
+
+    def test_within_edit_distance_matches_the_full_distance(self) -> None:
+        rng = random.Random(12)
+        for _ in range(2000):
+            a = "".join(rng.choice("abc") for _ in range(rng.randrange(8)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randrange(8)))
+            limit = rng.randrange(4)
+            self.assertEqual(within_edit_distance(a, b, limit), edit_distance(a, b) <= limit, (a, b, limit))
+
+
+class CheckAnswerTest(unittest.TestCase):
+    """ `check_answer` at each matching level. """
+
+    def setUp(self) -> None:
+        self.deck = Deck("fr.json", {
+            "languages": {"learning": "French", "spoken": "English"},
+            "words": {"chat": ["cat", "tomcat"], "élan": "momentum", "chien": "dog"},
+        })
+
+    def test_exact(self) -> None:
+        self.assertEqual(check_answer("chat", "tomcat", self.deck, "keys"), (True, "tomcat"))
+        self.assertEqual(check_answer("chat", "Cat", self.deck, "keys"), (False, "cat / tomcat"))
+        self.assertEqual(check_answer("momentum", "élan", self.deck, "values"), (True, "élan"))
+
+    def test_levels(self) -> None:
+        self.assertEqual(check_answer("chat", " CAT ", self.deck, "keys", "casefold"), (True, "cat"))
+        self.assertFalse(check_answer("momentum", "elan", self.deck, "values", "casefold")[0])
+        self.assertEqual(check_answer("momentum", "Elan", self.deck, "values", "accents"), (True, "élan"))
+        self.assertFalse(check_answer("chat", "tomact", self.deck, "keys", "accents")[0])
+        self.assertEqual(check_answer("chat", "tomact", self.deck, "keys", "typo"), (True, "tomcat"))
+        # Short answers must be spelt correctly.
+        self.assertFalse(check_answer("chien", "dgo", self.deck, "keys", "typo")[0])
+
+    def test_invalid_arguments(self) -> None:
+        with self.assertRaises(ValueError):
+            check_answer("chat", "cat", self.deck, "words")
+        with self.assertRaises(ValueError):
+            check_answer("chat", "cat", self.deck, "keys", "fuzzy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import create_vocab_file
+import deck_tools
+import vocabularyplus
+from deck_tools import merge_decks, split_deck
+from vocabularyplus import PlainRenderer
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+def read_words(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["words"]
+
+
+class MergeSplitTest(unittest.TestCase):
+    """ `merge` and `split` on decks in a temporary `JSON_DIR`. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.output = io.StringIO()
+        for patch in (mock.patch.object(vocabularyplus, "JSON_DIR", self.directory),
+                      mock.patch.object(deck_tools, "JSON_DIR", self.directory),
+                      mock.patch.object(create_vocab_file, "JSON_DIR", self.directory),
+                      mock.patch.object(vocabularyplus, "_renderer", PlainRenderer(self.output))):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.first = os.path.join(self.directory, "a.json")
+        self.second = os.path.join(self.directory, "b.json")
+        write_deck(self.first, {"chat": "cat", "chien": "dog"})
+        write_deck(self.second, {"chien": ["dog"], "chat": "tomcat", "maison": "house"})
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def merged(self) -> dict:
+        return read_words(os.path.join(self.directory, "merged.json"))
+
+    def test_merge_keeps_the_first_translation(self) -> None:
+        self.assertEqual(merge_decks([self.first, self.second], "merged"), 0)
+        self.assertEqual(self.merged(), {"chat": "cat", "chien": "dog", "maison": "house"})
+        self.assertIn("(1 duplicates and 1 conflicts skipped)", self.output.getvalue())
+
+    def test_merge_keeps_the_last_translation(self) -> None:
+        self.assertEqual(merge_decks([self.first, self.second], "merged", "last"), 0)
+        self.assertEqual(self.merged(), {"chien": ["dog"], "chat": "tomcat", "maison": "house"})
+
+    def test_merge_stops_on_a_conflict(self) -> None:
+        self.assertEqual(merge_decks([self.first, self.second], "merged", "error"), 1)
+        self.assertIn("'chat' has more than one translation", self.output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "merged.json")))
+
+    def test_merge_does_not_replace_a_deck_without_force(self) -> None:
+        self.assertEqual(merge_decks([self.second], "a"), 1)
+        self.assertIn("already exists", self.output.getvalue())
+        self.assertEqual(read_words(self.first), {"chat": "cat", "chien": "dog"})
+
+        self.assertEqual(merge_decks([self.second], "a", force=True), 0)
+        self.assertEqual(read_words(self.first), {"chien": ["dog"], "chat": "tomcat", "maison": "house"})
+
+    def test_split(self) -> None:
+        self.assertEqual(split_deck(self.second, 2, "lesson"), 0)
+        self.assertEqual(read_words(os.path.join(self.directory, "lesson-001.json")), {"chien": ["dog"], "chat": "tomcat"})
+        self.assertEqual(read_words(os.path.join(self.directory, "lesson-002.json")), {"maison": "house"})
+
+
+if __name__ == "__main__":
+    unittest.main()
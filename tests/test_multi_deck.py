@@ -0,0 +1,96 @@
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vocabularyplus import (
+    AliasTable, MultiDeckStrategy, SpacedRepetitionStrategy, VocabFileError, get_review_state_path, parse_weights,
+)
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+class AliasTableTest(unittest.TestCase):
+    """ `AliasTable` samples indices in proportion to their weights. """
+
+    def test_samples_follow_the_weights(self) -> None:
+        weights = [1, 0, 3, 6]
+        table = AliasTable(weights)
+        rng = random.Random(5)
+        samples = 40_000
+        counts = Counter(table.sample(rng) for _ in range(samples))
+
+        self.assertEqual(counts[1], 0)
+        for index, weight in enumerate(weights):
+            self.assertAlmostEqual(counts[index] / samples, weight / sum(weights), delta=0.01)
+
+    def test_invalid_weights(self) -> None:
+        for weights in ([], [0, 0], [1, -1]):
+            with self.assertRaises(ValueError):
+                AliasTable(weights)
+
+
+class MultiDeckStrategyTest(unittest.TestCase):
+    """ Several decks in one session, weighted by size or by `--weight`. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.small = os.path.join(self._directory.name, "small.json")
+        self.large = os.path.join(self._directory.name, "large.json.gz")
+        write_deck(self.small, {"chat": "cat"})
+        with gzip.open(self.large, "wt", encoding="utf-8") as f:
+            json.dump({"languages": {"learning": "French", "spoken": "English"},
+                       "words": {"chat": "cat", "chien": "dog", "maison": "house"}}, f)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def deck_counts(self, strategy: MultiDeckStrategy, questions: int) -> Counter:
+        counts = Counter()
+        for _ in range(questions):
+            strategy.next_question()
+            counts[os.path.basename(strategy.json_path)] += 1
+        return counts
+
+    def test_decks_are_weighted_by_size(self) -> None:
+        strategy = MultiDeckStrategy([self.small, self.large], rng=random.Random(3))
+        counts = self.deck_counts(strategy, 4000)
+        self.assertAlmostEqual(counts["small.json"] / 4000, 0.25, delta=0.03)
+
+    def test_weights_override_the_size(self) -> None:
+        weights = parse_weights([self.small, self.large], ["SMALL=3", "large=0"])
+        self.assertEqual(weights, [3.0, 0.0])
+        strategy = MultiDeckStrategy([self.small, self.large], rng=random.Random(3), weights=weights)
+        self.assertEqual(self.deck_counts(strategy, 100), Counter({"small.json": 100}))
+
+        with self.assertRaises(VocabFileError):
+            MultiDeckStrategy([self.small, self.large], weights=[0, 0])
+
+    def test_parse_weights_errors(self) -> None:
+        self.assertIsNone(parse_weights([self.small], None))
+        for option in ("small", "small=-1", "small=x", "other=2"):
+            with self.assertRaises(ValueError):
+                parse_weights([self.small, self.large], [option])
+
+    def test_answers_are_recorded_by_the_deck_that_asked(self) -> None:
+        # Both decks have "chat", so the answer must go back to the deck the question came from.
+        strategy = MultiDeckStrategy([self.small, self.large], SpacedRepetitionStrategy, random.Random(1), [1, 0])
+        _, _, word, word_type = strategy.next_question()
+        strategy.record(word, word_type, True, "cat")
+        strategy.close()
+
+        self.assertTrue(os.path.exists(get_review_state_path(self.small)))
+        self.assertFalse(os.path.exists(get_review_state_path(self.large)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quiz_server
+import vocabularyplus
+from quiz_server import SERVER_PROTOCOL, QuizServer
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+class QuizServerProtocolTest(unittest.IsolatedAsyncioTestCase):
+    """ Sessions of a `QuizServer` on a local port, serving the decks of a temporary `JSON_DIR`. """
+
+    async def asyncSetUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        directory = self._directory.name
+        write_deck(os.path.join(directory, "fr.json"), {"chat": "cat", "chien": "dog"})
+        for target in (mock.patch.object(vocabularyplus, "JSON_DIR", directory),
+                       mock.patch.object(quiz_server, "JSON_DIR", directory),
+                       mock.patch.object(vocabularyplus, "_catalog", None),
+                       contextlib.redirect_stdout(io.StringIO())):
+            target.__enter__()
+            self.addCleanup(target.__exit__, None, None, None)
+
+        self.server = QuizServer()
+        self.listener = await asyncio.start_server(self.server.handle, "127.0.0.1", 0, limit=quiz_server.SERVER_MAX_LINE)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.listener.close()
+        await self.listener.wait_closed()
+        self._directory.cleanup()
+
+    async def session(self, *commands: str) -> list:
+        """ Send `commands` in one session and return every line the server replied with. """
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write("".join(f"{command}\n" for command in commands).encode("utf-8"))
+        await writer.drain()
+        lines = [line.decode("utf-8").rstrip("\n") for line in await asyncio.wait_for(_read_all(reader), 5)]
+        writer.close()
+        await writer.wait_closed()
+        return lines
+
+    async def test_quiz_session(self) -> None:
+        lines = await self.session("USE fr", "ANSWER cat", "ANSWER", "STATS", "QUIT")
+
+        self.assertEqual(lines[0], f"HELLO {SERVER_PROTOCOL}")
+        self.assertEqual(lines[1], "OK 1")
+        self.assertTrue(lines[2].startswith("QUESTION "))
+        self.assertRegex(lines[3], "^(CORRECT|INCORRECT) ")
+        self.assertTrue(lines[4].startswith("QUESTION "))
+        self.assertRegex(lines[5], "^INCORRECT ")
+        self.assertTrue(lines[6].startswith("QUESTION "))
+        self.assertEqual(json.loads(lines[7].partition(" ")[2])["not_answered"], 1)
+        self.assertEqual(json.loads(lines[8].partition(" ")[2])["questions"], 2)
+
+    async def test_decks_lists_the_json_directory(self) -> None:
+        lines = await self.session("DECKS", "QUIT")
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(json.loads(lines[1].partition(" ")[2]),
+                         {"file": "fr.json", "learning": "French", "spoken": "English", "words": 2})
+        self.assertEqual(lines[2], "END")
+
+    async def test_decks_refreshes_the_catalog_in_a_worker_thread(self) -> None:
+        threads = []
+        catalog = vocabularyplus.get_catalog()
+        refresh = catalog.refresh
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            return refresh()
+
+        with mock.patch.object(catalog, "refresh", side_effect=record_thread):
+            await self.session("DECKS", "QUIT")
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    async def test_errors_keep_the_session_open(self) -> None:
+        lines = await self.session("ANSWER cat", "USE missing", "USE ../fr.json", "HELLO", "QUIT")
+
+        self.assertEqual([line.partition(" ")[0] for line in lines],
+                         ["HELLO", "ERROR", "ERROR", "ERROR", "ERROR", "BYE"])
+
+
+async def _read_all(reader) -> list:
+    lines = []
+    while line := await reader.readline():
+        lines.append(line)
+    return lines
+
+
+if __name__ == "__main__":
+    unittest.main()
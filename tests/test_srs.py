@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vocabularyplus
+from vocabularyplus import SECONDS_PER_DAY, SpacedRepetitionStrategy
+
+
+def write_deck(path: str, words: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"languages": {"learning": "French", "spoken": "English"}, "words": words}, f)
+
+
+class SpacedRepetitionTest(unittest.TestCase):
+    """ Scheduling of `SpacedRepetitionStrategy` when the same small deck is practised for a long time. """
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, "fr.json")
+        write_deck(self.path, {"chat": "cat", "chien": "dog", "maison": "house"})
+        self.strategy = SpacedRepetitionStrategy(self.path)
+
+    def tearDown(self) -> None:
+        self.strategy.close()
+        self._directory.cleanup()
+
+    def answer(self, is_correct: bool) -> None:
+        _, _, word, word_type = self.strategy.next_question()
+        self.strategy.record(word, word_type, is_correct, "answer")
+
+    def saved_cards(self) -> dict:
+        self.strategy.save()
+        with open(vocabularyplus.get_review_state_path(self.path), encoding="utf-8") as f:
+            return json.load(f)["cards"]
+
+    def test_early_reviews_keep_the_schedule(self) -> None:
+        for _ in range(30):
+            self.answer(True)
+
+        cards = self.saved_cards()
+        self.assertEqual(len(cards), 3)
+        for _, interval, _, repetitions, _ in cards.values():
+            self.assertEqual(interval, 1.0)
+            self.assertEqual(repetitions, 1)
+
+    def test_due_reviews_still_grow(self) -> None:
+        for _ in range(3):
+            self.answer(True)
+
+        # Two days later every card is due again.
+        later = vocabularyplus.time.time() + 2 * SECONDS_PER_DAY
+        with mock.patch.object(vocabularyplus.time, "time", return_value=later):
+            for _ in range(3):
+                self.answer(True)
+
+        for _, interval, _, repetitions, _ in self.saved_cards().values():
+            self.assertEqual(interval, 6.0)
+            self.assertEqual(repetitions, 2)
+
+    def test_wrong_early_answer_relearns_the_card(self) -> None:
+        for _ in range(3):
+            self.answer(True)
+        self.answer(False)
+
+        cards = self.saved_cards()
+        self.assertEqual(sorted(card[3] for card in cards.values()), [0, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
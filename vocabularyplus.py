@@ -0,0 +1,3149 @@
+"""
+Vocabulary Plus: the quiz, vocabulary files, terminal output and command line.
+
+`main.py` starts it. The code of the other commands is in their own modules
+(`deck_tools`, `grading`, `lookup`, `quiz_server` and `profiling`), which
+are only imported when they are needed, so that starting a quiz stays fast.
+"""
+from typing import Tuple, Dict, TYPE_CHECKING
+from collections import deque
+from colorama import init, Cursor, ansi, Fore, Style
+from array import array
+import argparse
+import unicodedata
+import fnmatch
+import re
+import struct
+import heapq
+import mmap
+import random
+import json
+import time
+import sys
+import os
+
+if TYPE_CHECKING:
+    from profiling import Profiler
+
+# Nothing below runs any code at import time apart from defining constants,
+# so the module can be imported by tools and tests. See `main` for start-up.
+
+# Get the JSON_DIR constant
+try:
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+except:
+    # __file__ not defined
+    base_dir = os.getcwd()
+
+JSON_DIR = os.path.join(base_dir, "JSON")
+
+class VocabFileError(Exception):
+    """Custom exception indicating a problem with the vocabulary JSON file."""
+    pass
+
+def on_keyboard_interrupt(summary: "str | SessionStats") -> None:
+    """ Print a question summary, if applicable, and a friendly goodbye message then exit with code 0. 
+        :param summary: The summary to print before exiting. Session statistics are formatted here, only when needed.
+        :type summary: str | SessionStats
+    """
+    renderer = get_renderer()
+    if summary:
+        renderer.write()
+        renderer.write(str(summary), "summary")
+
+    profiler = get_profiler()
+    if profiler.enabled and profiler.stages:
+        renderer.write()
+        renderer.write(f"Profile (saved to {profiler.path}):", "heading")
+        for line in profiler.summary_lines():
+            renderer.write(line, "dim")
+
+    renderer.write("Thank you for using Vocabulary Plus. Goodbye!", "goodbye")
+    renderer.flush()
+    sys.exit(0)
+
+def get_jsons(dir: str) -> list:
+    """
+    Set a list to only JSON files in a directory \n
+    The directory's catalog manifest is revalidated on the way, see `Catalog`. \n
+    :param dir: The directory to be scanned for JSON files
+    """
+
+    return Catalog(dir).refresh().filenames()
+
+# Vocabulary files can be stored plain or compressed (see `compress_decks`)
+COMPRESSED_SUFFIXES = {".json.gz": "gz", ".json.xz": "xz"}
+DECK_SUFFIXES = (".json", *COMPRESSED_SUFFIXES)
+
+def is_deck_filename(name: str) -> bool:
+    """ Return whether `name` has the extension of a vocabulary file (see `DECK_SUFFIXES`). """
+    return name.lower().endswith(DECK_SUFFIXES)
+
+def split_deck_suffix(path: str) -> Tuple[str, str]:
+    """
+    Split a vocabulary file path into its stem and extension, treating `.json.gz` and `.json.xz` as one extension. \n
+    :param path: The path to split
+    :type path: str
+    :return: The stem and the extension, as `os.path.splitext` would return them
+    :rtype: Tuple[str, str]
+    """
+    lower = path.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if lower.endswith(suffix):
+            return path[:-len(suffix)], path[-len(suffix):]
+    return os.path.splitext(path)
+
+def open_deck(path: str, binary: bool = False, encoding: str = "utf-8"):
+    """
+    Open a vocabulary file for reading, decompressing `.json.gz` and `.json.xz` files as they are read.
+
+    Parameters
+    ----------
+    path : str
+        Filesystem path to the vocabulary file.
+    binary : bool
+        Whether to read bytes instead of text.
+    encoding : str
+        The text encoding, when reading text.
+
+    Returns
+    -------
+    A file object. Compressed files raise `OSError` (gzip), `lzma.LZMAError`
+    or `EOFError` if they are damaged.
+    """
+    mode = "rb" if binary else "rt"
+    text = {} if binary else {"encoding": encoding}
+    lower = path.lower()
+    if lower.endswith(".gz"):
+        # Imported here, as plain files are the most common and this slows down start-up.
+        import gzip
+        return gzip.open(path, mode, **text)
+    if lower.endswith(".xz"):
+        import lzma
+        return lzma.open(path, mode, **text)
+    return open(path, mode, **text)
+
+def read_json(path: str) -> Dict:
+    """
+    Load a JSON file and return its parsed contents.
+
+    Compressed files (see `open_deck`) are decompressed as they are parsed.
+
+    Parameters
+    ----------
+    path : str
+        Filesystem path to the JSON document.
+
+    Returns
+    -------
+    Dict
+        The Python object resulting from  `json.load`.
+    """
+    with get_profiler().stage("read_json"), open_deck(path) as f:
+        return dict(json.load(f))
+
+# How forgiving answer checking is, from strictest to most lenient. Each
+# level also accepts everything the levels before it accept.
+MATCH_LEVELS = ("exact", "casefold", "accents", "typo")
+
+def normalise_answer(text: str, level: str) -> str:
+    """
+    Normalise an answer for comparison at a matching level.
+
+    * `"exact"` leaves the text unchanged.
+    * `"casefold"` ignores case and extra whitespace.
+    * `"accents"` and `"typo"` also ignore accents (é → e) by removing the
+      combining marks of the Unicode NFKD form.
+
+    :param text: The answer to normalise
+    :type text: str
+    :param level: One of `MATCH_LEVELS`
+    :type level: str
+    :return: The normalised answer
+    :rtype: str
+    """
+    if level == "exact":
+        return text
+
+    text = " ".join(text.casefold().split())
+    # ASCII text has no accents, which is most words in most decks.
+    if level != "casefold" and not text.isascii():
+        text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text
+
+def allowed_typos(answer: str) -> int:
+    """
+    Return how many typos are forgiven in an answer at the `"typo"` matching level. \n
+    Answers of up to 3 characters must be spelt correctly, up to 8 characters may have 1 typo, and longer ones 2.
+    """
+    if len(answer) <= 3:
+        return 0
+    if len(answer) <= 8:
+        return 1
+    return 2
+
+def within_edit_distance(a: str, b: str, limit: int) -> bool:
+    """
+    Check whether `a` can be turned into `b` with at most `limit` edits.
+
+    An edit is inserting, deleting or replacing one character, or swapping
+    two neighbouring ones. Only the diagonal band of width `2 * limit + 1`
+    is computed, and the search stops as soon as every path is over the
+    limit. The common prefix and suffix are skipped first, so a near-miss on
+    a long phrase only costs as much as the part that differs.
+
+    :param a: The first string
+    :type a: str
+    :param b: The second string
+    :type b: str
+    :param limit: The maximum number of edits
+    :type limit: int
+    :return: Whether the edit distance is at most `limit`
+    :rtype: bool
+    """
+    if a == b:
+        return True
+    if limit <= 0 or abs(len(a) - len(b)) > limit:
+        return False
+
+    # Characters shared at both ends never need an edit.
+    start = 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if len(a) > len(b):
+        a, b = b, a
+
+    too_far = limit + 1
+    columns = len(a)
+    before_previous: list = []
+    previous = [j if j <= limit else too_far for j in range(columns + 1)]
+
+    for i in range(1, len(b) + 1):
+        current = [too_far] * (columns + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+
+        for j in range(max(1, i - limit), min(columns, i + limit) + 1):
+            cost = previous[j - 1] + (a[j - 1] != b[i - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            # Two neighbouring characters swapped
+            if i > 1 and j > 1 and a[j - 1] == b[i - 2] and a[j - 2] == b[i - 1] and before_previous[j - 2] + 1 < cost:
+                cost = before_previous[j - 2] + 1
+            current[j] = min(cost, too_far)
+            if current[j] < row_min:
+                row_min = current[j]
+
+        # Stop early: no path through this row stays within the limit.
+        if row_min > limit:
+            return False
+        before_previous, previous = previous, current
+
+    return previous[columns] <= limit
+
+# Answers are listed with this between them, and `create` splits what is typed at it
+ANSWER_SEPARATOR = " / "
+
+def parse_answers(value: "str | list") -> Tuple[str, ...]:
+    """
+    Return the accepted answers of a learning word, as written in the `words` object of a vocabulary file.
+
+    A learning word maps to one answer (a string), or to a list of answers
+    for words with several meanings or synonyms, such as
+    `"chien": ["dog", "hound"]`. Repeated answers are only kept once.
+
+    :param value: The value of the learning word in `words`
+    :type value: str | list
+    :return: The answers, in file order
+    :rtype: Tuple[str, ...]
+    :raises VocabFileError: If the value is not text or a non-empty list of text
+    """
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, list) and value and all(isinstance(answer, str) for answer in value):
+        return tuple(dict.fromkeys(value))
+    raise VocabFileError("malformed vocabulary file (translations must be text or a list of text).")
+
+def format_answers(answers: "Tuple[str, ...] | list") -> "str | list":
+    """
+    Return answers the way `words` stores them: a single answer stays a string, so older versions can still read the file.
+
+    :param answers: The accepted answers of a learning word
+    :type answers: Tuple[str, ...] | list
+    :return: The value to write
+    :rtype: str | list
+    """
+    return answers[0] if len(answers) == 1 else list(answers)
+
+class Deck:
+    """
+    A parsed vocabulary file held in memory.
+
+    A `Deck` is built once per file version by `DeckCache` and is treated as
+    read-only afterwards, so questions can be asked and answers checked
+    without touching the disk again.
+
+    Attributes
+    ----------
+    path : str
+        Absolute path of the JSON file the deck was loaded from.
+    learning : str
+        The language the user is learning.
+    spoken : str
+        The language the user already speaks.
+    words : Dict[str, str | Tuple[str, ...]]
+        Mapping of learning-language words to spoken-language words. A
+        word with several accepted answers maps to a tuple of them (see
+        `parse_answers`); use `answers` or `entries` to read either kind.
+    keys : Tuple[str, ...]
+        The learning-language words, in file order.
+    values : Tuple[str, ...]
+        The first spoken-language word of each learning word, in file
+        order. Questions in the spoken language show these.
+    spoken_index : Dict[str, Tuple[str, ...]]
+        Reverse index mapping each spoken-language word (including every
+        synonym) to every learning-language word that translates to it.
+    mtime_ns : int
+        Modification time of the file when it was loaded.
+    size : int
+        Size in bytes of the file when it was loaded.
+    """
+
+    def __init__(self, path: str, data: Dict, mtime_ns: int = 0, size: int = 0) -> None:
+        try:
+            self.learning: str = str(data["languages"]["learning"])
+            self.spoken: str = str(data["languages"]["spoken"])
+            self.words: Dict[str, "str | Tuple[str, ...]"] = dict(data["words"])
+        except Exception as exc:
+            # Re-raise a consistent error type for callers.
+            raise VocabFileError("malformed vocabulary file.") from exc
+
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+        # Most words have one answer and stay a string; only lists go through `parse_answers`.
+        synonyms = []
+        if set(map(type, self.words.values())) != {str}:
+            synonyms = [learning_word for learning_word, value in self.words.items() if type(value) is not str]
+        for learning_word in synonyms:
+            self.words[learning_word] = parse_answers(self.words[learning_word])
+
+        # Build the word lists once so picking a question is O(1).
+        self.keys: Tuple[str, ...] = tuple(self.words.keys())
+        if synonyms:
+            self.values: Tuple[str, ...] = tuple(value if type(value) is str else value[0] for value in self.words.values())
+        else:
+            self.values = tuple(self.words.values())  # type: ignore
+
+        # Build the spoken→learning index. A spoken word can be the
+        # translation of several learning words, so keep all of them.
+        reverse: Dict[str, list] = {}
+        if synonyms:
+            for learning_word, answers in self.entries():
+                for spoken_word in answers:
+                    reverse.setdefault(spoken_word, []).append(learning_word)
+        else:
+            for learning_word, spoken_word in self.words.items():
+                reverse.setdefault(spoken_word, []).append(learning_word)  # type: ignore
+        self.spoken_index: Dict[str, Tuple[str, ...]] = {
+            spoken_word: tuple(learning_words) for spoken_word, learning_words in reverse.items()
+        }
+
+        # Hashed sets of the accepted answers of every word with more than one, in
+        # both directions, so checking an answer is O(1) however many synonyms a
+        # word has or however many words share a translation. A single answer is
+        # just compared, so decks without synonyms cost nothing extra. Spoken words
+        # shared by many learning words are common in big decks, so their sets are
+        # made the first time they are asked (see `accepted_answer`).
+        self._answer_sets: Tuple[Dict[str, frozenset], Dict[str, frozenset]] = (
+            {learning_word: frozenset(self.words[learning_word]) for learning_word in synonyms},
+            {},
+        )
+
+        # Normalised answers for each matching level, built the first time that level is used.
+        self._normalised: Dict[str, Tuple[Dict[str, Tuple[str, ...]], Dict[str, Tuple[str, ...]]]] = {}
+        # The same, keyed by `(question word, normalised answer)`, see `accepted_answer`.
+        self._normalised_pairs: Dict[str, Tuple[Dict[Tuple[str, str], str], Dict[Tuple[str, str], str]]] = {}
+
+    @property
+    def languages(self) -> Dict[str, str]:
+        """ The `languages` section of the vocabulary file. """
+        return {"learning": self.learning, "spoken": self.spoken}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def entries(self):
+        """ Yield each learning word and the tuple of its accepted answers, in file order. """
+        for learning_word, value in self.words.items():
+            yield learning_word, (value,) if type(value) is str else value
+
+    def answers(self, word: str, word_type: str) -> Tuple[str, ...]:
+        """
+        Return every accepted answer for a question word in O(1).
+
+        Parameters
+        ----------
+        word : str
+            The word that appeared in the question.
+        word_type : str
+            `"keys"` if `word` is a learning-language word, or `"values"`
+            if it is a spoken-language word.
+
+        Returns
+        -------
+        Tuple[str, ...]
+            The accepted answers, in file order.
+
+        Raises
+        ------
+        KeyError
+            If `word` is not in the deck.
+        ValueError
+            If `word_type` is not `"keys"` nor `"values"`.
+        """
+        if word_type == "keys":
+            value = self.words[word]
+            return (value,) if type(value) is str else value  # type: ignore
+        elif word_type == "values":
+            return self.spoken_index[word]
+        else:
+            raise ValueError("parameter 'word_type' must be 'keys' or 'values'")
+
+    def accepted_answer(self, word: str, word_type: str, user_input: str, level: str = "exact") -> str | None:
+        """
+        Return the answer to a question word that the user's input matches in O(1), without forgiving typos.
+
+        Parameters
+        ----------
+        word : str
+            The word that appeared in the question.
+        word_type : str
+            `"keys"` if `word` is a learning-language word, or `"values"`
+            if it is a spoken-language word.
+        user_input : str
+            The user's answer.
+        level : str, optional
+            The matching level (see `normalise_answer`). `"typo"` matches
+            like `"accents"` here; `check_answer` handles typos.
+
+        Returns
+        -------
+        str | None
+            The matched answer, spelt as in the deck, or None if the input
+            is not accepted (or `word` is not in the deck).
+        """
+        if word_type == "keys":
+            answers = self.words.get(word)
+        elif word_type == "values":
+            answers = self.spoken_index.get(word)
+            if answers is not None and len(answers) == 1:
+                answers = answers[0]
+        else:
+            raise ValueError("parameter 'word_type' must be 'keys' or 'values'")
+        if answers is None:
+            return None
+        if type(answers) is str:
+            if user_input == answers:
+                return user_input
+        else:
+            answer_sets = self._answer_sets[word_type == "values"]
+            accepted = answer_sets.get(word)
+            if accepted is None:
+                accepted = answer_sets[word] = frozenset(answers)
+            if user_input in accepted:
+                return user_input
+        if level == "exact":
+            return None
+
+        index = self._normalised_pairs.get(level)
+        if index is None:
+            # `setdefault` keeps the first answer in file order when several normalise the same.
+            by_learning: Dict[Tuple[str, str], str] = {}
+            by_spoken: Dict[Tuple[str, str], str] = {}
+            for learning_word, spoken_words in self.entries():
+                normalised_learning = normalise_answer(learning_word, level)
+                for spoken_word in spoken_words:
+                    by_learning.setdefault((learning_word, normalise_answer(spoken_word, level)), spoken_word)
+                    by_spoken.setdefault((spoken_word, normalised_learning), learning_word)
+            index = self._normalised_pairs[level] = (by_learning, by_spoken)
+
+        return index[word_type == "values"].get((word, normalise_answer(user_input, level)))
+
+    def normalised_answers(self, word: str, word_type: str, level: str) -> Tuple[str, ...]:
+        """
+        Return `answers(word, word_type)` normalised for a matching level (see `normalise_answer`).
+
+        Every answer in the deck is normalised once, the first time a level
+        is used, so checking an answer never normalises the deck's side again.
+        """
+        index = self._normalised.get(level)
+        if index is None:
+            index = (
+                {learning_word: tuple(normalise_answer(spoken_word, level) for spoken_word in spoken_words)
+                 for learning_word, spoken_words in self.entries()},
+                {spoken_word: tuple(normalise_answer(learning_word, level) for learning_word in learning_words)
+                 for spoken_word, learning_words in self.spoken_index.items()},
+            )
+            self._normalised[level] = index
+
+        if word_type == "keys":
+            return index[0][word]
+        elif word_type == "values":
+            return index[1][word]
+        else:
+            raise ValueError("parameter 'word_type' must be 'keys' or 'values'")
+
+# Compiled deck format (see `compile_deck`)
+COMPILED_SUFFIX = ".vpdeck"
+COMPILED_MAGIC = b"VPDK"
+COMPILED_VERSION = 2
+# magic, format version, reserved, header length
+_COMPILED_PREAMBLE = struct.Struct("<4sHHI")
+
+def get_compiled_path(json_path: str) -> str:
+    """
+    Return the path of the compiled deck that belongs to a vocabulary JSON file. \n
+    :param json_path: The path of the vocabulary JSON file
+    :type json_path: str
+    :return: The same path with the `.json` (or `.json.gz`, `.json.xz`) extension replaced by `COMPILED_SUFFIX`
+    :rtype: str
+    """
+    return split_deck_suffix(json_path)[0] + COMPILED_SUFFIX
+
+def compile_deck(json_path: str, compiled_path: str | None = None) -> str:
+    """
+    Convert a `{"languages", "words"}` vocabulary JSON file to the compiled format.
+
+    The compiled file is laid out as follows (all integers little-endian):
+
+    * A preamble: `COMPILED_MAGIC`, the format version, a reserved field and
+      the length of the header.
+    * A UTF-8 JSON header with the languages, the number of entries and
+      strings and the size and modification time of the source file.
+    * Padding to an 8-byte boundary.
+    * The string table offsets: `strings + 1` unsigned 64-bit integers.
+    * `count + 1` unsigned 32-bit string numbers: entry `i` has its
+      learning word at string `first[i]` and its spoken words (see
+      `parse_answers`) at the strings up to `first[i + 1]`.
+    * `count` unsigned 32-bit entry numbers sorted by learning word, then
+      `strings - count` pairs of unsigned 32-bit string and entry numbers
+      sorted by spoken word, for binary searches.
+    * The UTF-8 encoded strings, back to back.
+
+    Parameters
+    ----------
+    json_path : str
+        Path to the vocabulary JSON file.
+    compiled_path : str | None, optional
+        Where to write the compiled deck. Defaults to `get_compiled_path(json_path)`.
+
+    Returns
+    -------
+    str
+        The path of the compiled deck.
+
+    Raises
+    ------
+    VocabFileError
+        If the JSON file is malformed.
+    """
+    if compiled_path is None:
+        compiled_path = get_compiled_path(json_path)
+
+    stat = os.stat(json_path)
+    deck = Deck(json_path, read_json(json_path), stat.st_mtime_ns, stat.st_size)
+    count = len(deck)
+
+    # Encode every string once; entry i owns its learning word and then each of its answers.
+    strings = []
+    first = array("I")
+    answer_entries = []
+    for entry, (learning_word, answers) in enumerate(deck.entries()):
+        first.append(len(strings))
+        strings.append(learning_word.encode("utf-8"))
+        for answer in answers:
+            answer_entries.append((len(strings), entry))
+            strings.append(answer.encode("utf-8"))
+    first.append(len(strings))
+    offsets = array("Q", [0])
+    for string in strings:
+        offsets.append(offsets[-1] + len(string))
+
+    # Sorting the UTF-8 bytes matches the comparisons done when searching.
+    key_order = array("I", sorted(range(count), key=lambda entry: strings[first[entry]]))
+    value_order = array("I")
+    for pair in sorted(answer_entries, key=lambda pair: strings[pair[0]]):
+        value_order.extend(pair)
+
+    if sys.byteorder != "little":
+        for table in (offsets, first, key_order, value_order):
+            table.byteswap()
+
+    header = json.dumps({
+        "learning": deck.learning,
+        "spoken": deck.spoken,
+        "count": count,
+        "strings": len(strings),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+    }, ensure_ascii=False).encode("utf-8")
+    preamble = _COMPILED_PREAMBLE.pack(COMPILED_MAGIC, COMPILED_VERSION, 0, len(header))
+    padding = b"\0" * (-(len(preamble) + len(header)) % 8)
+
+    # Write to a temporary file first so readers never see a half-written deck.
+    tmp_path = f"{compiled_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(preamble + header + padding)
+            offsets.tofile(f)
+            first.tofile(f)
+            key_order.tofile(f)
+            value_order.tofile(f)
+            for string in strings:
+                f.write(string)
+        os.replace(tmp_path, compiled_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    return compiled_path
+
+class _CompiledColumn:
+    """ A read-only sequence view of the learning (`column == 0`) or first spoken (`column == 1`) words of a `CompiledDeck`. """
+
+    def __init__(self, deck: "CompiledDeck", column: int) -> None:
+        self._deck = deck
+        self._column = column
+
+    def __len__(self) -> int:
+        return len(self._deck)
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self._deck):
+            raise IndexError("compiled deck index out of range")
+        return self._deck.string(self._deck._first(index) + self._column)
+
+class CompiledDeck:
+    """
+    A compiled vocabulary file read through `mmap`.
+
+    It offers the same interface as `Deck` for asking questions and checking
+    answers, but nothing is loaded up front: opening it only reads the
+    header, and each lookup reads just the strings it needs. Reverse lookups
+    are binary searches, so they cost O(log n) page reads.
+
+    Attributes
+    ----------
+    path : str
+        Absolute path of the compiled file.
+    learning : str
+        The language the user is learning.
+    spoken : str
+        The language the user already speaks.
+    keys : Sequence[str]
+        The learning-language words, in file order.
+    values : Sequence[str]
+        The first spoken-language word of each entry, in file order.
+    mtime_ns : int
+        Modification time of the compiled file when it was opened.
+    size : int
+        Size in bytes of the compiled file when it was opened.
+    source_size : int
+        Size in bytes of the JSON file it was compiled from.
+    source_mtime_ns : int
+        Modification time of the JSON file it was compiled from.
+    """
+
+    def __init__(self, path: str, mtime_ns: int = 0, size: int = 0) -> None:
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, _, header_len = _COMPILED_PREAMBLE.unpack_from(self._mm, 0)
+            if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+                raise VocabFileError("not a compiled vocabulary file.")
+            header_start = _COMPILED_PREAMBLE.size
+            header = json.loads(self._mm[header_start:header_start + header_len].decode("utf-8"))
+            self.learning: str = header["learning"]
+            self.spoken: str = header["spoken"]
+            self._count: int = header["count"]
+            self._strings: int = header["strings"]
+            self.source_size: int = header["source_size"]
+            self.source_mtime_ns: int = header["source_mtime_ns"]
+        except VocabFileError:
+            self._mm.close()
+            raise
+        except Exception as exc:
+            self._mm.close()
+            raise VocabFileError("malformed compiled vocabulary file.") from exc
+
+        # Work out where each table starts (see `compile_deck`).
+        header_end = header_start + header_len
+        self._offsets_start = header_end + (-header_end % 8)
+        self._first_start = self._offsets_start + 8 * (self._strings + 1)
+        self._key_order_start = self._first_start + 4 * (self._count + 1)
+        self._value_order_start = self._key_order_start + 4 * self._count
+        self._strings_start = self._value_order_start + 8 * (self._strings - self._count)
+
+        self.keys = _CompiledColumn(self, 0)
+        self.values = _CompiledColumn(self, 1)
+
+    @property
+    def languages(self) -> Dict[str, str]:
+        """ The `languages` section of the vocabulary file. """
+        return {"learning": self.learning, "spoken": self.spoken}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """ Unmap the file. """
+        self._mm.close()
+
+    def matches_source(self, size: int, mtime_ns: int) -> bool:
+        """ Return whether the deck was compiled from a JSON file of this size and modification time. """
+        return self.source_size == size and self.source_mtime_ns == mtime_ns
+
+    def _first(self, entry: int) -> int:
+        """ Return the number of the string with the learning word of `entry`; its answers follow it. """
+        return struct.unpack_from("<I", self._mm, self._first_start + 4 * entry)[0]
+
+    def _string_bytes(self, number: int) -> bytes:
+        """ Return the raw bytes of string `number` in the string table. """
+        start, end = struct.unpack_from("<QQ", self._mm, self._offsets_start + 8 * number)
+        return self._mm[self._strings_start + start:self._strings_start + end]
+
+    def string(self, number: int) -> str:
+        """ Return string `number` in the string table. """
+        return self._string_bytes(number).decode("utf-8")
+
+    def _order_length(self, column: int) -> int:
+        """ Return the number of strings in the sorted order of `column`: one learning word per entry, or every answer. """
+        return self._count if column == 0 else self._strings - self._count
+
+    def _sorted(self, position: int, column: int) -> Tuple[int, int]:
+        """ Return the string and entry numbers at a position in the sorted order of `column`. """
+        if column == 0:
+            (entry,) = struct.unpack_from("<I", self._mm, self._key_order_start + 4 * position)
+            return self._first(entry), entry
+        return struct.unpack_from("<II", self._mm, self._value_order_start + 8 * position)
+
+    def _search(self, word: bytes, column: int) -> int:
+        """ Return the first position in the sorted order of `column` whose string is not less than `word`. """
+        low, high = 0, self._order_length(column)
+        while low < high:
+            middle = (low + high) // 2
+            if self._string_bytes(self._sorted(middle, column)[0]) < word:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def answers(self, word: str, word_type: str) -> Tuple[str, ...]:
+        """
+        Return every accepted answer for a question word in O(log n).
+
+        See `Deck.answers`.
+        """
+        if word_type not in ("keys", "values"):
+            raise ValueError("parameter 'word_type' must be 'keys' or 'values'")
+
+        column = 0 if word_type == "keys" else 1
+        encoded = word.encode("utf-8")
+
+        # Collect every entry whose word matches; they are next to each other in the sorted order.
+        entries = set()
+        position, length = self._search(encoded, column), self._order_length(column)
+        while position < length:
+            string, entry = self._sorted(position, column)
+            if self._string_bytes(string) != encoded:
+                break
+            entries.add(entry)
+            position += 1
+
+        if not entries:
+            raise KeyError(word)
+
+        # Answers are the other side of each entry, in file order.
+        if column == 1:
+            return tuple(self.string(self._first(entry)) for entry in sorted(entries))
+        answers = []
+        for entry in sorted(entries):
+            answers.extend(self.string(number) for number in range(self._first(entry) + 1, self._first(entry + 1)))
+        return tuple(answers)
+
+    def accepted_answer(self, word: str, word_type: str, user_input: str, level: str = "exact") -> str | None:
+        """
+        Return the answer to a question word that the user's input matches, without forgiving typos.
+
+        See `Deck.accepted_answer`. Compiled decks are never loaded in full,
+        so the answers to this question are looked up in O(log n) and compared one by one.
+        """
+        try:
+            answers = self.answers(word, word_type)
+        except KeyError:
+            return None
+        if user_input in answers:
+            return user_input
+        if level != "exact":
+            normalised_input = normalise_answer(user_input, level)
+            for answer in answers:
+                if normalise_answer(answer, level) == normalised_input:
+                    return answer
+        return None
+
+    def normalised_answers(self, word: str, word_type: str, level: str) -> Tuple[str, ...]:
+        """
+        Return `answers(word, word_type)` normalised for a matching level (see `normalise_answer`).
+
+        Compiled decks are never loaded in full, so only the answers to this question are normalised.
+        """
+        return tuple(normalise_answer(answer, level) for answer in self.answers(word, word_type))
+
+class DeckCache:
+    """
+    Keep each vocabulary file parsed in memory, keyed by its absolute path.
+
+    Every lookup costs an `os.stat` of the file and of its compiled
+    counterpart; the file is only parsed again when its modification time or
+    size has changed since it was last loaded. When a compiled deck (see
+    `compile_deck`) exists, is at least as new as the JSON file and was
+    compiled from the JSON file as it is now (going by the size and
+    modification time in its header), it is used instead. A compiled deck
+    that is replaced is closed.
+    """
+
+    def __init__(self) -> None:
+        self._decks: Dict[str, Deck] = {}
+        # Compiled decks that could not be opened, with their modification time and size, so they are not tried again
+        self._unusable: Dict[str, Tuple[int, int]] = {}
+
+    def get(self, path: str) -> "Deck | CompiledDeck":
+        """
+        Return the deck for `path`, loading or refreshing it if needed.
+
+        Parameters
+        ----------
+        path : str
+            Filesystem path to the vocabulary JSON file.
+
+        Returns
+        -------
+        Deck | CompiledDeck
+            The up-to-date deck.
+        """
+        key = os.path.abspath(path)
+        # Stat before reading, so a write that lands mid-load is picked up next time.
+        stat = os.stat(key)
+        deck = self._decks.get(key)
+
+        # Prefer the compiled deck if it is at least as new as the JSON file.
+        compiled_path = get_compiled_path(key)
+        try:
+            compiled_stat = os.stat(compiled_path)
+            if compiled_stat.st_mtime_ns < stat.st_mtime_ns or \
+                    self._unusable.get(compiled_path) == (compiled_stat.st_mtime_ns, compiled_stat.st_size):
+                compiled_stat = None
+        except OSError:
+            compiled_stat = None
+
+        if compiled_stat is not None:
+            if not isinstance(deck, CompiledDeck) or deck.mtime_ns != compiled_stat.st_mtime_ns or deck.size != compiled_stat.st_size:
+                try:
+                    deck = self._replace(key, CompiledDeck(compiled_path, compiled_stat.st_mtime_ns, compiled_stat.st_size))
+                except VocabFileError:
+                    # Compiled by an older version (or damaged): use the JSON file until it is compiled again.
+                    self._unusable[compiled_path] = (compiled_stat.st_mtime_ns, compiled_stat.st_size)
+                    compiled_stat = None
+            if compiled_stat is not None and not deck.matches_source(stat.st_size, stat.st_mtime_ns):
+                # Compiled from another version of the JSON file, for example one restored with its old date.
+                self._unusable[compiled_path] = (compiled_stat.st_mtime_ns, compiled_stat.st_size)
+                compiled_stat = None
+        if compiled_stat is None and (not isinstance(deck, Deck) or deck.mtime_ns != stat.st_mtime_ns or deck.size != stat.st_size):
+            deck = self._replace(key, Deck(key, read_json(key), stat.st_mtime_ns, stat.st_size))
+
+        return deck
+
+    def _replace(self, key: str, deck: "Deck | CompiledDeck") -> "Deck | CompiledDeck":
+        """ Cache `deck` for the absolute path `key`, closing the compiled deck it replaces. """
+        old = self._decks.get(key)
+        self._decks[key] = deck
+        if isinstance(old, CompiledDeck):
+            old.close()
+        return deck
+
+    def invalidate(self, path: str | None = None) -> None:
+        """
+        Forget a cached deck, or every cached deck if `path` is None.
+
+        :param path: The path of the deck to forget. Defaults to None
+        :type path: str | None
+        """
+        if path is None:
+            self._decks.clear()
+        else:
+            self._decks.pop(os.path.abspath(path), None)
+
+deck_cache = DeckCache()
+
+def get_deck(deck: "Deck | CompiledDeck | str") -> "Deck | CompiledDeck":
+    """
+    Return `deck` itself, or the cached deck for it if given a path.
+
+    :param deck: A loaded deck or the path of a vocabulary JSON file
+    :type deck: Deck | CompiledDeck | str
+    :return: The loaded deck
+    :rtype: Deck | CompiledDeck
+    """
+    if isinstance(deck, (Deck, CompiledDeck)):
+        return deck
+    return deck_cache.get(deck)
+
+# Name of the manifest file that caches deck details in a vocabulary directory
+CATALOG_FILENAME = ".catalog.json"
+CATALOG_VERSION = 1
+# The index `lookup` keeps of every word in `JSON_DIR` (see `lookup.py`)
+LOOKUP_INDEX_FILENAME = ".lookup-index"
+
+def is_listed_deck(name: str) -> bool:
+    """
+    Return whether a file in a vocabulary directory is a deck to list: it has a vocabulary file extension and is not
+    one of the files Vocabulary Plus keeps there (the catalog, the review log, the lookup index). Other hidden files,
+    such as `.draft.json`, are decks like any other. \n
+    :param name: The file name, without its directory
+    :type name: str
+    :return: Whether the file is a vocabulary file
+    :rtype: bool
+    """
+    return (is_deck_filename(name)
+            and name not in (CATALOG_FILENAME, os.path.basename(REVIEW_LOG_PATH), LOOKUP_INDEX_FILENAME))
+
+class Catalog:
+    """
+    A cached list of the vocabulary files in a directory.
+
+    The catalog is stored as a manifest (`CATALOG_FILENAME`) inside the
+    directory. For each vocabulary file it records the display name, the
+    languages, the number of words, and the size and modification time of
+    the file and of its compiled deck, if any. `refresh` revalidates it with
+    a single `os.scandir` pass, and only files whose size or modification
+    time changed (or whose compiled deck did) are opened and parsed again.
+
+    Attributes
+    ----------
+    directory : str
+        The directory holding the vocabulary files.
+    path : str
+        The path of the manifest file.
+    entries : Dict[str, Dict]
+        Details of each vocabulary file, keyed by filename and sorted by name.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, CATALOG_FILENAME)
+        self.entries: Dict[str, Dict] = {}
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        """ Return the entries stored in the manifest, or an empty dict if it is missing or unreadable. """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != CATALOG_VERSION:
+                return {}
+            return dict(manifest["decks"])
+        except Exception:
+            return {}
+
+    def _save_manifest(self) -> None:
+        """ Write the manifest atomically. A read-only directory is silently ignored. """
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOG_VERSION, "decks": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def describe(path: str, filename: str, size: int, mtime_ns: int, compiled: list | None = None) -> Dict:
+        """
+        Open a vocabulary file and return its catalog entry.
+
+        Like `DeckCache.get`, the compiled deck is used if it is at least as
+        new as the file and was compiled from it, and the file itself if it
+        is not or cannot be opened.
+
+        Parameters
+        ----------
+        path : str
+            The path of the vocabulary file.
+        filename : str
+            The name of the file inside the catalog directory.
+        size : int
+            The size of the file in bytes.
+        mtime_ns : int
+            The modification time of the file in nanoseconds.
+        compiled : list | None, optional
+            The size and modification time of the file's compiled deck,
+            or None if it has none.
+
+        Returns
+        -------
+        Dict
+            The catalog entry. Unreadable files get an `error` message
+            instead of languages and a word count.
+        """
+        entry = {
+            "display_name": split_deck_suffix(filename)[0],
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "compiled": compiled,
+        }
+        try:
+            deck = None
+            if compiled is not None and compiled[1] >= mtime_ns:
+                # A compiled deck only needs its header read.
+                try:
+                    deck = CompiledDeck(get_compiled_path(path))
+                    deck.close()
+                    if not deck.matches_source(size, mtime_ns):
+                        deck = None
+                except VocabFileError:
+                    # Compiled by an older version (or damaged): the file itself is used instead.
+                    deck = None
+            if deck is None:
+                deck = Deck(path, read_json(path))
+            entry.update(learning=deck.learning, spoken=deck.spoken, word_count=len(deck))
+        except Exception as exc:
+            entry["error"] = str(exc) or type(exc).__name__
+        return entry
+
+    def refresh(self) -> "Catalog":
+        """
+        Bring the catalog up to date with the directory and save it if anything changed.
+
+        Returns
+        -------
+        Catalog
+            The catalog itself, so calls can be chained.
+        """
+        cached = self._load_manifest()
+        entries: Dict[str, Dict] = {}
+        changed = False
+
+        decks = {}
+        compiled = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for dir_entry in it:
+                    name = dir_entry.name
+                    is_compiled = name.endswith(COMPILED_SUFFIX)
+                    # Skip the manifest itself and files that are neither vocabulary files nor compiled decks.
+                    if not is_compiled and not is_listed_deck(name):
+                        continue
+                    try:
+                        if not dir_entry.is_file():
+                            continue
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+                    if is_compiled:
+                        compiled[name] = [stat.st_size, stat.st_mtime_ns]
+                    else:
+                        decks[name] = (dir_entry.path, stat)
+        except OSError:
+            decks = {}
+
+        for name, (path, stat) in decks.items():
+            compiled_stat = compiled.get(split_deck_suffix(name)[0] + COMPILED_SUFFIX)
+            entry = cached.get(name)
+            if entry is None or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns \
+                    or entry.get("compiled") != compiled_stat:
+                # New or changed file, or a new compiled deck: this is the only case where a deck is opened.
+                entry = self.describe(path, name, stat.st_size, stat.st_mtime_ns, compiled_stat)
+                changed = True
+            entries[name] = entry
+
+        # Files that were removed also change the manifest.
+        changed = changed or len(entries) != len(cached)
+
+        self.entries = dict(sorted(entries.items(), key=lambda item: item[0].casefold()))
+        if changed:
+            self._save_manifest()
+        return self
+
+    def filenames(self) -> list:
+        """ Return the catalogued filenames, sorted by name. """
+        return list(self.entries)
+
+_catalog: Catalog | None = None
+
+def get_catalog() -> Catalog:
+    """ Return the catalog of `JSON_DIR`, scanning the directory the first time it is needed. """
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog(JSON_DIR).refresh()
+    return _catalog
+
+# ------------------------------ Rendering ------------------------------
+
+# Matches the ANSI escape sequences that colorama writes
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+class PlainRenderer:
+    """
+    Write terminal output as plain text, one frame at a time.
+
+    Lines and cursor movements are collected in a buffer and only written
+    when `flush` (or `prompt`) is called, so showing a question and its
+    feedback costs one write and one flush each, rather than one per line.
+
+    Every backend offers the same methods. `style` names what a line is
+    (for example `"question"`, `"correct"` or `"warning"`, see
+    `AnsiRenderer.STYLES`), so each backend can present it its own way.
+    This backend ignores styles and removes any colours from the text.
+    """
+
+    name = "plain"
+
+    def __init__(self, stream=None) -> None:
+        """
+        :param stream: The stream to write to. Defaults to `sys.stdout`
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self._buffer: list = []
+
+    def format(self, text: str, style: str | None) -> str:
+        """ Return one line of output, without its line ending. """
+        return _ANSI_ESCAPE.sub("", text)
+
+    def write(self, text: str = "", style: str | None = None) -> None:
+        """
+        Add a line (or several, separated by newlines) to the frame.
+
+        :param text: The text to write
+        :type text: str
+        :param style: What the text is, so it can be coloured. Defaults to no style
+        :type style: str | None
+        """
+        self._buffer.append(self.format(text, style) + "\n")
+
+    def clear(self, lines: int) -> None:
+        """ Remove the last `lines` lines from the terminal, if it supports it. Plain text cannot. """
+        pass
+
+    def flush(self) -> None:
+        """ Write the frame with a single write and flush. """
+        if self._buffer:
+            self.stream.write("".join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+
+    def prompt(self, text: str, style: str | None = "prompt") -> str:
+        """
+        Write the frame followed by `text`, then ask the user for input.
+
+        :param text: The text to show before the user's input
+        :type text: str
+        :param style: What the text is. Defaults to `"prompt"`
+        :type style: str | None
+        :return: The user input
+        :rtype: str
+        """
+        self._buffer.append(self.format(text, style))
+        return self._read_input()
+
+    def _read_input(self) -> str:
+        """ Write the frame, then read one line of input. Both are timed separately when profiling. """
+        profiler = get_profiler()
+        with profiler.stage("render"):
+            self.flush()
+        with profiler.stage("input"):
+            return input()
+
+class AnsiRenderer(PlainRenderer):
+    """
+    Write coloured terminal output, and clear lines by moving the cursor.
+
+    Whether the terminal can move the cursor is checked once, when the
+    renderer is created. Colours are always written, as before; on Windows,
+    colorama translates them.
+    """
+
+    name = "ansi"
+
+    STYLES = {
+        "title": Fore.CYAN,
+        "heading": Fore.LIGHTBLUE_EX,
+        "section": Fore.YELLOW,
+        "prompt": Fore.LIGHTCYAN_EX,
+        "question": Fore.MAGENTA,
+        "correct": Fore.GREEN,
+        "incorrect": Fore.RED,
+        "success": Fore.GREEN,
+        "warning": Fore.YELLOW,
+        "error": Fore.RED,
+        "goodbye": Fore.LIGHTGREEN_EX,
+        "dim": Style.DIM,
+    }
+
+    def __init__(self, stream=None) -> None:
+        super().__init__(stream)
+        try:
+            self.cursor = self.stream.isatty() and os.getenv("TERM") not in (None, "dumb")
+        except (AttributeError, ValueError):
+            self.cursor = False
+
+    def format(self, text: str, style: str | None) -> str:
+        colour = self.STYLES.get(style, "") if style else ""
+        return f"{colour}{text}{Style.RESET_ALL}" if colour else text
+
+    def clear(self, lines: int) -> None:
+        if lines <= 0 or not self.cursor:
+            return
+
+        # Move the cursor up, erase each line, then return to the first of them.
+        up = Cursor.UP(lines)
+        self._buffer.append(up + (ansi.clear_line() + "\n") * lines + up)  # clear_line() is "\033[2K"
+
+    def prompt(self, text: str, style: str | None = "prompt") -> str:
+        # Start from the beginning of the line, in case the cursor was moved.
+        self._buffer.append("\r")
+        return super().prompt(text, style)
+
+class JsonLinesRenderer(PlainRenderer):
+    """
+    Write output as JSON lines, for other programs to read.
+
+    Each line is an object with a `type` (its style, or `"text"`) and the
+    `text` without colours. Prompts have the type `"prompt"`, and are
+    followed by reading one line of input. Clearing lines does nothing.
+    """
+
+    name = "jsonl"
+
+    def format(self, text: str, style: str | None) -> str:
+        return json.dumps({"type": style or "text", "text": _ANSI_ESCAPE.sub("", text)}, ensure_ascii=False)
+
+    def prompt(self, text: str, style: str | None = "prompt") -> str:
+        self._buffer.append(json.dumps({"type": "prompt", "text": _ANSI_ESCAPE.sub("", text)}, ensure_ascii=False) + "\n")
+        return self._read_input()
+
+# The renderers that can be chosen with `--output`
+RENDERERS = {
+    "ansi": AnsiRenderer,
+    "plain": PlainRenderer,
+    "jsonl": JsonLinesRenderer,
+}
+
+_renderer: PlainRenderer | None = None
+
+def get_renderer() -> PlainRenderer:
+    """ Return the renderer for terminal output, creating an `AnsiRenderer` the first time unless `set_renderer` chose another. """
+    global _renderer
+    if _renderer is None:
+        _renderer = AnsiRenderer()
+    return _renderer
+
+def set_renderer(name: str) -> PlainRenderer:
+    """
+    Choose the renderer for terminal output.
+
+    :param name: A key of `RENDERERS`
+    :type name: str
+    :return: The new renderer
+    :rtype: PlainRenderer
+    """
+    global _renderer
+    _renderer = RENDERERS[name]()
+    return _renderer
+
+# ------------------------------ Profiling ------------------------------
+
+class _NullStage:
+    """ A stage that measures nothing, used while profiling is off. """
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+_NULL_STAGE = _NullStage()
+
+class _NullProfiler:
+    """
+    The profiler while profiling is off, which measures nothing.
+
+    It hands out a shared stage that does nothing, so the instrumented code
+    costs one method call per stage. `enable_profiling` replaces it with a
+    `profiling.Profiler`, which has the same methods.
+    """
+
+    path = None
+    enabled = False
+    stages: Dict[str, list] = {}
+
+    def end(self, name: str, began: Tuple[int, int]) -> None:
+        pass
+
+    def stage(self, name: str) -> _NullStage:
+        return _NULL_STAGE
+
+_profiler = _NullProfiler()
+
+def get_profiler() -> "_NullProfiler | Profiler":
+    """ Return the profiler, which is disabled unless `enable_profiling` was called. """
+    return _profiler
+
+def enable_profiling(path: str) -> "Profiler":
+    """
+    Start profiling, and save the results to `path` when Vocabulary Plus exits.
+
+    :param path: The file to write the results to (see `Profiler.save`)
+    :type path: str
+    :return: The new profiler
+    :rtype: Profiler
+    """
+    import atexit
+    from profiling import Profiler
+
+    global _profiler
+    _profiler = Profiler(path)
+    atexit.register(_profiler.save)
+    return _profiler
+
+
+def clear_lines(lines: int) -> None:
+    """
+    Remove the lines from the terminal. \n
+    :param lines: The number of lines to remove.
+    """
+    renderer = get_renderer()
+    renderer.clear(lines)
+    renderer.flush()
+
+def dynamic_print(text: str, style: str | None = None):
+    """
+    Print text and leave cursor at the end. \n
+    :param text: The text to print
+    :param style: What the text is, so the renderer can colour it (see `AnsiRenderer.STYLES`)
+    """
+    renderer = get_renderer()
+    renderer.write(text[:-1] if text.endswith("\n") else text, style)
+    renderer.flush()
+
+def dynamic_input(text: str, summary: "str | SessionStats | None" = None, style: str | None = None) -> str:
+    """ 
+    Print text with carriage return then ask the user for input. \n
+    Fallback: print text normally then ask for input. \n
+    Anything the renderer has buffered (such as lines to clear) is written first, in the same write. \n
+    :param text: The text to print before asking the user for input
+    :type text: str
+    :param summary: The summary to print on KeyboardInterrupt. Defaults to None
+    :type summary: str | SessionStats | None
+    :param style: What the text is, so the renderer can colour it. Defaults to None
+    :type style: str | None
+    :return: The user input
+    :rtype: str
+    """
+    try:
+        return get_renderer().prompt(text, style)
+    except KeyboardInterrupt:
+        on_keyboard_interrupt(summary if summary else "")
+        sys.exit(0)
+    except Exception:
+        print(text, end="")
+        user_input = input()
+        return user_input
+
+def get_display_filename(full_path: str, base_dir: str | None = None) -> str:
+    """
+    Return a clean, human-readable representation of *full_path* that works on any OS
+
+    • If `base_dir` is supplied, the returned value is the path of
+      `full_path` *relative* to that directory (otherwise the full
+      absolute path is used). \n
+    • The file extension (e.g. “.json” or “.json.gz”) is stripped. \n
+    • Path separators are normalised to forward slashes for display purposes. \n
+
+    Parameters
+    ----------
+    full_path: str
+        The absolute or relative path to the file you want to display.
+    base_dir: str | None, optional
+        The directory that should be considered the root for the display.
+        If omitted, the function simply shows the filename without its
+        extension.
+
+    Returns
+    -------
+    A platform-independent, extension-less path suitable for UI output *(str)*
+    """
+
+    # Imported here, as only this function needs it and it slows down start-up.
+    from pathlib import Path
+
+    # Turn everything into `pathlib.Path` objects (handles any OS)
+    file_path = Path(full_path).expanduser()
+    # try-except loop to catch Windows quirk
+    try:
+        file_path = file_path.resolve()
+    except OSError:
+        pass  # fall back to un-resolved path
+
+    if base_dir is not None:
+        base_path = Path(base_dir).expanduser().resolve()
+        # try-except loop to catch Windows quirk
+        try:
+            file_path = file_path.resolve()
+        except OSError:
+            pass  # fall back to un-resolved path
+    else:
+        base_path = None
+
+    # Compute a relative path if a base directory was given.
+    #    If the file is not under `base_path` fall back to the
+    #    absolute path – this prevents `ValueError: ... is not in the
+    #    subpath of ...`.
+    try:
+        rel_path = file_path.relative_to(base_path) if base_path else Path(file_path.name)
+    except Exception:
+        # Not a sub‑path of base_path – just use the filename itself
+        rel_path = file_path.name
+
+    # Strip the file extension (e.g. ".json" or ".json.gz"), keeping any remaining parts
+    stem = split_deck_suffix(str(rel_path))[0]
+
+    # Normalise separators for display (always forward slash)
+    display = str(stem).replace(os.sep, "/")
+
+    return display
+
+def get_dict_key(value: str, mapping: Dict[str, "str | Tuple[str, ...]"]) -> str:
+    """
+    Reverse-lookup a key in a dictionary given a value.
+
+    Parameters
+    ----------
+    value : str
+        The value whose corresponding key we want.
+    mapping : dict
+        Dictionary where `value` is expected to appear among the values.
+        A value can also be a list or tuple of accepted answers (such as
+        `Deck.words`), which matches if `value` is one of them.
+
+    Returns
+    -------
+    str
+        The key that maps to `value`.
+
+    Raises
+    ------
+    ValueError
+        If the value is not found in the dictionary.
+    """
+    for k, v in mapping.items():
+        if v == value or (not isinstance(v, str) and value in v):
+            return k
+        
+    raise ValueError(f"Value {value!r} not found in dictionary.")
+
+def parse_selection(text: str, count: int) -> list:
+    """
+    Parse the user's choice of vocab files from the list printed by `get_file_numbers`.
+
+    Accepts a number (`3`), several numbers (`1,3`), ranges (`1-4`), any mix
+    of these (`1-3, 6`), or `all`. Numbers that appear twice are only used once.
+
+    :param text: What the user typed
+    :type text: str
+    :param count: The number of vocab files in the list
+    :type count: int
+    :return: The chosen numbers (1-based), in the order they were given
+    :rtype: list
+    :raises ValueError: If the selection is not valid, with a message for the user
+    """
+    text = text.strip()
+    if text.lower() == "all":
+        return list(range(1, count + 1))
+
+    numbers: list = []
+    for part in text.split(","):
+        first, _, last = part.strip().partition("-")
+        if not first.strip().isdigit() or (last and not last.strip().isdigit()):
+            raise ValueError("Please enter a number, a list such as 1,3, a range such as 1-4, or 'all'.")
+
+        start = int(first)
+        end = int(last) if last else start
+        if not 1 <= start <= end <= count:
+            raise ValueError(f"Please enter numbers between 1 and {count}.")
+
+        for number in range(start, end + 1):
+            if number not in numbers:
+                numbers.append(number)
+
+    return numbers
+
+def get_file_numbers() -> list:
+    """
+    Get the files that the user wants to be tested on (see `parse_selection`).
+    Returns the vocab file #s in the list of vocab files printed, or an empty list if there are no vocab files.
+    """
+
+    # Scan `JSON_DIR` (through the catalog) now that the list is needed
+    catalog = get_catalog()
+    jsons = catalog.filenames()
+
+    # Print heading
+    renderer = get_renderer()
+    renderer.write("Vocabulary Files", "heading")
+
+    if jsons:
+        # Print the list, with the languages and word counts from the catalog
+        for i in range(len(jsons)):
+            entry = catalog.entries.get(jsons[i], {})
+            display_name = entry.get("display_name") or get_display_filename(jsons[i])
+            if "error" in entry:
+                details = "unreadable"
+            elif entry:
+                details = f"{entry['learning']} - {entry['spoken']}, {entry['word_count']} word{'' if entry['word_count'] == 1 else 's'}"
+            else:
+                details = ""
+            renderer.write(f"{Fore.YELLOW}{i + 1}.{Style.RESET_ALL} {display_name}" + (f" {Style.DIM}({details}){Style.RESET_ALL}" if details else ""))
+
+        # Keep asking until the selection is valid
+        while True:
+            user_input = renderer.prompt("Choose one or more of the above vocab lists (e.g. 1, 1,3, 1-4 or all): ")
+            try:
+                return parse_selection(user_input, len(jsons))
+            except ValueError as e:
+                renderer.write(str(e), "warning")
+    else:
+        # If `jsons` doesn't exist, return an empty list
+        return []
+
+# Number of answers kept in a session's history; older ones are discarded.
+SESSION_HISTORY_LIMIT = 1000
+
+def format_summary(total: int, correct: int, incorrect: int, not_answered: int) -> str:
+    """
+    Format the quiz summary shown when the user quits.
+
+    :param total: The number of questions attempted
+    :param correct: The number of correct answers
+    :param incorrect: The number of incorrect answers
+    :param not_answered: The number of questions left unanswered
+    :return summary: A formatted summary string
+    """
+    return f"\n{Fore.CYAN}Quiz Summary{Style.RESET_ALL}\nQuestions Attempted: {total}\n{Fore.GREEN}Correct Answers: {correct}{Style.RESET_ALL}\n{Fore.RED}Incorrect Answers: {incorrect}{Style.RESET_ALL}\n{Fore.YELLOW}Not Answered: {not_answered}{Style.RESET_ALL}\n"
+
+class SessionStats:
+    """
+    Running statistics for a quiz session.
+
+    Each answer updates the counters in O(1), and the summary is only
+    formatted when it is actually printed (`str(stats)`). Only the most
+    recent `history_limit` answers are remembered, so memory stays bounded
+    however long the session runs.
+
+    Attributes
+    ----------
+    correct : int
+        The number of correct answers.
+    incorrect : int
+        The number of incorrect answers.
+    not_answered : int
+        The number of questions left unanswered.
+    history : collections.deque
+        The most recent `(user_answer, correct_answer, is_correct)` tuples.
+    """
+
+    def __init__(self, history_limit: int | None = SESSION_HISTORY_LIMIT) -> None:
+        """
+        :param history_limit: The number of answers to remember. `None` keeps every answer, `0` keeps none.
+        :type history_limit: int | None
+        """
+        self.correct = 0
+        self.incorrect = 0
+        self.not_answered = 0
+        self.history: deque = deque(maxlen=history_limit)
+
+    @property
+    def total(self) -> int:
+        """ The number of questions attempted. """
+        return self.correct + self.incorrect + self.not_answered
+
+    def record(self, user_answer: str, correct_answer: str | None, is_correct: bool | None = None) -> None:
+        """
+        Add one answer to the statistics.
+
+        :param user_answer: The answer given by the user
+        :type user_answer: str
+        :param correct_answer: The correct answer
+        :type correct_answer: str | None
+        :param is_correct: Whether the answer was accepted. Defaults to comparing the two answers
+        :type is_correct: bool | None
+        """
+        if is_correct is None:
+            is_correct = user_answer == correct_answer
+
+        if is_correct:
+            self.correct += 1
+        elif user_answer == "":
+            self.not_answered += 1
+        else:
+            self.incorrect += 1
+
+        self.history.append((user_answer, correct_answer, is_correct))
+
+    def summary(self) -> str:
+        """ Return the formatted summary of the session so far. """
+        return format_summary(self.total, self.correct, self.incorrect, self.not_answered)
+
+    def __str__(self) -> str:
+        return self.summary()
+
+def get_summary(user_answers: list, correct_answers: list) -> str:
+    """
+    Generate a summary of the user's performance.
+    
+    :param user_answers: The answers given by the user
+    :type user_answers: list
+    :param correct_answers: The correct answers
+    :type correct_answers: list
+    :return summary: A formatted summary string
+    """
+    # Check each answer for correct/incorrect/not answered
+    stats = SessionStats(history_limit=0)
+    for user_answer, correct_answer in zip(user_answers, correct_answers):
+        stats.record(user_answer, correct_answer)
+
+    return stats.summary()
+
+def get_question(
+    deck: "Deck | CompiledDeck | str",
+    index: int | None = None,
+    word_type: str | None = None,
+    rng: random.Random | None = None,
+) -> Tuple[str, str, str]:
+    """
+    Generate a single question from a vocabulary deck.
+
+    The function randomly picks either the language the user is learning
+    or the language they already speak, then selects a random word from the
+    appropriate side of the vocabulary mapping. Question strategies can
+    choose the entry and the side themselves instead.
+
+    Parameters
+    ----------
+    deck: Deck | CompiledDeck | str
+        The loaded deck, or the path to the JSON file containing the
+        language and word data (looked up in `deck_cache`).
+    index: int | None, optional
+        The position of the entry to ask about. Defaults to a random entry.
+    word_type: str | None, optional
+        `"keys"` to show the learning-language word or `"values"` to show
+        the spoken-language word. Defaults to a random choice.
+    rng: random.Random | None, optional
+        The random number generator to use, e.g. a seeded one for
+        repeatable runs. Defaults to the `random` module.
+
+    Returns
+    -------
+    Tuple[str, str, str]
+        A three-element tuple:
+        1. `question` The formatted question string.
+        2. `word`  The word that appears in the question.
+        3. `word_type` Either `"keys"` (the word is from the learning
+           language) or `"values"` (the word is from the spoken language).
+
+    Raises
+    ------
+    VocabFileError
+        If the JSON structure is malformed or missing expected keys.
+    """
+
+    # Use the cached deck instead of parsing the file again.
+    deck = get_deck(deck)
+    if rng is None:
+        rng = random  # type: ignore
+
+    # Helper: Choose which language (learning vs. spoken) to ask about.
+    def get_language() -> Tuple[str, str, str]:
+        """
+        Randomly pick one of the two languages defined in the deck.
+
+        Returns
+        -------
+        Tuple[str, str, str]
+            (`selected_language`, `other_language`, `word_type`)
+            * `selected_language` - The language that will be used for the
+              answer side of the question.
+            * `other_language` - The opposite language (used in the
+              question text).
+            * `word_type` - `"keys"` if the selected language is
+              the learning language, otherwise `"values"`.
+        """
+        # Randomly choose either the learning or spoken language, unless the caller chose.
+        if word_type is None:
+            selected_type = "keys" if rng.random() < 0.5 else "values"
+        else:
+            selected_type = word_type
+
+        # Determine which side of the vocab dict we’ll pull words from.
+        if selected_type == "keys":          # learning language chosen
+            selected = deck.learning
+            other_language = deck.spoken     # spoken language
+        else:                                 # spoken language chosen
+            selected = deck.spoken
+            other_language = deck.learning   # learning language
+
+        return selected, other_language, selected_type
+
+    # Helper: Build the human‑readable question string.
+    def formulate_question(
+        language: str,
+        word: str,
+        lang_info: str
+    ) -> str:
+        """
+        Create a question based on the supplied language, word, and context.
+
+        Parameters
+        ----------
+        language : str
+            The language that the *answer* will be in (the opposite of the
+            language shown in the question).
+        word : str
+            The word to be queried.
+        lang_info : str
+            Either `"learning"` (the user is learning this language) or
+            `"spoken"` (the user already speaks this language). Determines
+            the phrasing of the question.
+
+        Returns
+        -------
+        str
+            The formatted question.
+        """
+        if lang_info == "learning":
+            # Asking for the meaning of a word in the language being learned.
+            return f"What does '{word}' mean in {language}?"
+        else:
+            # Asking for the translation of a known word into the learning language.
+            return f"What is '{word}' in {language}?"
+
+    # Main flow: pick language, fetch a random word, build the question.
+    if word_type not in (None, "keys", "values"):
+        raise ValueError("parameter 'word_type' must be 'keys' or 'values'")
+    selected_lang, other_lang, word_type = get_language()
+
+    # Pull the appropriate side of the vocab mapping (keys vs. values).
+    if word_type == "keys":
+        # Keys correspond to words in the learning language.
+        word_list = deck.keys
+    else:
+        # Values correspond to words in the spoken language.
+        word_list = deck.values
+
+    if not word_list:
+        raise VocabFileError("vocabulary file has no words.")
+
+    # Randomly select a word from the chosen side, unless the caller chose.
+    word = rng.choice(word_list) if index is None else word_list[index]
+
+    # Translate the internal `word_type` into a human‑readable label.
+    lang_info = "learning" if word_type == "keys" else "spoken"
+
+    # Assemble the final question string.
+    question = formulate_question(other_lang, word, lang_info)
+
+    # Return everything the caller needs to present the quiz item.
+    return question, word, word_type
+
+def check_answer(
+    question_word: str,
+    user_input: str,
+    deck: "Deck | CompiledDeck | str",
+    question_word_location: str,
+    match: str = "exact",
+) -> Tuple[bool, str|None]:
+    """
+    Verify whether the user's answer matches the expected translation.
+
+    The function looks up the cached vocabulary deck, determines where the
+    `question_word` lives (as a key or a value), retrieves the correct
+    answer, and compares it to the supplied `user_input`.
+
+    Parameters
+    ----------
+    question_word : str
+        The word that appeared in the generated question (either a key or a value
+        depending on `question_word_location`).
+    user_input : str
+        The answer supplied by the user.
+    deck : Deck | CompiledDeck | str
+        The loaded deck, or the path to the JSON file that contains the
+        `words` mapping (looked up in `deck_cache`).
+    question_word_location : str
+        Either `"keys"` if `question_word` is a key in the vocab dict,
+        or `"values"` if it is a value. Anything else raises `ValueError`.
+    match : str, optional
+        How forgiving the comparison is, one of `MATCH_LEVELS`: `"exact"`
+        (the default), `"casefold"` (ignores case and extra whitespace),
+        `"accents"` (also ignores accents) or `"typo"` (also forgives a
+        few typos, see `allowed_typos`).
+
+    Returns
+    -------
+    Tuple[bool, str]
+        `(is_correct, correct_answer)` where:
+        * `is_correct` - `True` if `user_input` matches one of the
+          expected answers, `False` otherwise.
+        * `correct_answer` - The answer that should have been provided.
+          If the user was correct this is the answer they matched, spelt
+          as in the deck; otherwise, when a word has several answers (or
+          several learning words share the same translation), all of them
+          are listed, separated by `ANSWER_SEPARATOR`.
+
+    Raises
+    ------
+    VocabFileError
+        If the JSON structure is malformed or the expected word cannot be
+        located in the vocabulary mapping.
+    ValueError
+        If `question_word_location` is not `"keys"` nor `"values"`,
+        or `match` is not one of `MATCH_LEVELS`.
+    """
+    # Guard against accidental misuse.
+    if question_word_location not in ("keys", "values"):
+        raise ValueError(
+            "parameter 'question_word_location' must be 'keys' or 'values'"
+        )
+    if match not in MATCH_LEVELS:
+        raise ValueError(f"parameter 'match' must be one of {', '.join(MATCH_LEVELS)}")
+
+    # Look the user's input up in the deck's set of accepted answers (normalised for `match`).
+    deck = get_deck(deck)
+    answer = deck.accepted_answer(question_word, question_word_location, user_input, match)
+    if answer is not None:
+        return True, answer
+
+    # Wrong, so list every accepted answer.
+    try:
+        answers = deck.answers(question_word, question_word_location)
+    except KeyError as exc:
+        # `question_word` wasn’t found where we expected it.
+        raise VocabFileError("answer not in vocab file.") from exc
+
+    if match == "typo":
+        # The deck's answers were normalised when the level was first used; only the input is normalised here.
+        normalised_input = normalise_answer(user_input, match)
+        if normalised_input:
+            normalised = deck.normalised_answers(question_word, question_word_location, match)
+            for answer, normalised_answer in zip(answers, normalised):
+                if within_edit_distance(normalised_input, normalised_answer, allowed_typos(normalised_answer)):
+                    return True, answer
+
+    return False, ANSWER_SEPARATOR.join(answers)
+
+# ------------------------- Question strategies -------------------------
+
+# Seconds in a day, for review intervals
+SECONDS_PER_DAY = 86400
+# How long to wait before asking a forgotten word again, in seconds
+RELEARN_DELAY = 60
+# Review state is saved after this many answers, as well as on exit
+SRS_SAVE_EVERY = 25
+REVIEW_STATE_SUFFIX = ".srs"
+
+def get_review_state_path(json_path: str) -> str:
+    """
+    Return the path of the spaced-repetition state that belongs to a vocabulary JSON file. \n
+    :param json_path: The path of the vocabulary JSON file
+    :type json_path: str
+    :return: The same path with the `.json` (or `.json.gz`, `.json.xz`) extension replaced by `REVIEW_STATE_SUFFIX`
+    :rtype: str
+    """
+    return split_deck_suffix(json_path)[0] + REVIEW_STATE_SUFFIX
+
+class ShuffleBag:
+    """
+    Hand out the indices `0` to `size - 1` in a random order, each once per pass.
+
+    The order is shuffled as it is handed out (one Fisher-Yates step per
+    index), so each index costs O(1) and allocates nothing, and there is no
+    pause at the start of a pass. The last index of one pass is never the
+    first of the next, so no word is asked twice in a row.
+    """
+
+    def __init__(self, size: int, rng: random.Random) -> None:
+        """
+        :param size: The number of indices
+        :type size: int
+        :param rng: The random number generator to use
+        :type rng: random.Random
+        """
+        self.rng = rng
+        self.indices = array("I", range(size))
+        # Indices before this position have been handed out in this pass.
+        self.position = 0
+        self.passes = 0
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def next(self) -> int | None:
+        """ Return the next index, or None if the bag is empty. """
+        size = len(self.indices)
+        if not size:
+            return None
+        if self.position == size:
+            self.position = 0
+            self.passes += 1
+
+        indices = self.indices
+        position = self.position
+        if position == 0 and self.passes and size > 1:
+            # The previous pass ended with `indices[size - 1]`; don't start with it again.
+            swap = self.rng.randrange(size - 1)
+        else:
+            swap = self.rng.randrange(position, size)
+        indices[position], indices[swap] = indices[swap], indices[position]
+        self.position = position + 1
+        return indices[position]
+
+class RandomStrategy:
+    """
+    Ask about every word once, in a random order and direction, before asking any word again.
+
+    This is the default question strategy. Every strategy offers the same
+    three methods, which `main.ask_question` calls:
+
+    * `next_question()` returns `(deck, question, word, word_type)`.
+    * `record(word, word_type, is_correct, user_answer)` is told the result.
+    * `close()` is called once when the session ends.
+    """
+
+    def __init__(self, json_path: str, rng: random.Random | None = None) -> None:
+        """
+        :param json_path: The path of the vocabulary JSON file to ask about. \
+            `json_path` is always the file that the last question came from
+        :type json_path: str
+        :param rng: The random number generator to use. Defaults to a new, unseeded one
+        :type rng: random.Random | None
+        """
+        self.json_path = json_path
+        self.rng = rng if rng is not None else random.Random()
+        self._bag: ShuffleBag | None = None
+        self._bag_deck: "Deck | CompiledDeck | None" = None
+
+    def next_question(self) -> Tuple["Deck | CompiledDeck", str, str, str]:
+        """
+        Pick the next question.
+
+        Returns
+        -------
+        Tuple[Deck | CompiledDeck, str, str, str]
+            The deck the question comes from, followed by the values
+            returned by `get_question`.
+        """
+        deck = deck_cache.get(self.json_path)
+        # Start a new bag when the deck was (re)loaded, as its entries may have changed.
+        if deck is not self._bag_deck:
+            self._bag = ShuffleBag(len(deck), self.rng)
+            self._bag_deck = deck
+        return (deck, *get_question(deck, self._bag.next(), rng=self.rng))  # type: ignore
+
+    def record(self, word: str, word_type: str, is_correct: bool, user_answer: str = "") -> None:
+        """
+        Take note of the result of a question. Random questions do not depend on earlier results.
+
+        :param word: The word that appeared in the question
+        :param word_type: `"keys"` or `"values"`, as returned by `get_question`
+        :param is_correct: Whether the answer was accepted
+        :param user_answer: The answer given by the user
+        """
+        pass
+
+    def close(self) -> None:
+        """ Save any state when the session ends. """
+        pass
+
+class SpacedRepetitionStrategy(RandomStrategy):
+    """
+    Ask about the words that are due for review, using the SM-2 algorithm.
+
+    Each word (card) has an interval and an ease factor. A correct answer
+    pushes the next review further into the future; a wrong answer brings the
+    word back after `RELEARN_DELAY` seconds. Cards waiting for review are kept
+    in a heap ordered by due time, so picking the next card is O(log n).
+    Words that were never reviewed are introduced in file order whenever no
+    review is due. Once every word has been introduced, the earliest upcoming
+    review is asked early; a correct early answer keeps the card's schedule.
+
+    The review state is stored next to the vocabulary file (see
+    `get_review_state_path`) and only loaded when the first question is asked.
+    """
+
+    def __init__(self, json_path: str, rng: random.Random | None = None) -> None:
+        super().__init__(json_path, rng)
+        self.state_path = get_review_state_path(json_path)
+        # learning word -> [due, interval in days, ease, repetitions, lapses]
+        self._cards: Dict[str, list] | None = None
+        self._deck: "Deck | CompiledDeck | None" = None
+        # (due, entry index) of each reviewed card that is not being asked right now.
+        # Entries whose due time no longer matches `_scheduled` are stale and skipped.
+        self._heap: list = []
+        # entry index -> due time of its live heap entry
+        self._scheduled: Dict[int, float] = {}
+        # Next entry to check for a word that has never been reviewed
+        self._new_position = 0
+        # (question word, word_type) -> entry indices of questions waiting for an answer, oldest
+        # first. The same card can be asked again before it is answered (for example with `--prefetch`).
+        self._asked: Dict[Tuple[str, str], deque] = {}
+        self._unsaved = 0
+
+    def _load_state(self) -> Dict[str, list]:
+        """ Read the review state, or start afresh if there is none or it is unreadable. """
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return dict(json.load(f)["cards"])
+        except Exception:
+            return {}
+
+    def _prepare(self, deck: "Deck | CompiledDeck") -> None:
+        """ Load the review state lazily and rebuild the heap when the deck was (re)loaded. """
+        if self._cards is None:
+            self._cards = self._load_state()
+        if deck is self._deck:
+            return
+
+        self._deck = deck
+        self._heap = []
+        self._scheduled = {}
+        self._new_position = 0
+        self._asked.clear()
+        if self._cards:
+            for index, word in enumerate(deck.keys):
+                card = self._cards.get(word)
+                if card is not None:
+                    self._heap.append((card[0], index))
+                    self._scheduled[index] = card[0]
+            heapq.heapify(self._heap)
+
+    def _pop_scheduled(self, now: float | None = None) -> int | None:
+        """ Remove and return the card with the earliest review, if it is due by `now` (any time if None). """
+        while self._heap:
+            due, index = self._heap[0]
+            if self._scheduled.get(index) != due:
+                # Replaced by a later `record` or taken by the random fallback
+                heapq.heappop(self._heap)
+                continue
+            if now is not None and due > now:
+                return None
+            heapq.heappop(self._heap)
+            del self._scheduled[index]
+            return index
+        return None
+
+    def _next_new_index(self, deck: "Deck | CompiledDeck") -> int | None:
+        """ Return the next entry that has never been reviewed, or None if there are none left. """
+        keys = deck.keys
+        while self._new_position < len(keys):
+            index = self._new_position
+            self._new_position += 1
+            if keys[index] not in self._cards:
+                return index
+        return None
+
+    def next_question(self) -> Tuple["Deck | CompiledDeck", str, str, str]:
+        deck = deck_cache.get(self.json_path)
+        self._prepare(deck)
+
+        # Due reviews come first, then new words, then the earliest upcoming review.
+        index = self._pop_scheduled(time.time())
+        if index is None:
+            index = self._next_new_index(deck)
+        if index is None:
+            index = self._pop_scheduled()
+
+        # Every card is waiting for an answer already; fall back to a random one.
+        if index is None and len(deck):
+            index = self.rng.randrange(len(deck))
+            # Its review, if it has one, is replaced by the one `record` schedules.
+            self._scheduled.pop(index, None)
+
+        question, word, word_type = get_question(deck, index, rng=self.rng)
+        self._asked.setdefault((word, word_type), deque()).append(index)
+        return deck, question, word, word_type
+
+    def record(self, word: str, word_type: str, is_correct: bool, user_answer: str = "") -> None:
+        pending = self._asked.get((word, word_type))
+        if not pending or self._deck is None or self._cards is None:
+            return
+        # Questions are answered in the order they were asked.
+        index = pending.popleft()
+        if not pending:
+            del self._asked[(word, word_type)]
+
+        key = self._deck.keys[index]
+        due, interval, ease, repetitions, lapses = self._cards.get(key, [0.0, 0.0, 2.5, 0, 0])
+
+        # SM-2 quality: 4 for a correct answer, 1 for a wrong one, 0 for no answer.
+        quality = 4 if is_correct else (1 if user_answer else 0)
+        now = time.time()
+        if quality < 3:
+            interval = 0.0
+            repetitions = 0
+            lapses += 1
+            due = now + RELEARN_DELAY
+        elif due <= now:
+            if repetitions == 0:
+                interval = 1.0
+            elif repetitions == 1:
+                interval = 6.0
+            else:
+                interval = round(interval * ease, 2)
+            repetitions += 1
+            due = now + interval * SECONDS_PER_DAY
+        # A correct answer before the card was due (asked early because nothing else was
+        # left) says nothing about the interval, so the card keeps its review.
+        ease = max(1.3, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+        self._cards[key] = [due, interval, round(ease, 3), repetitions, lapses]
+        heapq.heappush(self._heap, (due, index))
+        self._scheduled[index] = due
+
+        self._unsaved += 1
+        if self._unsaved >= SRS_SAVE_EVERY:
+            self.save()
+
+    def save(self) -> None:
+        """ Write the review state atomically. """
+        if self._cards is None or not self._unsaved:
+            return
+
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "cards": self._cards}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+            self._unsaved = 0
+        except OSError as e:
+            get_renderer().write(f"Could not save review progress: {e}", "warning")
+
+    def close(self) -> None:
+        self.save()
+
+# The question strategies that can be chosen with `--strategy`
+QUESTION_STRATEGIES = {
+    "random": RandomStrategy,
+    "srs": SpacedRepetitionStrategy,
+}
+
+class AliasTable:
+    """
+    Pick random indices with given weights in O(1) time, using Vose's alias method.
+
+    Building the table takes O(n). Each sample then needs one random index
+    and one random number, however many weights there are.
+    """
+
+    def __init__(self, weights: list) -> None:
+        """
+        :param weights: The non-negative weight of each index. At least one must be positive
+        :type weights: list
+        :raises ValueError: If no weight is positive, or a weight is negative
+        """
+        count = len(weights)
+        total = float(sum(weights))
+        if total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("weights must be non-negative and not all zero")
+
+        # Scale so the average weight is 1, then pair each small weight with a large one.
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # Whatever is left is 1 up to rounding errors.
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def sample(self, rng: random.Random) -> int:
+        """ Return a random index, chosen in proportion to its weight. """
+        i = rng.randrange(len(self.probability))
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+class MultiDeckStrategy(RandomStrategy):
+    """
+    Ask about several vocabulary files in one session.
+
+    Each file keeps its own strategy (and so its own review state), and each
+    question is graded against the deck it came from. The deck for each
+    question is picked with an `AliasTable`, in proportion to its weight.
+    """
+
+    def __init__(
+        self,
+        json_paths: list,
+        strategy: type = RandomStrategy,
+        rng: random.Random | None = None,
+        weights: list | None = None,
+    ) -> None:
+        """
+        :param json_paths: The paths of the vocabulary JSON files to ask about
+        :type json_paths: list
+        :param strategy: The strategy class to use for each file
+        :type strategy: type
+        :param rng: The random number generator to use. Defaults to a new, unseeded one
+        :type rng: random.Random | None
+        :param weights: The weight of each file. Defaults to its number of words
+        :type weights: list | None
+        :raises VocabFileError: If every file is empty or has a weight of 0
+        """
+        super().__init__(json_paths[0], rng)
+        self.json_paths = list(json_paths)
+        self.strategies = [strategy(path, self.rng) for path in self.json_paths]
+        if weights is None:
+            weights = [len(deck_cache.get(path)) for path in self.json_paths]
+        try:
+            self.table = AliasTable(weights)
+        except ValueError:
+            raise VocabFileError("the chosen vocabulary files have no words.") from None
+        # (question word, word_type) -> strategies that asked it, oldest first, for questions waiting
+        # for an answer. Several decks can share a word, and `--prefetch` asks before answers come in.
+        self._asked: Dict[Tuple[str, str], deque] = {}
+
+    def next_question(self) -> Tuple["Deck | CompiledDeck", str, str, str]:
+        strategy = self.strategies[self.table.sample(self.rng)]
+        deck, question, word, word_type = strategy.next_question()
+        self.json_path = strategy.json_path
+        self._asked.setdefault((word, word_type), deque()).append(strategy)
+        return deck, question, word, word_type
+
+    def record(self, word: str, word_type: str, is_correct: bool, user_answer: str = "") -> None:
+        pending = self._asked.get((word, word_type))
+        if not pending:
+            return
+        # Questions are answered in the order they were asked.
+        strategy = pending.popleft()
+        if not pending:
+            del self._asked[(word, word_type)]
+        strategy.record(word, word_type, is_correct, user_answer)
+
+    def close(self) -> None:
+        for strategy in self.strategies:
+            strategy.close()
+
+def make_strategy(json_paths: list, strategy_name: str = "random", rng: random.Random | None = None,
+                  weights: list | None = None) -> RandomStrategy:
+    """
+    Create the question strategy for one or more vocabulary files.
+
+    :param json_paths: The paths of the vocabulary JSON files to ask about
+    :type json_paths: list
+    :param strategy_name: A key of `QUESTION_STRATEGIES`
+    :type strategy_name: str
+    :param rng: The random number generator to use
+    :type rng: random.Random | None
+    :param weights: The weight of each file (see `MultiDeckStrategy`)
+    :type weights: list | None
+    :return: The strategy
+    :rtype: RandomStrategy
+    """
+    if len(json_paths) == 1:
+        return QUESTION_STRATEGIES[strategy_name](json_paths[0], rng)
+    return MultiDeckStrategy(json_paths, QUESTION_STRATEGIES[strategy_name], rng, weights)
+
+# How many questions the interactive quiz prepares ahead, see `--prefetch`
+PREFETCH_DEPTH = 2
+
+class QuestionPrefetcher:
+    """
+    Prepare the next questions on a worker thread while the user is answering.
+
+    The worker asks the wrapped strategy for questions, which includes
+    checking whether the vocabulary files changed (see `DeckCache`) and
+    formatting the question, and keeps up to `depth` of them ready in a
+    queue. The prefetcher offers the same methods as the strategies, so
+    `main.ask_question` does not need to know about it.
+
+    Every call into the wrapped strategy holds `lock`, so the strategy (and
+    the deck cache it reads) is never used by both threads at once. The
+    questions are still asked and recorded in order, but a question is
+    chosen up to `depth` answers early; spaced repetition may therefore
+    bring back a missed word a few questions later than it would otherwise.
+    """
+
+    def __init__(self, strategy: RandomStrategy, depth: int = PREFETCH_DEPTH) -> None:
+        """
+        :param strategy: The strategy to prepare questions from
+        :type strategy: RandomStrategy
+        :param depth: The number of questions to keep ready. Must be at least 1
+        :type depth: int
+        """
+        import threading
+        import queue
+
+        self.strategy = strategy
+        # `json_path` is always the file that the last question came from, as for the strategies.
+        self.json_path = strategy.json_path
+        self.lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, depth))
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._prepare, name="vocabularyplus-prefetch", daemon=True)
+        self._thread.start()
+
+    def _prepare(self) -> None:
+        """ Fill the queue with questions until closed. An error is queued in place of a question, then the worker stops. """
+        profiler = get_profiler()
+        while not self._closed.is_set():
+            try:
+                with self.lock, profiler.stage("prefetch"):
+                    prepared = (self.strategy.next_question(), self.strategy.json_path)
+            except Exception as e:
+                prepared = e
+            # Blocks while the queue is full; `close` empties it to let the worker finish.
+            self._queue.put(prepared)
+            if isinstance(prepared, Exception):
+                return
+
+    def next_question(self) -> Tuple["Deck | CompiledDeck", str, str, str]:
+        """
+        Return the next prepared question, waiting for it if the worker is behind.
+
+        :raises Exception: Whatever the strategy raised while preparing it
+        """
+        prepared = self._queue.get()
+        if isinstance(prepared, Exception):
+            # Keep the error queued, so asking again raises it again.
+            self._queue.put(prepared)
+            raise prepared
+        question, self.json_path = prepared
+        return question
+
+    def record(self, word: str, word_type: str, is_correct: bool, user_answer: str = "") -> None:
+        with self.lock:
+            self.strategy.record(word, word_type, is_correct, user_answer)
+
+    def close(self) -> None:
+        """ Stop the worker, then close the strategy. Prepared questions that were never asked are dropped. """
+        import queue
+
+        self._closed.set()
+        while self._thread.is_alive():
+            # Make room, in case the worker is waiting to add a question.
+            try:
+                while True:
+                    self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._thread.join(0.05)
+        with self.lock:
+            self.strategy.close()
+
+# ----------------------------- Review log ------------------------------
+
+REVIEW_LOG_PATH = os.path.join(JSON_DIR, ".reviews.jsonl")
+# Buffered records are written once there are this many of them...
+REVIEW_LOG_BATCH_SIZE = 32
+# ...or once this many seconds have passed since the last write
+REVIEW_LOG_FLUSH_INTERVAL = 30.0
+# The log is rotated when it grows past this size, keeping this many old logs
+REVIEW_LOG_MAX_BYTES = 8 * 1024 * 1024
+REVIEW_LOG_BACKUPS = 3
+
+class ReviewLog:
+    """
+    An append-only log of every answered question, stored as JSON lines.
+
+    Records are buffered and written in batches with a single `os.write` and
+    `os.fsync`, rather than syncing after every answer. The file is only ever
+    appended to, and rotation is an atomic rename, so an interruption (even a
+    Ctrl+C in the middle of a write) can at worst cut the last line short;
+    earlier records are never touched. `iter_review_log` skips such a line.
+    """
+
+    def __init__(
+        self,
+        path: str = REVIEW_LOG_PATH,
+        batch_size: int = REVIEW_LOG_BATCH_SIZE,
+        flush_interval: float = REVIEW_LOG_FLUSH_INTERVAL,
+        max_bytes: int = REVIEW_LOG_MAX_BYTES,
+        backups: int = REVIEW_LOG_BACKUPS,
+    ) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._buffer: list = []
+        self._last_flush = time.monotonic()
+        # None until the end of the existing file has been checked for a cut-off line
+        self._needs_newline: bool | None = None
+
+    def record(self, deck: str, word: str, direction: str, result: str) -> None:
+        """
+        Add a record for one answered question.
+
+        Parameters
+        ----------
+        deck : str
+            The vocabulary file the question came from.
+        word : str
+            The word that appeared in the question.
+        direction : str
+            `"keys"` if the word was in the learning language, or `"values"`
+            if it was in the spoken language (as returned by `get_question`).
+        result : str
+            `"correct"`, `"incorrect"` or `"not answered"`.
+        """
+        self._buffer.append(json.dumps({
+            "time": round(time.time(), 3),
+            "deck": deck,
+            "word": word,
+            "direction": direction,
+            "result": result,
+        }, ensure_ascii=False))
+
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _ends_with_newline(self) -> bool:
+        """ Check whether the log is empty or its last line is complete. """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b"\n"
+        except OSError:
+            return True
+
+    def flush(self) -> None:
+        """ Append the buffered records to the log in one write, then sync it to disk. """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        if self._needs_newline is None:
+            self._needs_newline = not self._ends_with_newline()
+        # Start on a fresh line if an earlier write was cut short.
+        data = ("\n" if self._needs_newline else "") + "\n".join(self._buffer) + "\n"
+        data = data.encode("utf-8")
+
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            self._needs_newline = True
+            written = 0
+            while written < len(data):
+                written += os.write(fd, data[written:])
+            os.fsync(fd)
+            self._needs_newline = False
+            self._buffer.clear()
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+        if size >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self) -> None:
+        """ Move the log to `<path>.1`, shifting older logs along and dropping the oldest. """
+        for number in range(self.backups - 1, 0, -1):
+            try:
+                os.replace(f"{self.path}.{number}", f"{self.path}.{number + 1}")
+            except FileNotFoundError:
+                pass
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._needs_newline = False
+
+    def close(self) -> None:
+        """ Write any buffered records. """
+        self.flush()
+
+def iter_review_log(path: str = REVIEW_LOG_PATH, backups: int = REVIEW_LOG_BACKUPS):
+    """
+    Yield the records of a review log, oldest first, including rotated logs.
+
+    Lines that cannot be read (such as a line cut short by a crash) are skipped.
+
+    :param path: The path of the review log
+    :type path: str
+    :param backups: The number of rotated logs to read as well
+    :type backups: int
+    """
+    for log_path in [f"{path}.{number}" for number in range(backups, 0, -1)] + [path]:
+        try:
+            f = open(log_path, encoding="utf-8", errors="replace")
+        except FileNotFoundError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+def resolve_deck_path(name: str) -> str:
+    """
+    Find a vocabulary file given on the command line.
+
+    :param name: A path, or the name of a file in `JSON_DIR` with or without its extension (`.json`, `.json.gz` or `.json.xz`)
+    :type name: str
+    :return: The absolute path of the vocabulary file
+    :rtype: str
+    :raises FileNotFoundError: If no such vocabulary file exists
+    """
+    candidates = [name, os.path.join(JSON_DIR, name)]
+    if not is_deck_filename(name):
+        candidates += [os.path.join(JSON_DIR, f"{name}{suffix}") for suffix in DECK_SUFFIXES]
+
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return os.path.abspath(candidate)
+
+    raise FileNotFoundError(f"vocabulary file {name!r} not found")
+
+def select_decks(patterns: list, language_pairs: list | None = None) -> list:
+    """
+    Find the vocabulary files chosen on the command line.
+
+    :param patterns: Vocabulary files (see `resolve_deck_path`) or glob patterns, such as `french*`, matched against the files in `JSON_DIR`
+    :type patterns: list
+    :param language_pairs: Language pairs such as `French-English`, or just a learning language such as `French`. \
+        Every file in `JSON_DIR` with a matching pair is chosen. Case is ignored
+    :type language_pairs: list | None
+    :return: The absolute paths of the chosen files, without duplicates, in the order they were given
+    :rtype: list
+    :raises FileNotFoundError: If a pattern or language pair matches no vocabulary file
+    """
+    paths: list = []
+    def add(path: str) -> None:
+        path = os.path.abspath(path)
+        if path not in paths:
+            paths.append(path)
+
+    catalog = None
+    for pattern in patterns:
+        if not any(c in pattern for c in "*?["):
+            add(resolve_deck_path(pattern))
+            continue
+
+        catalog = catalog or get_catalog()
+        matches = [name for name in catalog.filenames() if fnmatch.fnmatch(name.casefold(), pattern.casefold())
+                   or fnmatch.fnmatch(split_deck_suffix(name)[0].casefold(), pattern.casefold())]
+        if not matches:
+            raise FileNotFoundError(f"no vocabulary files match {pattern!r}")
+        for name in matches:
+            add(os.path.join(JSON_DIR, name))
+
+    for pair in language_pairs or []:
+        learning, _, spoken = pair.casefold().partition("-")
+        catalog = catalog or get_catalog()
+        matches = [
+            name for name in catalog.filenames()
+            if "error" not in catalog.entries.get(name, {"error": ""})
+            and catalog.entries[name]["learning"].casefold() == learning.strip()
+            and (not spoken or catalog.entries[name]["spoken"].casefold() == spoken.strip())
+        ]
+        if not matches:
+            raise FileNotFoundError(f"no vocabulary files are for {pair!r}")
+        for name in matches:
+            add(os.path.join(JSON_DIR, name))
+
+    return paths
+
+def parse_weights(json_paths: list, weights: list | None) -> list | None:
+    """
+    Turn `--weight DECK=N` options into one weight per vocabulary file.
+
+    :param json_paths: The chosen vocabulary files
+    :type json_paths: list
+    :param weights: The `DECK=N` options, where `DECK` is a file name with or without its extension
+    :type weights: list | None
+    :return: The weight of each file (1 for files without a weight), or None to weight files by their number of words
+    :rtype: list | None
+    :raises ValueError: If an option is malformed or names a file that was not chosen
+    """
+    if not weights:
+        return None
+
+    names = [os.path.basename(path).casefold() for path in json_paths]
+    stems = [split_deck_suffix(name)[0] for name in names]
+    result = [1.0] * len(json_paths)
+    for option in weights:
+        name, _, value = option.rpartition("=")
+        try:
+            weight = float(value)
+        except ValueError:
+            weight = -1.0
+        if not name or weight < 0:
+            raise ValueError(f"invalid weight {option!r}: expected DECK=N, with N a number of 0 or more")
+
+        name = name.casefold()
+        for candidates in (names, stems):
+            if name in candidates:
+                result[candidates.index(name)] = weight
+                break
+        else:
+            raise ValueError(f"--weight names {option.rpartition('=')[0]!r}, which is not one of the chosen vocabulary files")
+
+    return result
+
+def run_headless(deck_names: list, answers_file: str = "-", seed: int | None = None,
+                 strategy_name: str = "random", count: int | None = None, match: str = "exact",
+                 language_pairs: list | None = None, weights: list | None = None) -> int:
+    """
+    Run a quiz without a terminal, for automated grading and throughput measurements.
+
+    Answers are read one per line from `answers_file`, with no pauses or
+    cursor movement. One JSON object is written to stdout per question, and a
+    summary with the number of questions per second is written to stderr.
+    The quiz stops when the answers run out or after `count` questions.
+
+    Parameters
+    ----------
+    deck_names : list
+        The vocabulary files or glob patterns (see `select_decks`).
+    answers_file : str
+        The file to read answers from, or `-` for stdin.
+    seed : int | None
+        Seed for the random number generator, for repeatable runs.
+    strategy_name : str
+        The question strategy (a key of `QUESTION_STRATEGIES`).
+    count : int | None
+        The maximum number of questions to ask.
+    match : str
+        How forgiving answer checking is (one of `MATCH_LEVELS`).
+    language_pairs : list | None
+        Language pairs to choose vocabulary files by (see `select_decks`).
+    weights : list | None
+        `DECK=N` weights for the chosen files (see `parse_weights`).
+
+    Returns
+    -------
+    int
+        The exit code: 0 on success, otherwise 1.
+    """
+    try:
+        json_paths = select_decks(deck_names, language_pairs)
+        answers = sys.stdin if answers_file == "-" else open(answers_file, encoding="utf-8")
+    except (OSError, ValueError, VocabFileError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    try:
+        strategy = make_strategy(json_paths, strategy_name, random.Random(seed), parse_weights(json_paths, weights))
+    except (OSError, ValueError, VocabFileError) as e:
+        answers.close()
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    stats = SessionStats(history_limit=0)
+    write = sys.stdout.write
+    start = time.perf_counter()
+
+    try:
+        with answers:
+            for line in answers:
+                if count is not None and stats.total >= count:
+                    break
+                user_answer = line.rstrip("\r\n")
+
+                deck, question_text, question_word, word_location = strategy.next_question()
+                is_correct, correct_answer = check_answer(question_word, user_answer, deck, word_location, match)
+                stats.record(user_answer, correct_answer, is_correct)
+                strategy.record(question_word, word_location, is_correct, user_answer)
+
+                write(json.dumps({
+                    "number": stats.total,
+                    "deck": os.path.basename(strategy.json_path),
+                    "question": question_text,
+                    "word": question_word,
+                    "direction": word_location,
+                    "answer": user_answer,
+                    "correct": is_correct,
+                    "expected": correct_answer,
+                }, ensure_ascii=False) + "\n")
+    except (VocabFileError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        strategy.close()
+        sys.stdout.flush()
+
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "questions": stats.total,
+        "correct": stats.correct,
+        "incorrect": stats.incorrect,
+        "not_answered": stats.not_answered,
+        "seconds": round(elapsed, 6),
+        "questions_per_second": round(stats.total / elapsed, 1) if elapsed > 0 else None,
+    }), file=sys.stderr)
+    return 0
+
+# ---------------------------- Command line -----------------------------
+
+# The defaults below are shown in `--help`, so they are kept here instead of in
+# the modules that implement each command, which are only imported when it runs.
+
+# Profiling is switched on with `--profile [FILE]` or this environment variable
+PROFILE_ENV = "VOCABPLUS_PROFILE"
+PROFILE_DEFAULT_PATH = "vocabularyplus-profile.json"
+# The storage formats `compress_decks` can write, and their extensions. "json" decompresses.
+COMPRESS_FORMATS = {"gz": ".json.gz", "xz": ".json.xz", "json": ".json"}
+# Chosen with `benchmark.py`: gzip loads nearly as fast as plain JSON
+DEFAULT_COMPRESS_FORMAT = "gz"
+# What to do when a learning word has different translations, for `merge` and `split`
+CONFLICT_POLICIES = ("first", "last", "error")
+# `lookup --prefix` shows at most this many words unless told otherwise
+LOOKUP_DEFAULT_LIMIT = 50
+# Where `serve` listens and `client` connects
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+
+def build_parser() -> argparse.ArgumentParser:
+    """ Return the command-line argument parser for Vocabulary Plus. """
+    parser = argparse.ArgumentParser(
+        prog="vocabularyplus",
+        description="A CLI foreign vocabulary learning tool.",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=sorted(QUESTION_STRATEGIES),
+        default="random",
+        help="how questions are chosen: 'random' (default) or 'srs' for spaced repetition",
+    )
+    parser.add_argument(
+        "--match",
+        choices=MATCH_LEVELS,
+        default="exact",
+        help="how forgiving answer checking is: 'exact' (default), 'casefold' (ignore case and spaces), "
+             "'accents' (also ignore accents) or 'typo' (also forgive small typos)",
+    )
+    decks = parser.add_argument_group("choosing vocabulary files", "Skip the list of vocabulary files and quiz on the files given here.")
+    decks.add_argument(
+        "--deck",
+        action="append",
+        default=[],
+        metavar="DECK",
+        help="a vocabulary file, or a glob pattern such as 'french*'; can be given more than once",
+    )
+    decks.add_argument(
+        "--languages",
+        action="append",
+        default=[],
+        metavar="PAIR",
+        help="every vocabulary file for a language pair such as 'French-English', or a learning language such as 'French'",
+    )
+    decks.add_argument(
+        "--weight",
+        action="append",
+        default=[],
+        metavar="DECK=N",
+        help="how often to ask about a file, relative to the others (1 if not given); "
+             "without --weight, files are weighted by their number of words",
+    )
+    parser.add_argument(
+        "--output",
+        choices=sorted(RENDERERS),
+        default="ansi",
+        help="how to show the quiz: 'ansi' (coloured, the default), 'plain' text, or 'jsonl' for other programs",
+    )
+    parser.add_argument(
+        "--no-review-log",
+        dest="review_log",
+        action="store_false",
+        help="do not record answers in the review log",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=PREFETCH_DEPTH,
+        metavar="N",
+        help=f"prepare the next N questions in the background while you answer; 0 turns this off (default: {PREFETCH_DEPTH})",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_DEFAULT_PATH,
+        metavar="FILE",
+        help=f"time each stage of start-up and of every question, and write the results to FILE on exit "
+             f"(default: {PROFILE_DEFAULT_PATH}; '.prom' or '.txt' files use the Prometheus text format). "
+             f"Setting {PROFILE_ENV} to a file name (or 1) does the same",
+    )
+    headless = parser.add_argument_group("headless mode")
+    headless.add_argument(
+        "--headless",
+        action="store_true",
+        help="run without a terminal: read answers from a file and write one JSON result per question",
+    )
+    headless.add_argument(
+        "--answers",
+        default="-",
+        metavar="FILE",
+        help="the file to read answers from, one per line (default: stdin)",
+    )
+    headless.add_argument("--seed", type=int, help="seed for the random number generator")
+    headless.add_argument("--count", type=int, help="stop after this many questions")
+    subparsers = parser.add_subparsers(dest="command")
+
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="compile vocabulary files for fast loading of very large decks",
+    )
+    compile_parser.add_argument(
+        "files",
+        nargs="*",
+        help="the vocabulary files to compile (default: every file in the JSON directory)",
+    )
+
+    check_parser = subparsers.add_parser(
+        "check",
+        help="check vocabulary files for problems; exits with 1 if any file has errors",
+    )
+    check_parser.add_argument(
+        "files",
+        nargs="*",
+        help="the vocabulary files to check (default: every file in the JSON directory)",
+    )
+    check_parser.add_argument("--jobs", type=int, help="the number of files to check at once (default: the number of CPUs)")
+    check_parser.add_argument("--strict", action="store_true", help="also exit with 1 if any file has warnings")
+
+    compress_parser = subparsers.add_parser(
+        "compress",
+        help="compress vocabulary files to save space (or decompress them with --format json)",
+    )
+    compress_parser.add_argument(
+        "files",
+        nargs="*",
+        help="the vocabulary files to convert (default: every file in the JSON directory)",
+    )
+    compress_parser.add_argument(
+        "--format",
+        dest="file_format",
+        choices=sorted(COMPRESS_FORMATS),
+        help=f"'gz' (.json.gz), 'xz' (.json.xz, smallest but slowest) or 'json' to decompress. "
+             f"By default, only plain files are compressed, with {DEFAULT_COMPRESS_FORMAT}",
+    )
+    compress_parser.add_argument("--level", type=int, help="the compression level, from 1 (fastest) to 9 (smallest) (default: 6)")
+    compress_parser.add_argument("--jobs", type=int, help="the number of files to convert at once (default: the number of CPUs)")
+    compress_parser.add_argument("--force", action="store_true", help="also recompress files that are already in the chosen format")
+
+    merge_parser = subparsers.add_parser(
+        "merge",
+        help="merge vocabulary files with the same languages into a new one, without repeated words",
+    )
+    merge_parser.add_argument("files", nargs="+", help="the vocabulary files or patterns (such as 'french*') to merge")
+    # Not `dest="output"`, which would hide the `--output` given before the command
+    merge_parser.add_argument("-o", "--output", dest="output_name", required=True, help="the name of the new vocabulary file")
+    merge_parser.add_argument(
+        "--on-conflict",
+        choices=CONFLICT_POLICIES,
+        default="first",
+        help="when a word has different translations, keep the 'first' (default) or 'last', or stop with an 'error'",
+    )
+    merge_parser.add_argument("--force", action="store_true", help="replace the new vocabulary file if it already exists")
+
+    split_parser = subparsers.add_parser(
+        "split",
+        help="split a vocabulary file into smaller ones, such as one per lesson",
+    )
+    split_parser.add_argument("file", help="the vocabulary file to split")
+    split_parser.add_argument("--size", type=int, required=True, help="the number of words in each new file")
+    split_parser.add_argument("--prefix", help="the name of the new files, which are numbered (default: the name of the file)")
+    split_parser.add_argument(
+        "--on-conflict",
+        choices=CONFLICT_POLICIES,
+        default="first",
+        help="when a word has different translations, keep the 'first' (default) or 'last', or stop with an 'error'",
+    )
+
+    grade_parser = subparsers.add_parser(
+        "grade",
+        help="grade a file of learners' answers against a vocabulary file, and print each learner's score",
+    )
+    grade_parser.add_argument("deck", help="the vocabulary file the questions came from")
+    grade_parser.add_argument(
+        "sheet",
+        help="the answers: a CSV or TSV file with one 'learner, word, direction, answer' row per line, "
+             "where direction is 'keys' (the word is in the language being learned) or 'values'",
+    )
+    grade_parser.add_argument("--format", dest="file_format", choices=("csv", "tsv"),
+                              help="the format of the answers (default: tsv for .tsv and .tab files, otherwise csv)")
+    grade_parser.add_argument("--jobs", type=int, help="the number of processes to grade with (default: the number of CPUs)")
+    grade_parser.add_argument("--match", choices=MATCH_LEVELS, default=argparse.SUPPRESS, help="how forgiving answer checking is")
+
+    lookup_parser = subparsers.add_parser(
+        "lookup",
+        help="find a word in every vocabulary file, in either language, and show its translations",
+    )
+    lookup_parser.add_argument("word", help="the word to find (case, extra spaces and accents are ignored)")
+    lookup_parser.add_argument("--prefix", action="store_true", help="also find every word that starts with it")
+    lookup_parser.add_argument("--limit", type=int,
+                               help=f"show at most this many words (default: {LOOKUP_DEFAULT_LIMIT} with --prefix, otherwise all)")
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="run quizzes for many learners at once over the network (see 'client')",
+    )
+    serve_parser.add_argument("--host", default=SERVER_HOST, help=f"the address to listen on (default: {SERVER_HOST})")
+    serve_parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"the port to listen on (default: {SERVER_PORT})")
+    serve_parser.add_argument("--match", choices=MATCH_LEVELS, default=argparse.SUPPRESS, help="how forgiving answer checking is")
+
+    client_parser = subparsers.add_parser(
+        "client",
+        help="take a quiz from a Vocabulary Plus server",
+    )
+    client_parser.add_argument(
+        "decks",
+        nargs="*",
+        help="the vocabulary files or patterns to use (default: choose from the server's list)",
+    )
+    client_parser.add_argument("--host", default=SERVER_HOST, help=f"the server's address (default: {SERVER_HOST})")
+    client_parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"the server's port (default: {SERVER_PORT})")
+    client_parser.add_argument(
+        "--sessions",
+        type=int,
+        help="instead of a quiz, run this many scripted sessions at once and report questions per second",
+    )
+    client_parser.add_argument(
+        "--questions",
+        type=int,
+        default=100,
+        help="questions per scripted session (default: 100)",
+    )
+
+    return parser
+
+def main(argv: list | None = None) -> None:
+    """
+    Run the interactive Vocabulary Plus session.
+
+    The function prints a brief header, lets the user select a vocabulary
+    file, and then enters an infinite loop that repeatedly asks questions
+    until the user aborts with Ctrl-C.
+
+    :param argv: The command-line arguments. Defaults to `sys.argv[1:]`
+    :type argv: list | None
+    """
+    started = time.perf_counter_ns(), sys.getallocatedblocks()
+    args = build_parser().parse_args(argv)
+
+    # Profile only when asked to, so the stages below cost next to nothing otherwise.
+    profile_path = args.profile or os.environ.get(PROFILE_ENV)
+    if profile_path:
+        profiler = enable_profiling(PROFILE_DEFAULT_PATH if profile_path == "1" else profile_path)
+    else:
+        profiler = get_profiler()
+
+    # Initialise colorama (it will translate ANSI codes on Windows automatically)
+    init(autoreset=False)
+    os.makedirs(JSON_DIR, exist_ok=True)
+
+    # All terminal output goes through the renderer chosen with `--output`.
+    renderer = set_renderer(args.output)
+
+    # ------------------------- Subcommands -----------------------------
+    # Each command's module is only imported when it runs.
+    if args.command == "compile":
+        from deck_tools import compile_decks
+        sys.exit(compile_decks(args.files))
+    if args.command == "check":
+        from deck_tools import check_decks
+        sys.exit(check_decks(args.files, args.jobs, args.strict))
+    if args.command == "compress":
+        from deck_tools import compress_decks
+        sys.exit(compress_decks(args.files, args.file_format, args.level, args.jobs, args.force))
+    if args.command == "merge":
+        from deck_tools import merge_decks
+        sys.exit(merge_decks(args.files, args.output_name, args.on_conflict, args.force))
+    if args.command == "split":
+        from deck_tools import split_deck
+        sys.exit(split_deck(args.file, args.size, args.prefix, args.on_conflict))
+    if args.command == "grade":
+        from grading import run_grading
+        sys.exit(run_grading(args.deck, args.sheet, args.match, args.jobs, args.file_format))
+    if args.command == "lookup":
+        from lookup import run_lookup
+        sys.exit(run_lookup(args.word, args.prefix, args.limit))
+    if args.command == "serve":
+        from quiz_server import run_server
+        sys.exit(run_server(args.host, args.port, args.match))
+    if args.command == "client":
+        from quiz_server import run_client, run_load_test
+        if args.sessions:
+            sys.exit(run_load_test(args.decks or ["*"], args.sessions, args.questions, args.host, args.port))
+        sys.exit(run_client(args.decks, args.host, args.port))
+
+    # --------------------------- Headless ------------------------------
+    if args.headless:
+        if not args.deck and not args.languages:
+            print("Error: --headless needs a vocabulary file (--deck or --languages).", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(run_headless(args.deck, args.answers, args.seed, args.strategy, args.count, args.match,
+                              args.languages, args.weight))
+
+    # Print CTRL+C instructions
+    renderer.write("Press CTRL+C to quit.", "error")
+    renderer.write()
+
+    def ask_question(strategy: RandomStrategy) -> None:
+        """
+        Pose a single vocabulary question to the user and report the result.
+
+        Parameters
+        ----------
+        strategy : RandomStrategy
+            The question strategy (see `make_strategy`) for the chosen
+            vocabulary files. It fetches decks from the cache, which only
+            re-reads a file if it changed.
+        """
+        # Let the strategy pick the next question.
+        with profiler.stage("select"):
+            deck, question_text, question_word, word_location = strategy.next_question()
+
+        # Prompt the user and capture their answer.
+        user_answer = dynamic_input(f"{question_text} ", summary=stats, style="question")
+         
+        # Verify the answer.
+        with profiler.stage("check"):
+            is_correct, correct_answer = check_answer(
+                question_word,
+                user_answer,
+                deck,
+                word_location,
+                args.match,
+            )
+
+        with profiler.stage("record"):
+            stats.record(user_answer, correct_answer, is_correct)
+            strategy.record(question_word, word_location, is_correct, user_answer)
+            if review_log is not None:
+                result = "correct" if is_correct else ("incorrect" if user_answer else "not answered")
+                review_log.record(os.path.basename(strategy.json_path), question_word, word_location, result)
+
+        # Give feedback
+        with profiler.stage("feedback"):
+            if is_correct and user_answer != correct_answer:
+                # Accepted by a forgiving `--match` level; show the exact spelling.
+                dynamic_print(f"   Correct ({correct_answer}).", "correct")
+            elif is_correct:
+                dynamic_print("   Correct.", "correct")
+            else:
+                dynamic_print(f"   Incorrect. Correct answer: {correct_answer}", "incorrect")
+
+        # Pause briefly so the user can read the feedback, then clean up the terminal lines that were printed for the question/answer.
+        # The lines are cleared in the same write as the next question.
+        time.sleep(3)
+        renderer.clear(2)
+
+    # Keep running statistics for the summary
+    stats = SessionStats()
+
+    # --------------------------- Header --------------------------------
+    renderer.write("Vocabulary Plus", "title")
+    renderer.write("A CLI foreign vocabulary learning tool.")
+    renderer.write("Learn more at https://github.com/46Dimensions/VocabularyPlus.")
+    renderer.write()
+    # Start-up ends here; choosing files waits for the user.
+    profiler.end("startup", started)
+
+    # ---------------------- Choose vocab files ------------------------
+    if args.deck or args.languages:
+        # Chosen on the command line, so the list is skipped.
+        try:
+            json_paths = select_decks(args.deck, args.languages)
+        except FileNotFoundError as e:
+            renderer.write(f"{e}.", "warning")
+            renderer.flush()
+            sys.exit(2)
+    else:
+        chosen_file_numbers = get_file_numbers()
+
+        # An empty list signals that no files were found (see `get_file_numbers` impl.).
+        if not chosen_file_numbers:
+            renderer.write("It seems like there are no vocabulary files.", "warning")
+            renderer.write("Use the vocab file creator ('vocabularyplus create') to make one!", "warning")
+            renderer.flush()
+            time.sleep(5)
+            sys.exit(0)
+
+        # Resolve the actual filenames from the catalog's file list.
+        jsons = get_catalog().filenames()
+        json_paths = [os.path.join(JSON_DIR, jsons[number - 1]) for number in chosen_file_numbers]
+
+    # Set up the question strategy, weighting the files by size unless `--weight` was given.
+    try:
+        with profiler.stage("load_decks"):
+            strategy = make_strategy(json_paths, args.strategy, weights=parse_weights(json_paths, args.weight))
+    except ValueError as e:
+        renderer.write(f"{e}.", "warning")
+        renderer.flush()
+        sys.exit(2)
+
+    # Prepare the next questions while the user answers, unless disabled.
+    if args.prefetch > 0:
+        strategy = QuestionPrefetcher(strategy, args.prefetch)
+
+    # --------------------------- Question UI ---------------------------
+    renderer.write()
+    renderer.write("Question", "section")
+
+    # Keep a persistent record of every answer, unless disabled.
+    review_log = ReviewLog() if args.review_log else None
+
+    # --------------------------- Loop ----------------------------------
+    try:
+        while True:
+            ask_question(strategy)
+    except KeyboardInterrupt:
+        on_keyboard_interrupt(summary=stats)
+        sys.exit(0)
+    finally:
+        # Runs on every exit, including `sys.exit` from `dynamic_input`.
+        strategy.close()
+        if review_log is not None:
+            review_log.close()